@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Benchmark HWSD2 raster point lookups.
+
+Compares the original per-call open/seek/unpack read of HWSD2.bil with the
+memory-mapped raster held by HWSD2Extractor.
+
+Usage:
+    uv run python benchmark_extractor.py [n_points]
+
+Default: 100,000 random coordinates
+"""
+
+import struct
+import sys
+import time
+
+import numpy as np
+
+from hwsd2_extractor import HWSD2Extractor
+
+
+def read_raster_value_seek(extractor: HWSD2Extractor, row: int, col: int) -> int:
+    """
+    Read a single pixel by opening the BIL file, seeking and unpacking.
+
+    This is the lookup path used before the raster was memory mapped.
+
+    Args:
+        extractor: Extractor providing the raster path and dimensions
+        row: Row index
+        col: Column index
+
+    Returns:
+        Raw pixel value
+    """
+    offset = (row * extractor.ncols + col) * 2
+    with open(extractor.raster_path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(2)
+        if len(data) != 2:
+            return extractor.nodata
+        return struct.unpack('<H', data)[0]
+
+
+def random_coordinates(n_points: int, seed: int = 42) -> tuple[np.ndarray, np.ndarray]:
+    """Draw uniformly distributed latitude/longitude pairs."""
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(-60.0, 80.0, n_points)
+    lons = rng.uniform(-180.0, 180.0, n_points)
+    return lats, lons
+
+
+def benchmark(n_points: int = 100_000) -> None:
+    """Time both lookup paths on the same random coordinates."""
+    extractor = HWSD2Extractor()
+    lats, lons = random_coordinates(n_points)
+    rowcols = [extractor.latlon_to_rowcol(lat, lon) for lat, lon in zip(lats, lons)]
+
+    print(f"Benchmarking {n_points:,} point lookups on {extractor.raster_path}")
+    print("-" * 70)
+
+    start = time.perf_counter()
+    seek_values = [read_raster_value_seek(extractor, row, col) for row, col in rowcols]
+    seek_time = time.perf_counter() - start
+    print(f"{'open/seek/unpack':<25s} {seek_time:10.3f} s  {n_points / seek_time:12,.0f} lookups/s")
+
+    # Touch the map once so the timing excludes creating it
+    extractor.raster
+    start = time.perf_counter()
+    mmap_values = [extractor.read_raster_value(row, col) for row, col in rowcols]
+    mmap_time = time.perf_counter() - start
+    print(f"{'memory map':<25s} {mmap_time:10.3f} s  {n_points / mmap_time:12,.0f} lookups/s")
+
+    if seek_values != mmap_values:
+        raise AssertionError("Memory-mapped lookups disagree with direct reads")
+
+    print("-" * 70)
+    print(f"Speedup: {seek_time / mmap_time:.1f}x")
+
+
+def main():
+    """Main entry point for command-line usage."""
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    benchmark(n_points)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+Convert the HWSD2 SMU raster to a tiled, compressed Cloud-Optimized GeoTIFF.
+
+The distributed HWSD2.bil is ~1.8 GB of uncompressed uint16. The SMU grid
+is made of large uniform patches, so DEFLATE with horizontal differencing
+shrinks it to a small fraction of that. HWSD2Extractor reads a .tif raster
+tile by tile, decompressing only the tiles a query touches.
+
+Usage:
+    uv run python convert_hwsd2_raster.py [input_bil] [output_tif]
+
+Default: HWSD2_RASTER/HWSD2.bil -> HWSD2_RASTER/HWSD2.tif
+"""
+
+import sys
+from pathlib import Path
+
+import rasterio
+import rasterio.shutil
+
+
+def convert_bil_to_cog(
+    bil_path: str = "HWSD2_RASTER/HWSD2.bil",
+    cog_path: str = "HWSD2_RASTER/HWSD2.tif",
+    blocksize: int = 512,
+    level: int = 9,
+) -> Path:
+    """
+    Rewrite a BIL raster as a tiled, DEFLATE-compressed Cloud-Optimized GeoTIFF.
+
+    The georeferencing and NODATA value are read from the .hdr file next to
+    the BIL. Overviews use nearest-neighbour resampling so they only ever
+    contain real SMU IDs.
+
+    Args:
+        bil_path: Path to the BIL raster (with its .hdr alongside)
+        cog_path: Output GeoTIFF path
+        blocksize: Tile width and height in pixels
+        level: DEFLATE compression level (1-9)
+
+    Returns:
+        Path to the written GeoTIFF
+
+    Examples:
+        >>> convert_bil_to_cog("HWSD2_RASTER/HWSD2.bil", "HWSD2_RASTER/HWSD2.tif")  # doctest: +SKIP
+        PosixPath('HWSD2_RASTER/HWSD2.tif')
+    """
+    bil_path = Path(bil_path)
+    cog_path = Path(cog_path)
+    if not bil_path.exists():
+        raise FileNotFoundError(f"Raster file not found: {bil_path}")
+
+    with rasterio.open(bil_path) as src:
+        print(f"Converting {bil_path} ({src.height} x {src.width}, {src.dtypes[0]})")
+        rasterio.shutil.copy(
+            src,
+            cog_path,
+            driver="COG",
+            compress="DEFLATE",
+            level=level,
+            predictor=2,
+            blocksize=blocksize,
+            overview_resampling="nearest",
+            num_threads="ALL_CPUS",
+        )
+
+    in_size = bil_path.stat().st_size / (1024 * 1024)
+    out_size = cog_path.stat().st_size / (1024 * 1024)
+    print(f"Saved: {cog_path} ({out_size:.1f} MB, {in_size / max(out_size, 1e-6):.1f}x smaller)")
+    return cog_path
+
+
+def main():
+    """Main entry point for command-line usage."""
+    bil_path = sys.argv[1] if len(sys.argv) > 1 else "HWSD2_RASTER/HWSD2.bil"
+    cog_path = sys.argv[2] if len(sys.argv) > 2 else str(Path(bil_path).with_suffix(".tif"))
+    convert_bil_to_cog(bil_path, cog_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,15 +12,257 @@ Usage:
 
 Functions:
     - latlon_to_smu_id: Convert lat/lon to HWSD2_SMU_ID from raster
+    - latlon_to_smu_ids: Vectorized lat/lon arrays to HWSD2_SMU_ID array
     - get_smu_properties: Get soil properties for a given SMU_ID from database
+    - get_smu_properties_bulk: Get soil properties for many SMU_IDs in one query
     - get_soil_profile: Combined function to get profile from lat/lon
+    - get_soil_profiles: Combined function for arrays of lat/lon
+    - extract_window: SMU grid and profiles for a lat/lon bounding box
 """
 
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import struct
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+import threading
 import duckdb
+import numpy as np
 import pandas as pd
+import rasterio
+from rasterio.windows import Window
+
+# SMU summary joined with its domain tables; filled in with a WHERE and an
+# ORDER BY clause (ID breaks ties so the first row per SMU is deterministic)
+SMU_QUERY = """
+    SELECT
+        s.*,
+        wrb4.VALUE as WRB4_NAME,
+        wrb2.VALUE as WRB2_NAME,
+        d.VALUE as DRAINAGE_NAME,
+        rd.VALUE as ROOT_DEPTH_NAME,
+        k.VALUE as KOPPEN_NAME
+    FROM HWSD2_SMU s
+    LEFT JOIN D_WRB4 wrb4 ON s.WRB4 = wrb4.CODE
+    LEFT JOIN D_WRB2 wrb2 ON s.WRB2 = wrb2.CODE
+    LEFT JOIN D_DRAINAGE d ON s.DRAINAGE = d.CODE
+    LEFT JOIN D_ROOT_DEPTH rd ON s.ROOT_DEPTH = rd.CODE
+    LEFT JOIN D_KOPPEN k ON s.KOPPEN = k.CODE
+    WHERE {where}
+    ORDER BY {order}
+"""
+
+# Layer properties joined with their domain tables
+LAYERS_QUERY = """
+    SELECT
+        l.*,
+        d.VALUE as DRAINAGE_NAME,
+        tu.VALUE as TEXTURE_USDA_NAME,
+        ts.VALUE as TEXTURE_SOTER_NAME
+    FROM HWSD2_LAYERS l
+    LEFT JOIN D_DRAINAGE d ON l.DRAINAGE = d.CODE
+    LEFT JOIN D_TEXTURE_USDA tu ON l.TEXTURE_USDA = tu.CODE
+    LEFT JOIN D_TEXTURE_SOTER ts ON l.TEXTURE_SOTER = ts.CODE
+    WHERE {where}
+    ORDER BY {order}
+"""
+
+# Keyed reads from the tables materialized by load_hwsd2.materialize_profiles.
+# They take the same {where} clauses as the join queries above; rows come out
+# in the order they were stored, so {order} is not needed.
+PROFILE_SMU_QUERY = """
+    SELECT * FROM SMU_PROFILE s
+    WHERE {where}
+"""
+
+PROFILE_LAYERS_QUERY = """
+    SELECT UNNEST(flatten([D1, D2, D3, D4, D5, D6, D7]), recursive := true)
+    FROM SMU_LAYER_PROFILE l
+    WHERE {where}
+"""
+
+# Catalog name the database file is attached under
+DB_CATALOG = "hwsd2"
+
+
+def sql_string(value) -> str:
+    """
+    Quote a value (e.g. a path) as a SQL string literal.
+
+    Examples:
+        >>> sql_string("/data/o'brien/hwsd2.db")
+        "'/data/o''brien/hwsd2.db'"
+    """
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _copy_profile(profile: Dict) -> Dict:
+    """Copy a profile so callers cannot modify a cached entry."""
+    return {
+        key: value.copy() if isinstance(value, (dict, pd.DataFrame)) else value
+        for key, value in profile.items()
+    }
+
+
+class _ProfileCache:
+    """
+    Thread-safe bounded LRU cache of SMU profiles.
+
+    Entries are tied to the database file's modification time and dropped
+    when it changes. Counters for hits, misses and evictions accumulate for
+    the life of the cache.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def validate(self, mtime_ns: Optional[int]) -> bool:
+        """Drop all entries if the database mtime changed; return True if it did."""
+        with self._lock:
+            changed = self._mtime_ns is not None and mtime_ns != self._mtime_ns
+            if changed:
+                self._entries.clear()
+            self._mtime_ns = mtime_ns
+            return changed
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """Return a copy of the cached profile, or None on a miss."""
+        with self._lock:
+            profile = self._entries.get(key)
+            if profile is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy_profile(profile)
+
+    def put(self, key: Hashable, profile: Dict) -> None:
+        """Store a private copy of a profile, evicting the least recently used."""
+        if self.maxsize <= 0:
+            return
+        profile = _copy_profile(profile)
+        with self._lock:
+            self._entries[key] = profile
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> Dict:
+        """Return cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class _TiledRaster:
+    """
+    Read-only array view of a tiled GeoTIFF with an LRU cache of decoded tiles.
+
+    Supports the indexing the extractor needs: raster[row, col] for a single
+    pixel, raster[rows, cols] with integer arrays, and raster[r0:r1, c0:c1]
+    for windows. Only the tiles covering the requested pixels are read and
+    decompressed; recently used tiles are kept in memory.
+    """
+
+    def __init__(self, path: Path, maxtiles: int = 64):
+        self.path = path
+        self.maxtiles = maxtiles
+        self._dataset = rasterio.open(path)
+        self.shape = (self._dataset.height, self._dataset.width)
+        self.dtype = np.dtype(self._dataset.dtypes[0])
+        self.block_shape = self._dataset.block_shapes[0]
+        self._tiles: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the dataset and drop cached tiles."""
+        with self._lock:
+            self._dataset.close()
+            self._tiles.clear()
+
+    def _tile(self, tile_row: int, tile_col: int) -> np.ndarray:
+        """Return a decoded tile, reading it from the file on a cache miss."""
+        key = (tile_row, tile_col)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+
+            bh, bw = self.block_shape
+            row_off, col_off = tile_row * bh, tile_col * bw
+            window = Window(col_off, row_off, min(bw, self.shape[1] - col_off), min(bh, self.shape[0] - row_off))
+            tile = self._dataset.read(1, window=window)
+            if self.maxtiles > 0:
+                self._tiles[key] = tile
+                while len(self._tiles) > self.maxtiles:
+                    self._tiles.popitem(last=False)
+            return tile
+
+    def _read_window(self, rows: slice, cols: slice) -> np.ndarray:
+        """Assemble a (possibly strided) window from the tiles it covers."""
+        r0, r1, rstep = rows.indices(self.shape[0])
+        c0, c1, cstep = cols.indices(self.shape[1])
+        if rstep < 1 or cstep < 1:
+            raise ValueError("Tiled raster windows only support positive steps")
+        r1, c1 = max(r0, r1), max(c0, c1)
+
+        out = np.empty((r1 - r0, c1 - c0), dtype=self.dtype)
+        bh, bw = self.block_shape
+        for tile_row in range(r0 // bh, -(-r1 // bh)):
+            tr0, tr1 = max(r0, tile_row * bh), min(r1, (tile_row + 1) * bh)
+            for tile_col in range(c0 // bw, -(-c1 // bw)):
+                tc0, tc1 = max(c0, tile_col * bw), min(c1, (tile_col + 1) * bw)
+                tile = self._tile(tile_row, tile_col)
+                out[tr0 - r0:tr1 - r0, tc0 - c0:tc1 - c0] = \
+                    tile[tr0 - tile_row * bh:tr1 - tile_row * bh, tc0 - tile_col * bw:tc1 - tile_col * bw]
+        return out[::rstep, ::cstep]
+
+    def __getitem__(self, key):
+        rows, cols = key
+        if isinstance(rows, slice) or isinstance(cols, slice):
+            if not isinstance(rows, slice):
+                rows = slice(rows, rows + 1)
+            if not isinstance(cols, slice):
+                cols = slice(cols, cols + 1)
+            return self._read_window(rows, cols)
+
+        rows, cols = np.broadcast_arrays(np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))
+        bh, bw = self.block_shape
+        if rows.ndim == 0:
+            return self._tile(int(rows) // bh, int(cols) // bw)[int(rows) % bh, int(cols) % bw]
+
+        # Group the points by tile so each tile is fetched once
+        flat_rows, flat_cols = rows.ravel(), cols.ravel()
+        keys = (flat_rows // bh) * (-(-self.shape[1] // bw)) + flat_cols // bw
+        order = np.argsort(keys, kind='stable')
+        bounds = np.flatnonzero(np.diff(keys[order])) + 1
+        out = np.empty(flat_rows.shape, dtype=self.dtype)
+        for group in np.split(order, bounds):
+            if group.size == 0:
+                continue
+            r, c = flat_rows[group], flat_cols[group]
+            tile = self._tile(int(r[0]) // bh, int(c[0]) // bw)
+            out[group] = tile[r % bh, c % bw]
+        return out.reshape(rows.shape)
 
 
 class HWSD2Extractor:
@@ -29,7 +271,7 @@ class HWSD2Extractor:
 
     Attributes:
         raster_path: Path to HWSD2.bil raster file
-        db_path: Path to DuckDB database with soil properties
+        db_path: Path to DuckDB database (or Parquet export directory) with soil properties
         ncols: Number of columns in raster (43200)
         nrows: Number of rows in raster (21600)
         xdim: Pixel width in degrees (0.00833333)
@@ -37,24 +279,39 @@ class HWSD2Extractor:
         ulx: Upper left X coordinate (-179.995833)
         uly: Upper left Y coordinate (89.995833)
         nodata: NODATA value (65535)
+        raster: Read-only raster array (opened on first access); a memory map
+            for .bil files, or a tile-cached view for tiled GeoTIFFs
+        connection: Read-only DuckDB connection (opened on first access)
+
+    The extractor owns its raster map and database connection; use it as a
+    context manager or call close() to release them. It can be shared between
+    threads: each thread queries through its own cursor on the connection.
 
     Examples:
-        >>> extractor = HWSD2Extractor()
-        >>> smu_id = extractor.latlon_to_smu_id(40.0, -105.0)
-        >>> profile = extractor.get_smu_properties(smu_id)
+        >>> with HWSD2Extractor() as extractor:
+        ...     smu_id = extractor.latlon_to_smu_id(40.0, -105.0)
+        ...     profile = extractor.get_smu_properties(smu_id)
     """
 
     def __init__(
         self,
         raster_path: Optional[str] = None,
         db_path: Optional[str] = None,
+        cache_size: int = 1024,
+        tile_cache_size: int = 64,
     ):
         """
         Initialize HWSD2 extractor.
 
         Args:
-            raster_path: Path to HWSD2.bil file. If None, looks in HWSD2_RASTER/
-            db_path: Path to DuckDB database. If None, looks for hwsd2.db
+            raster_path: Path to HWSD2.bil file, or to a tiled GeoTIFF written by
+                convert_hwsd2_raster.py. If None, looks in HWSD2_RASTER/
+            db_path: Path to DuckDB database, or to a directory written by
+                load_hwsd2.py --parquet. If None, looks for hwsd2.db
+            cache_size: Maximum number of SMU profiles kept in the LRU cache
+                (0 disables caching)
+            tile_cache_size: Maximum number of decoded tiles kept in memory
+                when reading a tiled GeoTIFF
         """
         # Set default paths relative to this file
         base_dir = Path(__file__).parent
@@ -80,6 +337,237 @@ class HWSD2Extractor:
         if not self.raster_path.exists():
             raise FileNotFoundError(f"Raster file not found: {self.raster_path}")
 
+        # Tiled GeoTIFFs carry their own grid; pixel-center origin like the .hdr
+        self._tiled = self.raster_path.suffix.lower() in ('.tif', '.tiff')
+        if self._tiled:
+            with rasterio.open(self.raster_path) as src:
+                self.nrows, self.ncols = src.height, src.width
+                self.xdim, self.ydim = src.transform.a, -src.transform.e
+                self.ulx = src.transform.c + self.xdim / 2
+                self.uly = src.transform.f - self.ydim / 2
+                if src.nodata is not None:
+                    self.nodata = int(src.nodata)
+
+        self._tile_cache_size = tile_cache_size
+        self._raster: Optional[Union[np.memmap, _TiledRaster]] = None
+        self._conn: Optional[duckdb.DuckDBPyConnection] = None
+        # (connection, cursor) pairs, and connections replaced after the
+        # database changed that still have cursors open
+        self._cursors: List[Tuple[duckdb.DuckDBPyConnection, duckdb.DuckDBPyConnection]] = []
+        self._retired: List[duckdb.DuckDBPyConnection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._cache = _ProfileCache(cache_size)
+        self._has_profile_tables = False
+
+    def __enter__(self) -> "HWSD2Extractor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the database connection and release the raster map.
+
+        The extractor can still be used afterwards; both are reopened lazily.
+        """
+        with self._lock:
+            for _, cursor in self._cursors:
+                cursor.close()
+            self._cursors = []
+            for conn in self._retired:
+                conn.close()
+            self._retired = []
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if isinstance(self._raster, _TiledRaster):
+                self._raster.close()
+            self._raster = None
+
+    @property
+    def connection(self) -> duckdb.DuckDBPyConnection:
+        """
+        Read-only DuckDB connection to the soil database.
+
+        Created on first access and kept open, so queries no longer pay the
+        connect/close cost on every call. If the database contains the
+        SMU_PROFILE and SMU_LAYER_PROFILE tables built by load_hwsd2.py,
+        lookups read them by key instead of running the multi-table joins.
+
+        The database file is attached read-only to an in-memory database,
+        rather than opened with duckdb.connect (which would return the
+        process's cached instance of the file), so a connection opened after
+        the file changed reads the new contents while cursors on the old one
+        finish their queries.
+
+        If db_path is a Parquet export directory, the connection is an
+        in-memory database with one view per exported table, so the same
+        queries run directly against the Parquet files.
+
+        Raises:
+            FileNotFoundError: If database doesn't exist
+        """
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    if not self.db_path.exists():
+                        raise FileNotFoundError(
+                            f"Database not found: {self.db_path}. "
+                            f"Run load_hwsd2.py to create it first."
+                        )
+                    if self.db_path.is_dir():
+                        conn = self._connect_parquet(self.db_path)
+                    else:
+                        conn = duckdb.connect()
+                        conn.execute(f"ATTACH {sql_string(self.db_path)} AS {DB_CATALOG} (READ_ONLY)")
+                        conn.execute(f"USE {DB_CATALOG}")
+                    profile_tables = conn.execute("""
+                        SELECT COUNT(*) FROM information_schema.tables
+                        WHERE table_name IN ('SMU_PROFILE', 'SMU_LAYER_PROFILE')
+                    """).fetchone()[0]
+                    self._has_profile_tables = profile_tables == 2
+                    self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _connect_parquet(parquet_dir: Path) -> duckdb.DuckDBPyConnection:
+        """Open an in-memory connection with a view over each exported table."""
+        conn = duckdb.connect()
+        for path in sorted(parquet_dir.iterdir()):
+            if path.is_dir():
+                # Partitioned dataset; the partition column is stored in the files
+                source = f"read_parquet({sql_string(f'{path}/**/*.parquet')}, hive_partitioning = false)"
+            elif path.suffix == '.parquet':
+                source = f"read_parquet({sql_string(path)})"
+            else:
+                continue
+            conn.execute(f"CREATE VIEW {path.stem} AS SELECT * FROM {source}")
+        return conn
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """
+        Get the calling thread's cursor on the shared connection.
+
+        DuckDB connections must not be used from several threads at once, so
+        each thread gets its own cursor, created on first use and reused for
+        later queries from that thread. After the connection is replaced
+        (see _check_database_changed) each thread switches to a cursor on the
+        new connection at its next query, closing its old cursor; a replaced
+        connection is closed with its last cursor.
+
+        Returns:
+            DuckDB cursor for the current thread
+
+        Raises:
+            FileNotFoundError: If database doesn't exist
+        """
+        while getattr(self._local, 'conn', None) is not self._conn or self._conn is None:
+            conn = self.connection
+            with self._lock:
+                if conn is not self._conn:
+                    # Replaced again since it was opened
+                    continue
+                cursor = conn.cursor()
+                if not self.db_path.is_dir():
+                    cursor.execute(f"USE {DB_CATALOG}")
+                self._cursors.append((conn, cursor))
+                self._release_cursor()
+            self._local.conn = conn
+            self._local.cursor = cursor
+        return self._local.cursor
+
+    def _release_cursor(self) -> None:
+        """Close the calling thread's current cursor, and its connection if retired and unused."""
+        old_conn = getattr(self._local, 'conn', None)
+        if old_conn is None:
+            return
+        for entry in self._cursors:
+            if entry == (old_conn, self._local.cursor):
+                self._cursors.remove(entry)
+                self._local.cursor.close()
+                break
+        if old_conn in self._retired and all(conn is not old_conn for conn, _ in self._cursors):
+            self._retired.remove(old_conn)
+            old_conn.close()
+
+    def cache_info(self) -> Dict:
+        """
+        Get statistics for the SMU profile cache.
+
+        Returns:
+            Dictionary with 'hits', 'misses', 'evictions', 'size', 'maxsize'
+            and 'hit_rate'
+
+        Examples:
+            >>> extractor = HWSD2Extractor(cache_size=256)
+            >>> extractor.cache_info()['maxsize']
+            256
+        """
+        return self._cache.info()
+
+    def cache_clear(self) -> None:
+        """Empty the SMU profile cache and reset its statistics."""
+        self._cache.clear()
+
+    def _queries(self) -> Tuple[str, str]:
+        """Get the (SMU, layers) query templates for the connected database."""
+        self.connection
+        if self._has_profile_tables:
+            return PROFILE_SMU_QUERY, PROFILE_LAYERS_QUERY
+        return SMU_QUERY, LAYERS_QUERY
+
+    def _check_database_changed(self) -> None:
+        """
+        Invalidate cached profiles and reconnect if the database file changed.
+
+        The connection is replaced rather than closed: queries running on
+        other threads' cursors finish on the old connection, and each thread
+        moves to the new one at its next query (see cursor). The raster does
+        not depend on the database and is kept.
+        """
+        try:
+            mtime_ns = self.db_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        if self._cache.validate(mtime_ns):
+            with self._lock:
+                if self._conn is not None:
+                    if any(conn is self._conn for conn, _ in self._cursors):
+                        self._retired.append(self._conn)
+                    else:
+                        self._conn.close()
+                    self._conn = None
+
+    @property
+    def raster(self) -> Union[np.memmap, _TiledRaster]:
+        """
+        Read-only view of the raster as a (nrows, ncols) uint16 array.
+
+        The map is created on first access and shared by all subsequent
+        lookups, so reading a pixel is index arithmetic on the mapped pages
+        instead of an open/seek/read per call. For a tiled GeoTIFF the view
+        reads and decompresses only the tiles a lookup touches, keeping the
+        most recently used ones in memory.
+
+        Examples:
+            >>> extractor = HWSD2Extractor()
+            >>> extractor.raster.shape
+            (21600, 43200)
+        """
+        if self._raster is None and self._tiled:
+            self._raster = _TiledRaster(self.raster_path, self._tile_cache_size)
+        elif self._raster is None:
+            # BIL with a single band is plain row-major little-endian uint16
+            self._raster = np.memmap(
+                self.raster_path,
+                dtype='<u2',
+                mode='r',
+                shape=(self.nrows, self.ncols),
+            )
+        return self._raster
+
     def latlon_to_rowcol(self, lat: float, lon: float) -> Tuple[int, int]:
         """
         Convert latitude/longitude to raster row/column indices.
@@ -116,6 +604,54 @@ class HWSD2Extractor:
 
         return row, col
 
+    def latlon_to_rowcols(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert arrays of latitude/longitude to raster row/column indices.
+
+        Vectorized counterpart of latlon_to_rowcol: the same truncation and
+        clamping is applied element-wise.
+
+        Args:
+            lats: Latitudes in decimal degrees (-90 to 90)
+            lons: Longitudes in decimal degrees (-180 to 180), same shape as lats
+
+        Returns:
+            Tuple of (rows, cols) int64 arrays with the shape of the inputs
+
+        Raises:
+            ValueError: If shapes differ or any coordinate is out of bounds
+
+        Examples:
+            >>> extractor = HWSD2Extractor()
+            >>> rows, cols = extractor.latlon_to_rowcols(np.array([40.0]), np.array([-105.0]))
+            >>> (int(rows[0]), int(cols[0])) == extractor.latlon_to_rowcol(40.0, -105.0)
+            True
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        if lats.shape != lons.shape:
+            raise ValueError(f"Latitude shape {lats.shape} does not match longitude shape {lons.shape}")
+
+        # Negated comparisons so NaN is reported as out of range too
+        bad_lat = ~((lats >= -90) & (lats <= 90))
+        if bad_lat.any():
+            raise ValueError(f"Latitude {lats[bad_lat][0]} out of range [-90, 90] ({bad_lat.sum()} values)")
+        bad_lon = ~((lons >= -180) & (lons <= 180))
+        if bad_lon.any():
+            raise ValueError(f"Longitude {lons[bad_lon][0]} out of range [-180, 180] ({bad_lon.sum()} values)")
+
+        # Truncate toward zero like int(), then clamp to the valid range
+        cols = ((lons - self.ulx) / self.xdim).astype(np.int64)
+        rows = ((self.uly - lats) / self.ydim).astype(np.int64)
+        np.clip(rows, 0, self.nrows - 1, out=rows)
+        np.clip(cols, 0, self.ncols - 1, out=cols)
+
+        return rows, cols
+
     def read_raster_value(self, row: int, col: int) -> int:
         """
         Read a single pixel value from the raster file.
@@ -139,20 +675,7 @@ class HWSD2Extractor:
         if not (0 <= col < self.ncols):
             raise ValueError(f"Column {col} out of range [0, {self.ncols})")
 
-        # Calculate byte offset
-        # BIL format: Band Interleaved by Line
-        # Each pixel is 2 bytes (unsigned 16-bit integer)
-        offset = (row * self.ncols + col) * 2
-
-        with open(self.raster_path, 'rb') as f:
-            f.seek(offset)
-            data = f.read(2)
-            if len(data) != 2:
-                return self.nodata
-
-            # Little-endian unsigned short
-            value = struct.unpack('<H', data)[0]
-            return value
+        return int(self.raster[row, col])
 
     def latlon_to_smu_id(self, lat: float, lon: float) -> Optional[int]:
         """
@@ -180,6 +703,35 @@ class HWSD2Extractor:
 
         return value
 
+    def latlon_to_smu_ids(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """
+        Convert arrays of latitude/longitude to HWSD2_SMU_IDs.
+
+        All coordinates are resolved with a single gather from the memory
+        mapped raster, so millions of points need no Python-level loop.
+
+        Args:
+            lats: Latitudes in decimal degrees (-90 to 90)
+            lons: Longitudes in decimal degrees (-180 to 180), same shape as lats
+
+        Returns:
+            int64 array of HWSD2_SMU_IDs with the shape of the inputs;
+            locations without data (ocean, etc.) are -1
+
+        Raises:
+            ValueError: If shapes differ or any coordinate is out of bounds
+
+        Examples:
+            >>> extractor = HWSD2Extractor()
+            >>> smu_ids = extractor.latlon_to_smu_ids(np.array([40.0, 0.0]), np.array([-105.0, 0.0]))
+            >>> smu_ids.shape
+            (2,)
+        """
+        rows, cols = self.latlon_to_rowcols(lats, lons)
+        values = self.raster[rows, cols].astype(np.int64)
+        values[values == self.nodata] = -1
+        return values
+
     def get_smu_properties(
         self,
         smu_id: int,
@@ -189,6 +741,9 @@ class HWSD2Extractor:
         """
         Get soil properties for a given HWSD2_SMU_ID from the database.
 
+        Results are kept in an LRU cache keyed on (smu_id, include_layers,
+        include_metadata); callers always receive their own copy.
+
         Args:
             smu_id: HWSD2 Soil Mapping Unit ID
             include_layers: Include detailed layer properties (default: True)
@@ -209,13 +764,26 @@ class HWSD2Extractor:
             >>> # This will fail if DB doesn't exist, which is expected
             >>> # In practice, you'd create the DB first with load_hwsd2.py
         """
-        if not self.db_path.exists():
-            raise FileNotFoundError(
-                f"Database not found: {self.db_path}. "
-                f"Run load_hwsd2.py to create it first."
-            )
+        self._check_database_changed()
 
-        conn = duckdb.connect(str(self.db_path))
+        key = (int(smu_id), include_layers, include_metadata)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._query_smu_properties(smu_id, include_layers, include_metadata)
+        self._cache.put(key, result)
+        return result
+
+    def _query_smu_properties(
+        self,
+        smu_id: int,
+        include_layers: bool,
+        include_metadata: bool,
+    ) -> Dict:
+        """Run the SMU and layer queries for a single SMU_ID."""
+        conn = self.cursor()
+        smu_template, layers_template = self._queries()
 
         result = {
             'smu_id': smu_id,
@@ -223,51 +791,121 @@ class HWSD2Extractor:
 
         # Get SMU metadata
         if include_metadata:
-            smu_query = """
-                SELECT
-                    s.*,
-                    wrb4.VALUE as WRB4_NAME,
-                    wrb2.VALUE as WRB2_NAME,
-                    d.VALUE as DRAINAGE_NAME,
-                    rd.VALUE as ROOT_DEPTH_NAME,
-                    k.VALUE as KOPPEN_NAME
-                FROM HWSD2_SMU s
-                LEFT JOIN D_WRB4 wrb4 ON s.WRB4 = wrb4.CODE
-                LEFT JOIN D_WRB2 wrb2 ON s.WRB2 = wrb2.CODE
-                LEFT JOIN D_DRAINAGE d ON s.DRAINAGE = d.CODE
-                LEFT JOIN D_ROOT_DEPTH rd ON s.ROOT_DEPTH = rd.CODE
-                LEFT JOIN D_KOPPEN k ON s.KOPPEN = k.CODE
-                WHERE s.HWSD2_SMU_ID = ?
-            """
+            smu_query = smu_template.format(where="s.HWSD2_SMU_ID = ?", order="s.ID")
             smu_data = conn.execute(smu_query, [smu_id]).fetchdf()
 
             if len(smu_data) == 0:
-                conn.close()
                 raise ValueError(f"SMU_ID {smu_id} not found in database")
 
             result['metadata'] = smu_data.iloc[0].to_dict()
 
         # Get layer properties
         if include_layers:
-            layers_query = """
-                SELECT
-                    l.*,
-                    d.VALUE as DRAINAGE_NAME,
-                    tu.VALUE as TEXTURE_USDA_NAME,
-                    ts.VALUE as TEXTURE_SOTER_NAME
-                FROM HWSD2_LAYERS l
-                LEFT JOIN D_DRAINAGE d ON l.DRAINAGE = d.CODE
-                LEFT JOIN D_TEXTURE_USDA tu ON l.TEXTURE_USDA = tu.CODE
-                LEFT JOIN D_TEXTURE_SOTER ts ON l.TEXTURE_SOTER = ts.CODE
-                WHERE l.HWSD2_SMU_ID = ?
-                ORDER BY l.TOPDEP
-            """
+            layers_query = layers_template.format(where="l.HWSD2_SMU_ID = ?", order="l.TOPDEP, l.ID")
             layers_data = conn.execute(layers_query, [smu_id]).fetchdf()
             result['layers'] = layers_data
 
-        conn.close()
         return result
 
+    def get_smu_properties_bulk(
+        self,
+        smu_ids,
+        include_layers: bool = True,
+        include_metadata: bool = True,
+    ) -> Dict[int, Dict]:
+        """
+        Get soil properties for many HWSD2_SMU_IDs in one database round trip.
+
+        IDs are deduplicated, served from the profile cache where possible,
+        and each of the two joins (SMU summary and layers) runs once for the
+        remaining IDs instead of once per ID.
+
+        Args:
+            smu_ids: Sequence or array of HWSD2 Soil Mapping Unit IDs; negative
+                values (the NODATA marker from latlon_to_smu_ids) are ignored
+            include_layers: Include detailed layer properties (default: True)
+            include_metadata: Include SMU summary metadata (default: True)
+
+        Returns:
+            Dictionary mapping each SMU_ID to a result shaped like
+            get_smu_properties. When include_metadata is True, IDs not found
+            in HWSD2_SMU are omitted rather than raising.
+
+        Raises:
+            FileNotFoundError: If database doesn't exist
+
+        Examples:
+            >>> extractor = HWSD2Extractor()
+            >>> # profiles = extractor.get_smu_properties_bulk([1666, 4726, 1666])
+            >>> # sorted(profiles)
+            >>> # [1666, 4726]
+        """
+        self._check_database_changed()
+
+        ids = np.unique(np.asarray(smu_ids, dtype=np.int64).ravel())
+        ids = ids[ids >= 0].tolist()
+
+        results = {}
+        missing = []
+        for smu_id in ids:
+            cached = self._cache.get((smu_id, include_layers, include_metadata))
+            if cached is None:
+                missing.append(smu_id)
+            else:
+                results[smu_id] = cached
+
+        fetched = self._query_smu_properties_bulk(missing, include_layers, include_metadata)
+        for smu_id, result in fetched.items():
+            self._cache.put((smu_id, include_layers, include_metadata), result)
+            results[smu_id] = result
+
+        return {smu_id: results[smu_id] for smu_id in ids if smu_id in results}
+
+    def _query_smu_properties_bulk(
+        self,
+        ids: List[int],
+        include_layers: bool,
+        include_metadata: bool,
+    ) -> Dict[int, Dict]:
+        """Run the SMU and layer queries once for a list of unique SMU_IDs."""
+        results = {smu_id: {'smu_id': smu_id} for smu_id in ids}
+        if not ids:
+            return results
+
+        conn = self.cursor()
+        smu_template, layers_template = self._queries()
+
+        if include_metadata:
+            smu_query = smu_template.format(
+                where="s.HWSD2_SMU_ID IN (SELECT UNNEST(?::INTEGER[]))",
+                order="s.HWSD2_SMU_ID, s.ID",
+            )
+            smu_data = conn.execute(smu_query, [ids]).fetchdf()
+            smu_data = smu_data.drop_duplicates(subset='HWSD2_SMU_ID', keep='first')
+
+            found = {}
+            for record in smu_data.to_dict('records'):
+                smu_id = int(record['HWSD2_SMU_ID'])
+                found[smu_id] = results[smu_id]
+                found[smu_id]['metadata'] = record
+            results = found
+
+        if include_layers:
+            layers_query = layers_template.format(
+                where="l.HWSD2_SMU_ID IN (SELECT UNNEST(?::INTEGER[]))",
+                order="l.HWSD2_SMU_ID, l.TOPDEP, l.ID",
+            )
+            layers_data = conn.execute(layers_query, [list(results)]).fetchdf()
+
+            groups = layers_data.groupby('HWSD2_SMU_ID', sort=False)
+            for smu_id, result in results.items():
+                if smu_id in groups.groups:
+                    result['layers'] = groups.get_group(smu_id).reset_index(drop=True)
+                else:
+                    result['layers'] = layers_data.iloc[0:0].copy()
+
+        return results
+
     def get_soil_profile(
         self,
         lat: float,
@@ -315,6 +953,135 @@ class HWSD2Extractor:
 
         return result
 
+    def get_soil_profiles(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        include_layers: bool = True,
+        include_metadata: bool = True,
+    ) -> List[Optional[Dict]]:
+        """
+        Get soil profiles for arrays of geographic locations.
+
+        Resolves all coordinates with latlon_to_smu_ids and fetches the unique
+        SMUs with a single get_smu_properties_bulk call.
+
+        Args:
+            lats: Latitudes in decimal degrees (-90 to 90)
+            lons: Longitudes in decimal degrees (-180 to 180), same shape as lats
+            include_layers: Include detailed layer properties (default: True)
+            include_metadata: Include SMU summary metadata (default: True)
+
+        Returns:
+            List with one entry per point (in flattened input order): a profile
+            dictionary as returned by get_soil_profile, or None if there is no
+            data at the location. Points in the same SMU share the same
+            metadata and layers objects.
+
+        Examples:
+            >>> extractor = HWSD2Extractor()
+            >>> # profiles = extractor.get_soil_profiles([40.0, 39.1], [-105.0, -96.6])
+        """
+        lats = np.asarray(lats, dtype=np.float64).ravel()
+        lons = np.asarray(lons, dtype=np.float64).ravel()
+        smu_ids = self.latlon_to_smu_ids(lats, lons)
+
+        properties = self.get_smu_properties_bulk(
+            smu_ids,
+            include_layers=include_layers,
+            include_metadata=include_metadata,
+        )
+
+        profiles = []
+        for lat, lon, smu_id in zip(lats.tolist(), lons.tolist(), smu_ids.tolist()):
+            result = properties.get(smu_id)
+            if result is None:
+                profiles.append(None)
+                continue
+            profile = dict(result)
+            profile['latitude'] = lat
+            profile['longitude'] = lon
+            profiles.append(profile)
+
+        return profiles
+
+    def extract_window(
+        self,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        stride: int = 1,
+        include_layers: bool = True,
+        include_metadata: bool = True,
+    ) -> Dict:
+        """
+        Extract the SMU grid and soil profiles for a lat/lon bounding box.
+
+        The pixels are read as one rectangular slice of the raster rather than
+        point by point, and the profiles of all SMUs in the box are fetched
+        with a single get_smu_properties_bulk call.
+
+        Args:
+            south: Southern edge latitude in decimal degrees
+            west: Western edge longitude in decimal degrees
+            north: Northern edge latitude in decimal degrees
+            east: Eastern edge longitude in decimal degrees
+            stride: Take every stride-th pixel in both directions (default: 1)
+            include_layers: Include detailed layer properties (default: True)
+            include_metadata: Include SMU summary metadata (default: True)
+
+        Returns:
+            Dictionary containing:
+                - smu_ids: 2-D int64 array of HWSD2_SMU_IDs, north to south and
+                  west to east, with -1 where there is no data
+                - latitudes: Pixel-center latitude of each row
+                - longitudes: Pixel-center longitude of each column
+                - unique_smu_ids: Sorted array of the SMU_IDs in the window
+                - profiles: Dictionary mapping SMU_ID to its properties, as
+                  returned by get_smu_properties_bulk
+
+        Raises:
+            ValueError: If the box is inverted, out of bounds, or stride < 1
+
+        Examples:
+            >>> extractor = HWSD2Extractor()
+            >>> # window = extractor.extract_window(39.9, -105.3, 40.1, -105.1)
+            >>> # window['smu_ids'].shape
+            >>> # (24, 24)
+        """
+        if south > north:
+            raise ValueError(f"South edge {south} is north of north edge {north}")
+        if west > east:
+            raise ValueError(f"West edge {west} is east of east edge {east}")
+        if stride < 1:
+            raise ValueError(f"Stride must be at least 1, got {stride}")
+
+        row_start, col_start = self.latlon_to_rowcol(north, west)
+        row_stop, col_stop = self.latlon_to_rowcol(south, east)
+
+        block = self.raster[row_start:row_stop + 1:stride, col_start:col_stop + 1:stride]
+        smu_ids = np.asarray(block).astype(np.int64)
+        smu_ids[smu_ids == self.nodata] = -1
+
+        rows = np.arange(row_start, row_stop + 1, stride)
+        cols = np.arange(col_start, col_stop + 1, stride)
+        unique_smu_ids = np.unique(smu_ids[smu_ids >= 0])
+
+        profiles = self.get_smu_properties_bulk(
+            unique_smu_ids,
+            include_layers=include_layers,
+            include_metadata=include_metadata,
+        )
+
+        return {
+            'smu_ids': smu_ids,
+            'latitudes': self.uly - rows * self.ydim,
+            'longitudes': self.ulx + cols * self.xdim,
+            'unique_smu_ids': unique_smu_ids,
+            'profiles': profiles,
+        }
+
 
 # Convenience functions for quick access
 def get_soil_profile(
@@ -341,8 +1108,8 @@ def get_soil_profile(
         >>> if profile:
         ...     print(f"Found soil data: {profile['metadata']['WRB2_NAME']}")
     """
-    extractor = HWSD2Extractor(raster_path=raster_path, db_path=db_path)
-    return extractor.get_soil_profile(lat, lon)
+    with HWSD2Extractor(raster_path=raster_path, db_path=db_path) as extractor:
+        return extractor.get_soil_profile(lat, lon)
 
 
 def get_smu_id(
@@ -366,8 +1133,8 @@ def get_smu_id(
         >>> smu_id is None or isinstance(smu_id, int)
         True
     """
-    extractor = HWSD2Extractor(raster_path=raster_path, db_path=None)
-    return extractor.latlon_to_smu_id(lat, lon)
+    with HWSD2Extractor(raster_path=raster_path, db_path=None) as extractor:
+        return extractor.latlon_to_smu_id(lat, lon)
 
 
 if __name__ == "__main__":
@@ -380,8 +1147,8 @@ if __name__ == "__main__":
 
         print(f"Extracting soil profile for: {lat:.4f}°, {lon:.4f}°")
 
-        extractor = HWSD2Extractor()
-        profile = extractor.get_soil_profile(lat, lon)
+        with HWSD2Extractor() as extractor:
+            profile = extractor.get_soil_profile(lat, lon)
 
         if profile is None:
             print("No soil data at this location (ocean or missing data)")
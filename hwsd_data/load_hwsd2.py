@@ -3,18 +3,309 @@
 Load HWSD2 CSV files into DuckDB database.
 
 This script creates a DuckDB database from the HWSD2 CSV files using the
-schema defined in hwsd2_duckdb_schema.sql.
+schema defined in hwsd2_duckdb_schema.sql, then materializes denormalized
+per-SMU profile tables used for fast lookups by hwsd2_extractor.py.
 
 Usage:
     uv run python load_hwsd2.py [output_db_path]
+    uv run python load_hwsd2.py --bulk [--force] [output_db_path]
+    uv run python load_hwsd2.py --bulk --parquet hwsd2_parquet [output_db_path]
 
 Default output: hwsd2.db
+
+The --bulk mode loads all CSVs with DuckDB's parallel read_csv in a single
+transaction, builds indexes afterwards, and skips tables whose CSV checksum
+is unchanged since the previous load.
+
+The --parquet stage exports the loaded tables to a directory of compressed
+Parquet files that hwsd2_extractor.py can query directly in place of the
+database file.
 """
 
+import argparse
+import hashlib
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import duckdb
 
+from hwsd2_extractor import LAYERS_QUERY, SMU_QUERY, sql_string
+
+SCHEMA_FILE = Path(__file__).parent / "hwsd2_duckdb_schema.sql"
+
+# Records the checksum of the CSV each table was last loaded from
+MANIFEST_TABLE = "HWSD2_LOAD_MANIFEST"
+
+# The seven standard depth layers (0-20, 20-40, 40-60, 60-80, 80-100,
+# 100-150 and 150-200 cm)
+DEPTH_LAYERS = [f"D{i}" for i in range(1, 8)]
+
+
+def materialize_profiles(conn: duckdb.DuckDBPyConnection) -> None:
+    """
+    Materialize denormalized SMU profile tables for keyed lookups.
+
+    Creates two tables keyed on HWSD2_SMU_ID (primary key):
+
+    - SMU_PROFILE: one row per SMU with the HWSD2_SMU columns and the
+      resolved domain names, exactly as returned by the extractor's SMU query
+    - SMU_LAYER_PROFILE: one row per SMU with a column per depth layer
+      (D1-D7), each holding the list of that layer's rows for all soil
+      sequences, with the layer domain names resolved
+
+    Existing profile tables are replaced.
+
+    Args:
+        conn: Open connection to a loaded HWSD2 database
+
+    Examples:
+        >>> conn = duckdb.connect("hwsd2.db")
+        >>> materialize_profiles(conn)
+        >>> conn.execute("SELECT COUNT(*) FROM SMU_PROFILE").fetchone()  # doctest: +SKIP
+        (29538,)
+    """
+    smu_query = SMU_QUERY.format(where="TRUE", order="s.HWSD2_SMU_ID, s.ID")
+    layers_query = LAYERS_QUERY.format(where="TRUE", order="l.HWSD2_SMU_ID, l.TOPDEP, l.ID")
+    layer_columns = ",\n".join(
+        f"list(layer_rows ORDER BY TOPDEP, ID) FILTER (WHERE LAYER = '{layer}') AS {layer}"
+        for layer in DEPTH_LAYERS
+    )
+
+    conn.execute("DROP TABLE IF EXISTS SMU_PROFILE")
+    conn.execute(f"""
+        CREATE TABLE SMU_PROFILE AS
+        SELECT * FROM ({smu_query})
+        QUALIFY row_number() OVER (PARTITION BY HWSD2_SMU_ID ORDER BY ID) = 1
+    """)
+    conn.execute("ALTER TABLE SMU_PROFILE ADD PRIMARY KEY (HWSD2_SMU_ID)")
+
+    conn.execute("DROP TABLE IF EXISTS SMU_LAYER_PROFILE")
+    conn.execute(f"""
+        CREATE TABLE SMU_LAYER_PROFILE AS
+        WITH layer_rows AS ({layers_query})
+        SELECT HWSD2_SMU_ID, {layer_columns}
+        FROM layer_rows
+        GROUP BY HWSD2_SMU_ID
+    """)
+    conn.execute("ALTER TABLE SMU_LAYER_PROFILE ADD PRIMARY KEY (HWSD2_SMU_ID)")
+
+
+def parse_schema(schema_file: Path = SCHEMA_FILE) -> tuple[dict[str, str], list[str]]:
+    """
+    Read table and index definitions from the schema file.
+
+    COPY statements are ignored; the bulk loader reads the CSVs itself.
+
+    Args:
+        schema_file: Path to hwsd2_duckdb_schema.sql
+
+    Returns:
+        Tuple of ({table_name: CREATE TABLE statement}, [CREATE INDEX statements]),
+        tables in schema order
+
+    Examples:
+        >>> tables, indexes = parse_schema()
+        >>> 'HWSD2_LAYERS' in tables
+        True
+    """
+    if not schema_file.exists():
+        raise FileNotFoundError(f"Schema file not found: {schema_file}")
+
+    sql = "\n".join(
+        line for line in schema_file.read_text().splitlines()
+        if not line.lstrip().startswith("--")
+    )
+
+    tables = {}
+    indexes = []
+    for stmt in (s.strip() for s in sql.split(";")):
+        if stmt.startswith("CREATE TABLE"):
+            tables[stmt.split()[2]] = stmt
+        elif stmt.startswith("CREATE INDEX"):
+            indexes.append(stmt.replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS", 1))
+    return tables, indexes
+
+
+def file_checksum(path: Path) -> str:
+    """
+    Compute the SHA256 checksum of a file.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def load_hwsd2_bulk(
+    db_path: str = "hwsd2.db",
+    csv_dir: str = "HWSD2_csv",
+    force: bool = False,
+) -> dict[str, str]:
+    """
+    Load HWSD2 CSV files into DuckDB with native read_csv, skipping unchanged tables.
+
+    Every table in the schema is loaded from <csv_dir>/<TABLE>.csv with
+    DuckDB's parallel CSV reader. All changes happen in one transaction, so a
+    failure leaves the database as it was. Indexes are created after the bulk
+    load, and the SMU profile tables are rebuilt if anything changed.
+
+    A table is skipped when it exists and its CSV has the same SHA256 as the
+    one recorded in the HWSD2_LOAD_MANIFEST table at the previous load, so
+    re-running against an up-to-date database only hashes the CSVs.
+
+    Args:
+        db_path: Path to output DuckDB database file
+        csv_dir: Path to directory containing CSV files
+        force: Reload every table even if its CSV is unchanged
+
+    Returns:
+        Dictionary mapping table name to "loaded" or "skipped"
+
+    Raises:
+        FileNotFoundError: If the CSV directory or any table's CSV is missing
+
+    Examples:
+        >>> status = load_hwsd2_bulk("hwsd2.db", "HWSD2_csv")  # doctest: +SKIP
+        >>> status["HWSD2_LAYERS"]  # doctest: +SKIP
+        'skipped'
+    """
+    csv_path = Path(csv_dir)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV directory not found: {csv_path}")
+
+    tables, indexes = parse_schema()
+    csv_files = {table: csv_path / f"{table}.csv" for table in tables}
+    missing = [str(f) for f in csv_files.values() if not f.exists()]
+    if missing:
+        raise FileNotFoundError(f"CSV files not found: {', '.join(missing)}")
+
+    print(f"Bulk loading DuckDB database: {db_path}")
+    print(f"Loading from CSV directory: {csv_path}")
+
+    # Hashing is I/O bound and releases the GIL, so do the files concurrently
+    with ThreadPoolExecutor() as pool:
+        checksums = dict(zip(tables, pool.map(file_checksum, csv_files.values())))
+
+    conn = duckdb.connect(db_path)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+            TABLE_NAME VARCHAR PRIMARY KEY,
+            CSV_FILE VARCHAR,
+            SHA256 VARCHAR,
+            ROW_COUNT BIGINT,
+            LOADED_AT TIMESTAMP
+        )
+    """)
+    previous = dict(conn.execute(f"SELECT TABLE_NAME, SHA256 FROM {MANIFEST_TABLE}").fetchall())
+    existing = {row[0] for row in conn.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+
+    status = {}
+    for table in tables:
+        unchanged = table in existing and previous.get(table) == checksums[table]
+        status[table] = "skipped" if unchanged and not force else "loaded"
+    changed = [table for table, state in status.items() if state == "loaded"]
+
+    conn.begin()
+    try:
+        for table in changed:
+            print(f"  Loading: {csv_files[table].name}")
+            # Dropping the table also drops its indexes; they are rebuilt below
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(tables[table])
+            # Read every field as text and let INSERT cast to the schema types
+            conn.execute(
+                f"INSERT INTO {table} SELECT * FROM read_csv(?, header = true, all_varchar = true, nullstr = '')",
+                [str(csv_files[table])],
+            )
+            row_count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            conn.execute(
+                f"INSERT OR REPLACE INTO {MANIFEST_TABLE} VALUES (?, ?, ?, ?, current_timestamp)",
+                [table, str(csv_files[table]), checksums[table], row_count],
+            )
+
+        for index in indexes:
+            conn.execute(index)
+
+        profiles_exist = {"SMU_PROFILE", "SMU_LAYER_PROFILE"} <= existing
+        if changed or not profiles_exist:
+            print("Materializing SMU profile tables...")
+            materialize_profiles(conn)
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        conn.close()
+        raise
+
+    conn.close()
+
+    print(f"\nComplete!")
+    print(f"  Tables loaded: {len(changed)}")
+    print(f"  Tables unchanged: {len(tables) - len(changed)}")
+    print(f"\nDatabase saved to: {db_path}")
+    return status
+
+
+def export_parquet(db_path: str = "hwsd2.db", parquet_dir: str = "hwsd2_parquet") -> Path:
+    """
+    Export the HWSD2 tables to compressed Parquet files.
+
+    HWSD2_LAYERS is written as a dataset partitioned by LAYER
+    (<parquet_dir>/HWSD2_LAYERS/LAYER=D1/...), every other table (HWSD2_SMU,
+    the D_* domain tables, WRB and metadata tables, and the SMU profile
+    tables if present) as <parquet_dir>/<TABLE>.parquet. Column types are
+    preserved and rows are sorted by HWSD2_SMU_ID where present, so
+    Parquet row-group statistics can prune point lookups.
+
+    Pass the resulting directory as db_path to HWSD2Extractor to query the
+    files without a database file.
+
+    Args:
+        db_path: Path to a loaded HWSD2 DuckDB database
+        parquet_dir: Output directory (existing exports are overwritten)
+
+    Returns:
+        Path to the Parquet directory
+
+    Examples:
+        >>> export_parquet("hwsd2.db", "hwsd2_parquet")  # doctest: +SKIP
+        PosixPath('hwsd2_parquet')
+    """
+    out_path = Path(parquet_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    conn = duckdb.connect(db_path, read_only=True)
+    tables = [
+        row[0] for row in conn.execute("""
+            SELECT table_name FROM information_schema.tables
+            WHERE table_type = 'BASE TABLE' AND table_name != ?
+            ORDER BY table_name
+        """, [MANIFEST_TABLE]).fetchall()
+    ]
+
+    print(f"Exporting {len(tables)} tables to Parquet: {out_path}")
+    for table in tables:
+        columns = [row[0] for row in conn.execute(f"DESCRIBE {table}").fetchall()]
+        order = " ORDER BY HWSD2_SMU_ID" if "HWSD2_SMU_ID" in columns else ""
+        options = "FORMAT parquet, COMPRESSION zstd"
+        if table == "HWSD2_LAYERS":
+            target = out_path / table
+            options += ", PARTITION_BY (LAYER), WRITE_PARTITION_COLUMNS true, OVERWRITE true"
+        else:
+            target = out_path / f"{table}.parquet"
+        conn.execute(f"COPY (SELECT * FROM {table}{order}) TO ? ({options})", [str(target)])
+        print(f"  Exported: {table}")
+
+    conn.close()
+
+    size = sum(f.stat().st_size for f in out_path.rglob("*.parquet")) / (1024 * 1024)
+    print(f"\nParquet export saved to: {out_path} ({size:.1f} MB)")
+    return out_path
+
 
 def load_hwsd2(db_path: str = "hwsd2.db", csv_dir: str = "HWSD2_csv") -> None:
     """
@@ -41,7 +332,7 @@ def load_hwsd2(db_path: str = "hwsd2.db", csv_dir: str = "HWSD2_csv") -> None:
     conn = duckdb.connect(db_path)
 
     # Load schema from SQL file
-    schema_file = Path(__file__).parent / "hwsd2_duckdb_schema.sql"
+    schema_file = SCHEMA_FILE
     if not schema_file.exists():
         raise FileNotFoundError(f"Schema file not found: {schema_file}")
 
@@ -69,7 +360,7 @@ def load_hwsd2(db_path: str = "hwsd2.db", csv_dir: str = "HWSD2_csv") -> None:
                 csv_file = parts[1]
                 # Replace with absolute path
                 full_path = csv_path / csv_file.replace('HWSD2_csv/', '')
-                stmt = stmt.replace(f"'{csv_file}'", f"'{full_path}'")
+                stmt = stmt.replace(f"'{csv_file}'", sql_string(full_path))
                 print(f"  Loading: {full_path.name}")
                 copy_count += 1
         elif stmt.strip().startswith('CREATE TABLE'):
@@ -85,6 +376,9 @@ def load_hwsd2(db_path: str = "hwsd2.db", csv_dir: str = "HWSD2_csv") -> None:
             print(f"Warning: Failed to execute statement: {e}")
             print(f"Statement: {stmt[:100]}...")
 
+    print("\nMaterializing SMU profile tables...")
+    materialize_profiles(conn)
+
     print(f"\nComplete!")
     print(f"  Tables created: {table_count}")
     print(f"  Files loaded: {copy_count}")
@@ -93,6 +387,7 @@ def load_hwsd2(db_path: str = "hwsd2.db", csv_dir: str = "HWSD2_csv") -> None:
     print("\nDatabase statistics:")
     print(f"  HWSD2_LAYERS rows: {conn.execute('SELECT COUNT(*) FROM HWSD2_LAYERS').fetchone()[0]:,}")
     print(f"  HWSD2_SMU rows: {conn.execute('SELECT COUNT(*) FROM HWSD2_SMU').fetchone()[0]:,}")
+    print(f"  SMU_PROFILE rows: {conn.execute('SELECT COUNT(*) FROM SMU_PROFILE').fetchone()[0]:,}")
     domain_count = conn.execute("SELECT COUNT(*) FROM information_schema.tables WHERE table_name LIKE 'D_%'").fetchone()[0]
     print(f"  Domain tables: {domain_count}")
 
@@ -120,14 +415,28 @@ def load_hwsd2(db_path: str = "hwsd2.db", csv_dir: str = "HWSD2_csv") -> None:
 
 def main():
     """Main entry point for command-line usage."""
-    db_path = sys.argv[1] if len(sys.argv) > 1 else "hwsd2.db"
+    parser = argparse.ArgumentParser(description="Load HWSD2 CSV files into DuckDB")
+    parser.add_argument("db_path", nargs="?", default="hwsd2.db",
+                        help="Output DuckDB database (default: hwsd2.db)")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Load with read_csv in one transaction, skipping unchanged CSVs")
+    parser.add_argument("--force", action="store_true",
+                        help="With --bulk, reload all tables even if unchanged")
+    parser.add_argument("--parquet", metavar="DIR",
+                        help="After loading, export the tables as Parquet files to DIR")
+    args = parser.parse_args()
 
     # Determine CSV directory relative to this script
     script_dir = Path(__file__).parent
     csv_dir = script_dir / "HWSD2_csv"
 
     try:
-        load_hwsd2(str(db_path), str(csv_dir))
+        if args.bulk:
+            load_hwsd2_bulk(str(args.db_path), str(csv_dir), force=args.force)
+        else:
+            load_hwsd2(str(args.db_path), str(csv_dir))
+        if args.parquet:
+            export_parquet(str(args.db_path), args.parquet)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
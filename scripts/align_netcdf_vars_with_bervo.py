@@ -1,17 +1,27 @@
 #!/usr/bin/env python
 """Align EcoSIM NetCDF variables with BERVO ontology terms."""
 
+import json
 import sys
 from pathlib import Path
 import pandas as pd
 
+from bervo_term_index import BervoTermIndex
+
+# Columns identifying a catalog from extract_netcdf_metadata.py --catalog
+CATALOG_KEY_COLUMNS = {'file', 'variable', 'dimensions', 'dtype'}
+
 
 def load_netcdf_vars(tsv_file: Path) -> pd.DataFrame:
     """
     Load NetCDF variables from TSV file.
 
+    Accepts the hand-maintained variable table or a catalog written by
+    `extract_netcdf_metadata.py --catalog` (TSV or Parquet), which is
+    renamed to the same columns (see catalog_to_netcdf_vars).
+
     Args:
-        tsv_file: Path to ecosim_input-netcdf_variables.tsv
+        tsv_file: Path to ecosim_input-netcdf_variables.tsv or a catalog
 
     Returns:
         DataFrame with NetCDF variable specifications
@@ -20,11 +30,49 @@ def load_netcdf_vars(tsv_file: Path) -> pd.DataFrame:
     >>> 'variable-name' in df.columns  # doctest: +SKIP
     True
     """
-    df = pd.read_csv(tsv_file, sep='\t')
+    if tsv_file.suffix == '.parquet':
+        df = pd.read_parquet(tsv_file)
+    else:
+        df = pd.read_csv(tsv_file, sep='\t')
+    if CATALOG_KEY_COLUMNS.issubset(df.columns):
+        df = catalog_to_netcdf_vars(df)
     print(f"✓ Loaded {len(df)} NetCDF variables from {tsv_file.name}")
     return df
 
 
+def catalog_to_netcdf_vars(catalog: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a NetCDF metadata catalog to the variable table columns.
+
+    Args:
+        catalog: DataFrame from extract_netcdf_metadata.build_catalog
+
+    Returns:
+        DataFrame with source_file, variable-data_type, variable-name,
+        variable-shape, variable-long_name and variable-unit columns (plus
+        variable-flags when any variable has a flags attribute)
+
+    >>> catalog = pd.DataFrame({'file': ['in/grid.nc'], 'variable': ['ALATG'], 'dimensions': ['ngrid'],
+    ...                         'dtype': ['float32'], 'long_name': ['Latitude'], 'units': ['degrees north'],
+    ...                         'attrs': ['{"long_name": "Latitude", "units": "degrees north"}']})
+    >>> catalog_to_netcdf_vars(catalog).iloc[0].tolist()
+    ['grid.nc', 'float32', 'ALATG', 'ngrid', 'Latitude', 'degrees north']
+    """
+    df = pd.DataFrame({
+        'source_file': catalog['file'].map(lambda f: Path(f).name),
+        'variable-data_type': catalog['dtype'],
+        'variable-name': catalog['variable'],
+        'variable-shape': catalog['dimensions'].str.replace(', ', ',', regex=False),
+        'variable-long_name': catalog['long_name'],
+        'variable-unit': catalog['units'],
+    })
+    if 'attrs' in catalog.columns:
+        flags = catalog['attrs'].map(lambda a: json.loads(a).get('flags') if isinstance(a, str) else None)
+        if flags.notna().any():
+            df['variable-flags'] = flags
+    return df
+
+
 def load_bervo_terms(tsv_file: Path) -> pd.DataFrame:
     """
     Load BERVO ontology terms from TSV file.
@@ -44,6 +92,44 @@ def load_bervo_terms(tsv_file: Path) -> pd.DataFrame:
     return df
 
 
+def bervo_lookup_table(bervo_df: pd.DataFrame, columns: list[str]) -> tuple[pd.DataFrame, int]:
+    """
+    Build a table with one row per name a BERVO term can be matched by.
+
+    Names in 'EcoSIM Variable Name' come first. Each pipe-separated name in
+    'EcoSIM Other Names' follows, unless it is already a primary name. A
+    name listed more than once maps to its first row in bervo_df.
+
+    Args:
+        bervo_df: DataFrame with BERVO terms
+        columns: BERVO columns to include
+
+    Returns:
+        Tuple of the lookup table (a 'name' column plus columns) and the
+        number of distinct alternative names
+
+    >>> bervo = pd.DataFrame({'EcoSIM Variable Name': ['RAINH', 'TMPH'],
+    ...                       'EcoSIM Other Names': ['RAIN | PRECIP', 'RAINH'],
+    ...                       'ID': ['BERVO:1', 'BERVO:2']})
+    >>> table, n_other = bervo_lookup_table(bervo, ['ID'])
+    >>> table.values.tolist(), n_other
+    ([['RAINH', 'BERVO:1'], ['TMPH', 'BERVO:2'], ['RAIN', 'BERVO:1'], ['PRECIP', 'BERVO:1']], 3)
+    """
+    primary = bervo_df['EcoSIM Variable Name'].dropna().rename('name')
+
+    other = pd.Series(dtype=object, name='name')
+    if 'EcoSIM Other Names' in bervo_df.columns:
+        # One row per alias, keeping the index of the term it came from
+        other = bervo_df['EcoSIM Other Names'].dropna().astype(str).str.split('|').explode().str.strip()
+        other = other[other != ''].rename('name')
+        other = other[~other.duplicated()]
+
+    names = pd.concat([primary, other[~other.isin(primary)]])
+    names = names[~names.duplicated()]
+    table = names.to_frame().join(bervo_df[columns])
+    return table.reset_index(drop=True), len(other)
+
+
 def align_variables(netcdf_df: pd.DataFrame, bervo_df: pd.DataFrame) -> pd.DataFrame:
     """
     Align NetCDF variables with BERVO terms.
@@ -52,6 +138,9 @@ def align_variables(netcdf_df: pd.DataFrame, bervo_df: pd.DataFrame) -> pd.DataF
     1. NetCDF 'variable-name' with BERVO 'EcoSIM Variable Name'
     2. NetCDF 'variable-name' with BERVO 'EcoSIM Other Names' (if available)
 
+    All BERVO columns are added with one merge against bervo_lookup_table,
+    so a primary name match always wins over an alternative name.
+
     Args:
         netcdf_df: DataFrame with NetCDF variable specs
         bervo_df: DataFrame with BERVO terms
@@ -65,21 +154,6 @@ def align_variables(netcdf_df: pd.DataFrame, bervo_df: pd.DataFrame) -> pd.DataF
     >>> len(result)  # doctest: +SKIP
     2
     """
-    # Create primary mapping from BERVO by EcoSIM Variable Name
-    bervo_by_var = bervo_df.set_index('EcoSIM Variable Name')
-
-    # Create secondary mapping from EcoSIM Other Names if column exists
-    bervo_by_other = {}
-    if 'EcoSIM Other Names' in bervo_df.columns:
-        for idx, row in bervo_df.iterrows():
-            other_names = row.get('EcoSIM Other Names', '')
-            if pd.notna(other_names) and other_names:
-                # Split by pipe if multiple names
-                names = [n.strip() for n in str(other_names).split('|') if n.strip()]
-                for name in names:
-                    if name not in bervo_by_other:
-                        bervo_by_other[name] = row
-
     # Select key BERVO columns to add to the output
     bervo_cols = [
         'ID',
@@ -91,25 +165,16 @@ def align_variables(netcdf_df: pd.DataFrame, bervo_df: pd.DataFrame) -> pd.DataF
     ]
 
     # Filter to only include columns that exist
-    available_cols = [col for col in bervo_cols if col in bervo_by_var.columns]
-
-    # Add BERVO columns with prefix
-    aligned_df = netcdf_df.copy()
-
-    def get_bervo_value(var_name, col_name):
-        """Get BERVO value, trying primary then secondary mapping."""
-        # Try primary mapping (EcoSIM Variable Name)
-        if var_name in bervo_by_var.index:
-            return bervo_by_var.loc[var_name, col_name]
-        # Try secondary mapping (EcoSIM Other Names)
-        elif var_name in bervo_by_other:
-            return bervo_by_other[var_name].get(col_name)
-        return None
-
-    for col in available_cols:
-        aligned_df[f'BERVO_{col}'] = aligned_df['variable-name'].apply(
-            lambda x: get_bervo_value(x, col)
-        )
+    available_cols = [col for col in bervo_cols if col in bervo_df.columns]
+
+    lookup, n_other_names = bervo_lookup_table(bervo_df, available_cols)
+    lookup = lookup.rename(columns={'name': 'variable-name'})
+    lookup = lookup.rename(columns={col: f'BERVO_{col}' for col in available_cols})
+
+    # Names in the lookup table are unique, so the merge keeps one row per variable
+    aligned_df = netcdf_df.drop(columns=lookup.columns[1:], errors='ignore')
+    aligned_df = aligned_df.merge(lookup, on='variable-name', how='left', validate='many_to_one')
+    aligned_df.index = netcdf_df.index
 
     # Calculate match statistics
     matched = aligned_df['BERVO_ID'].notna().sum()
@@ -121,7 +186,7 @@ def align_variables(netcdf_df: pd.DataFrame, bervo_df: pd.DataFrame) -> pd.DataF
     print(f"  Matched with BERVO: {matched}")
     print(f"  Unmatched: {total - matched}")
     print(f"  Match rate: {match_rate:.1f}%")
-    print(f"  Alternative names checked: {len(bervo_by_other)}")
+    print(f"  Alternative names checked: {n_other_names}")
 
     return aligned_df
 
@@ -138,13 +203,20 @@ def write_aligned_output(df: pd.DataFrame, output_file: Path):
     print(f"\n✓ Wrote aligned variables to: {output_file}")
 
 
-def generate_unmatched_report(df: pd.DataFrame, output_file: Path):
+def generate_unmatched_report(df: pd.DataFrame, output_file: Path,
+                              bervo_df: pd.DataFrame | None = None, top_k: int = 5):
     """
     Generate a report of unmatched variables for curation.
 
+    With bervo_df, each unmatched variable gets the top_k BERVO terms most
+    similar to its long name and unit as curation candidates (see
+    BervoTermIndex.suggest).
+
     Args:
         df: DataFrame with aligned variables
         output_file: Path to unmatched report file
+        bervo_df: DataFrame with BERVO terms to suggest candidates from
+        top_k: Number of candidate terms per variable
     """
     unmatched = df[df['BERVO_ID'].isna()].copy()
 
@@ -163,6 +235,9 @@ def generate_unmatched_report(df: pd.DataFrame, output_file: Path):
 
     available_report_cols = [col for col in report_cols if col in unmatched.columns]
     unmatched_report = unmatched[available_report_cols]
+    if bervo_df is not None:
+        index = BervoTermIndex(bervo_df)
+        unmatched_report = unmatched_report.join(index.suggest(unmatched, k=top_k))
 
     unmatched_report.to_csv(output_file, sep='\t', index=False)
     print(f"✓ Wrote unmatched variables report to: {output_file}")
@@ -214,7 +289,7 @@ def main():
     write_aligned_output(aligned_df, output_file)
 
     unmatched_file = output_dir / "ecosim_input-netcdf_variables-unmatched.tsv"
-    generate_unmatched_report(aligned_df, unmatched_file)
+    generate_unmatched_report(aligned_df, unmatched_file, bervo_df)
 
     print("\n✓ Alignment complete!")
 
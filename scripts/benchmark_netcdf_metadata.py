@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Benchmark NetCDF metadata extraction in extract_netcdf_metadata.
+
+Compares opening each file with xarray against the header-only reader, on
+the EcoSIM input files and on synthetic multi-GB files, and checks both
+engines give the same records.
+
+Usage:
+    uv run python benchmark_netcdf_metadata.py [nc_file ...]
+
+Without arguments, the files in ecosim-inputs-netcdf plus a sparse 4 GB
+NetCDF3 file and a NetCDF4 file with 4 GB of (unwritten) chunked data are
+benchmarked.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import h5netcdf
+import numpy as np
+from scipy.io import netcdf_file
+
+from extract_netcdf_metadata import extract_metadata
+
+NC_DIR = Path("hackathon-case_study-experimental_warming_nitrogen/ecosim-inputs-netcdf")
+REPEATS = 20
+
+
+def write_synthetic_netcdf3(path: Path, n_records: int = 1000, ny: int = 1000, nx: int = 500) -> Path:
+    """
+    Write a sparse NetCDF3 file with n_records of two float32 (ny, nx) fields.
+
+    One record is written with scipy, then the record count in the header is
+    raised and the file extended, so the data section is a sparse hole.
+    """
+    f = netcdf_file(path, 'w', version=2)
+    f.title = 'synthetic climate forcing'
+    f.createDimension('time', None)
+    f.createDimension('y', ny)
+    f.createDimension('x', nx)
+    time_var = f.createVariable('time', 'f8', ('time',))
+    time_var.units = 'hours since 2000-01-01'
+    for name, long_name in [('TMPH', 'hourly air temperature'), ('RAINH', 'Total precipitation')]:
+        var = f.createVariable(name, 'f4', ('time', 'y', 'x'))
+        var.long_name = long_name
+        var._FillValue = np.float32(1e30)
+        var[0] = np.zeros((ny, nx), dtype=np.float32)
+    time_var[0] = 0.0
+    f.close()
+
+    record_size = 8 + 2 * ny * nx * 4
+    with open(path, 'r+b') as fh:
+        fh.seek(4)
+        fh.write(n_records.to_bytes(4, 'big'))
+        fh.truncate(path.stat().st_size + (n_records - 1) * record_size)
+    return path
+
+
+def write_synthetic_netcdf4(path: Path, nt: int = 1000, ny: int = 1000, nx: int = 1000) -> Path:
+    """Write a NetCDF4 file declaring a chunked float32 (nt, ny, nx) variable without data."""
+    with h5netcdf.File(path, 'w') as f:
+        f.attrs['title'] = 'synthetic climate forcing'
+        f.dimensions = {'time': nt, 'y': ny, 'x': nx}
+        var = f.create_variable('TMPH', ('time', 'y', 'x'), np.float32,
+                                chunks=(1, ny, nx), fillvalue=np.float32(1e30))
+        var.attrs['long_name'] = 'hourly air temperature'
+        var.attrs['units'] = 'oC'
+    return path
+
+
+def time_engine(nc_file: Path, engine: str) -> tuple[float, list[dict]]:
+    """Mean time of one extraction over REPEATS runs."""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        metadata = extract_metadata(nc_file, engine=engine)
+    return (time.perf_counter() - start) / REPEATS, metadata
+
+
+def benchmark(nc_files: list[Path]) -> None:
+    """Time both engines on each file."""
+    print(f"{'file':<36s} {'size (MB)':>10s} {'xarray (ms)':>12s} {'header (ms)':>12s} {'speedup':>8s}")
+    print("-" * 82)
+    for nc_file in nc_files:
+        xarray_time, expected = time_engine(nc_file, 'xarray')
+        header_time, result = time_engine(nc_file, 'header')
+        if result != expected:
+            raise AssertionError(f"Header metadata differs from xarray for {nc_file}")
+        size = nc_file.stat().st_size / (1024 * 1024)
+        print(f"{nc_file.name:<36s} {size:>10,.1f} {xarray_time * 1000:>12.2f} "
+              f"{header_time * 1000:>12.3f} {xarray_time / header_time:>7.0f}x")
+
+
+def main():
+    """Main entry point for command-line usage."""
+    if len(sys.argv) > 1:
+        benchmark([Path(arg) for arg in sys.argv[1:]])
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        nc_files = sorted(NC_DIR.glob("*.nc"))
+        nc_files.append(write_synthetic_netcdf3(temp_dir / "synthetic_netcdf3.nc"))
+        nc_files.append(write_synthetic_netcdf4(temp_dir / "synthetic_netcdf4.nc"))
+        benchmark(nc_files)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+"""
+Suggest BERVO terms for NetCDF variables by approximate text matching.
+
+Builds a character trigram inverted index with TF-IDF weights over the
+labels, synonyms, EcoSIM names and definitions in bervo-terms.tsv. A query
+(a variable's long_name, plus its unit as a tie-breaker) is scored by
+cosine similarity against only the terms sharing a trigram with it, by
+walking the posting lists of the query's trigrams.
+
+Usage:
+    uv run python scripts/bervo_term_index.py "long name" [unit]
+
+Example:
+    uv run python scripts/bervo_term_index.py "NC ratio in plant stalk" "gN gC-1"
+"""
+
+import math
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+NGRAM_SIZE = 3
+
+# BERVO columns indexed for each term, with the weight of their trigrams
+FIELD_WEIGHTS = {
+    'Label (description)': 1.0,
+    'Exact Synonyms': 1.0,
+    'Related Synonyms': 1.0,
+    'EcoSIM Variable Name': 1.0,
+    'EcoSIM Other Names': 1.0,
+    'Definition': 0.2,
+}
+
+# Units that say nothing about which term a variable is
+DIMENSIONLESS_UNITS = {'', 'none', '-', '1', 'nan', 'unitless', 'dimensionless'}
+
+
+def normalize_text(text) -> str:
+    """
+    Lowercase text and reduce everything but letters and digits to single spaces.
+
+    >>> normalize_text("Rate const. for N-fixation (max)")
+    'rate const for n fixation max'
+    """
+    if text is None or (isinstance(text, float) and math.isnan(text)):
+        return ''
+    return ' '.join(re.findall(r'[a-z0-9]+', str(text).lower()))
+
+
+def normalize_unit(unit) -> str:
+    """
+    Canonical form of a unit string for exact comparison.
+
+    >>> normalize_unit("mol m^-3"), normalize_unit("none")
+    ('molm-3', '')
+    """
+    if unit is None or (isinstance(unit, float) and math.isnan(unit)):
+        return ''
+    unit = re.sub(r'[\s^*]', '', str(unit).lower())
+    return '' if unit in DIMENSIONLESS_UNITS else unit
+
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> Counter:
+    """
+    Count the character n-grams of each word, padded with a space on both sides.
+
+    >>> sorted(char_ngrams("leaf area"))
+    [' ar', ' le', 'af ', 'are', 'ea ', 'eaf', 'lea', 'rea']
+    """
+    words = [f" {word} " for word in normalize_text(text).split()]
+    return Counter(word[i:i + n] for word in words for i in range(len(word) - n + 1))
+
+
+class BervoTermIndex:
+    """
+    Character trigram TF-IDF index over BERVO terms.
+
+    Each term is a weighted bag of trigrams from the FIELD_WEIGHTS columns,
+    weighted by sublinear TF times smoothed IDF and L2-normalized. The
+    posting list of a trigram holds the ids and weights of the terms that
+    contain it. Trigrams found in more than max_df of the terms are left out,
+    as they say little about a match and have the longest posting lists.
+    """
+
+    def __init__(self, bervo_df: pd.DataFrame, max_df: float = 0.5, unit_weight: float = 0.05):
+        """
+        Build the index.
+
+        Args:
+            bervo_df: DataFrame from load_bervo_terms (the ROBOT template row
+                without a BERVO ID is skipped)
+            max_df: Leave out trigrams occurring in more than this fraction of terms
+            unit_weight: Score added to a candidate whose has_units equals the query unit
+        """
+        terms = bervo_df[bervo_df['ID'].astype(str).str.startswith('BERVO:')].reset_index(drop=True)
+        self.ids = terms['ID'].to_numpy()
+        self.labels = terms['Label (description)'].fillna('').to_numpy() \
+            if 'Label (description)' in terms.columns else np.full(len(terms), '')
+        self.unit_weight = unit_weight
+        self.units = terms['has_units'].map(normalize_unit).to_numpy() \
+            if 'has_units' in terms.columns else np.full(len(terms), '')
+
+        fields = [(col, weight) for col, weight in FIELD_WEIGHTS.items() if col in terms.columns]
+        term_grams = []
+        for values in zip(*(terms[col].tolist() for col, _ in fields)):
+            grams = Counter()
+            for value, (_, weight) in zip(values, fields):
+                # Pipe-separated lists are indexed as separate words
+                text = str(value).replace('|', ' ') if isinstance(value, str) else value
+                counts = char_ngrams(text)
+                if weight != 1.0:
+                    counts = {gram: weight * count for gram, count in counts.items()}
+                grams.update(counts)
+            term_grams.append(grams)
+
+        n_terms = len(term_grams)
+        document_frequency = Counter(gram for grams in term_grams for gram in grams)
+        self.idf = {
+            gram: math.log((1 + n_terms) / (1 + df)) + 1
+            for gram, df in document_frequency.items()
+            if df <= max_df * n_terms
+        }
+
+        postings = {}
+        for term_id, grams in enumerate(term_grams):
+            vector = self._weigh(grams)
+            for gram, weight in vector.items():
+                postings.setdefault(gram, ([], []))
+                postings[gram][0].append(term_id)
+                postings[gram][1].append(weight)
+        self.postings = {
+            gram: (np.array(term_ids, dtype=np.int32), np.array(weights))
+            for gram, (term_ids, weights) in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _weigh(self, grams: Counter) -> dict[str, float]:
+        """L2-normalized TF-IDF weights of the indexed trigrams in grams."""
+        vector = {
+            gram: (1 + math.log(count)) * self.idf[gram] if count >= 1 else count * self.idf[gram]
+            for gram, count in grams.items() if gram in self.idf
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {gram: weight / norm for gram, weight in vector.items()} if norm else {}
+
+    def search(self, text: str, unit: str | None = None, k: int = 5) -> list[tuple[str, str, float]]:
+        """
+        Find the BERVO terms most similar to a variable description.
+
+        Args:
+            text: Query text, e.g. a variable's long_name
+            unit: Variable unit; candidates with the same has_units score
+                unit_weight higher
+            k: Number of terms to return
+
+        Returns:
+            Up to k (ID, label, score) tuples, best first; scores are cosine
+            similarities (plus the unit bonus)
+
+        >>> bervo = pd.DataFrame({
+        ...     'ID': ['BERVO:1', 'BERVO:2'],
+        ...     'Label (description)': ['Leaf nitrogen content', 'Stalk density'],
+        ...     'has_units': ['gN', 'MgC m-3']})
+        >>> [term_id for term_id, _, _ in BervoTermIndex(bervo).search('density of stalk')]
+        ['BERVO:2']
+        """
+        query = self._weigh(char_ngrams(text))
+        if not query:
+            return []
+
+        # Accumulate scores over the posting lists of the query trigrams only
+        term_ids = np.concatenate([self.postings[gram][0] for gram in query])
+        weights = np.concatenate([self.postings[gram][1] * weight for gram, weight in query.items()])
+        candidates, inverse = np.unique(term_ids, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+
+        unit = normalize_unit(unit)
+        if unit and self.unit_weight:
+            scores = scores + self.unit_weight * (self.units[candidates] == unit)
+
+        # Highest score first; ties keep the BERVO file order
+        top = np.lexsort((candidates, -scores))[:k]
+        return [(self.ids[i], self.labels[i], round(float(s), 4))
+                for i, s in zip(candidates[top], scores[top])]
+
+    def suggest(self, netcdf_df: pd.DataFrame, k: int = 5) -> pd.DataFrame:
+        """
+        Suggest BERVO terms for each row of a NetCDF variable table.
+
+        Queries use 'variable-long_name' (falling back to 'variable-name')
+        and 'variable-unit'. Repeated (long_name, unit) pairs are searched once.
+
+        Args:
+            netcdf_df: DataFrame with NetCDF variable specs
+            k: Number of suggestions per variable
+
+        Returns:
+            DataFrame with the index of netcdf_df and pipe-separated
+            'BERVO_suggested_IDs', 'BERVO_suggested_labels' and
+            'BERVO_suggested_scores' columns
+        """
+        long_names = netcdf_df.get('variable-long_name', pd.Series(index=netcdf_df.index, dtype=object))
+        names = long_names.where(long_names.notna(), netcdf_df.get('variable-name'))
+        units = netcdf_df.get('variable-unit', pd.Series(index=netcdf_df.index, dtype=object))
+
+        results = {}
+        rows = []
+        for text, unit in zip(names.tolist(), units.tolist()):
+            key = (normalize_text(text), normalize_unit(unit))
+            if key not in results:
+                matches = self.search(key[0], key[1], k=k)
+                results[key] = (
+                    '|'.join(term_id for term_id, _, _ in matches),
+                    '|'.join(label for _, label, _ in matches),
+                    '|'.join(f"{score:.3f}" for _, _, score in matches),
+                )
+            rows.append(results[key])
+        return pd.DataFrame(
+            rows,
+            index=netcdf_df.index,
+            columns=['BERVO_suggested_IDs', 'BERVO_suggested_labels', 'BERVO_suggested_scores'],
+        )
+
+
+def main():
+    """Main entry point for command-line usage."""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    bervo_file = Path("bervo/bervo-terms.tsv")
+    if not bervo_file.exists():
+        print(f"✗ BERVO terms file not found: {bervo_file}")
+        sys.exit(1)
+
+    index = BervoTermIndex(pd.read_csv(bervo_file, sep='\t'))
+    unit = sys.argv[2] if len(sys.argv) > 2 else None
+    for term_id, label, score in index.search(sys.argv[1], unit):
+        print(f"{score:.3f}  {term_id}  {label}")
+
+
+if __name__ == "__main__":
+    main()
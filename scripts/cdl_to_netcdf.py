@@ -0,0 +1,500 @@
+#!/usr/bin/env python
+"""
+Compile CDL (the text form written by ncdump) to NetCDF without ncgen.
+
+Parses the dimensions, typed variables, attributes and data sections of a
+classic-model CDL file and writes a NetCDF3 file with scipy, in the same
+way `ncgen -o file.nc file.nc.cdl` does. Compiled files are cached by the
+SHA-256 of the CDL text, so regenerating an unchanged CDL is a file copy.
+
+Usage:
+    uv run python scripts/cdl_to_netcdf.py input.nc.cdl [output.nc]
+
+Default output: the CDL path without the .cdl suffix
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from scipy.io import netcdf_file
+
+# Bump when the compiler output changes, to invalidate cached files
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'ecosim-co-scientist' / 'cdl'
+
+# CDL type names -> (NetCDF3 dtype, scipy typecode)
+CDL_TYPES = {
+    'byte': (np.dtype('i1'), 'b'),
+    'char': (np.dtype('S1'), 'c'),
+    'short': (np.dtype('>i2'), 'h'),
+    'int': (np.dtype('>i4'), 'i'),
+    'long': (np.dtype('>i4'), 'i'),
+    'float': (np.dtype('>f4'), 'f'),
+    'real': (np.dtype('>f4'), 'f'),
+    'double': (np.dtype('>f8'), 'd'),
+}
+
+# Types only the CDF-5 and NetCDF4 formats can hold
+UNSUPPORTED_TYPES = {'ubyte', 'ushort', 'uint', 'int64', 'uint64', 'string'}
+
+# Default fill values of the NetCDF library
+DEFAULT_FILL_VALUES = {
+    'b': -127, 'c': b'\x00', 'h': -32767, 'i': -2147483647,
+    'f': 9.9692099683868690e+36, 'd': 9.9692099683868690e+36,
+}
+
+# Numeric literal suffixes -> attribute type
+NUMBER_SUFFIXES = {'b': 'byte', 's': 'short', 'l': 'int', 'f': 'float', 'd': 'double'}
+
+TOKEN_PATTERN = re.compile(r'''
+    (?P<space>\s+|//[^\n]*)
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<number>[+-]?(?:(?:nan|inf(?:inity)?)(?![\w.])|(?:nan|inf)f(?![\w.])
+        |0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)[bBsSlLfFdDuU]*)
+  | (?P<name>[A-Za-z_][\w.@+-]*)
+  | (?P<punct>[{}(),;:=])
+''', re.VERBOSE | re.IGNORECASE)
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', '"': '"', "'": "'", '0': '\0'}
+
+SECTIONS = {'dimensions', 'variables', 'data'}
+
+NC_VARIABLE = b'\x00\x00\x00\x0b'
+ABSENT = b'\x00' * 8
+
+
+def tokenize(text: str) -> list[tuple[str, str]]:
+    """
+    Split CDL text into (kind, value) tokens, dropping whitespace and comments.
+
+    Raises:
+        ValueError: On characters that cannot start a token
+    """
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = TOKEN_PATTERN.match(text, pos)
+        if match is None:
+            line = text.count('\n', 0, pos) + 1
+            raise ValueError(f"Unexpected character {text[pos]!r} on line {line}")
+        kind = match.lastgroup
+        if kind != 'space':
+            tokens.append((kind, match.group()))
+        pos = match.end()
+    return tokens
+
+
+def _unquote(token: str) -> str:
+    """Strip the quotes of a string literal and expand its escapes."""
+    return re.sub(r'\\(.)', lambda m: ESCAPES.get(m.group(1), m.group(1)), token[1:-1])
+
+
+def _parse_number(token: str) -> tuple[int | float, str | None]:
+    """Value and suffix type of a numeric literal (suffix type None if unsuffixed)."""
+    special = token.lower()
+    if special.lstrip('+-') in ('nan', 'inf', 'infinity'):
+        return float(special), 'double'
+    if special.lstrip('+-') in ('nanf', 'inff'):
+        return float(special[:-1]), 'float'
+
+    body = token.rstrip('bBsSlLfFdDuU') if not special.lstrip('+-').startswith('0x') else token.rstrip('sSlLuU')
+    suffix = token[len(body):].lower().replace('u', '')
+    if special.lstrip('+-').startswith('0x'):
+        value = int(body, 16)
+    elif re.fullmatch(r'[+-]?\d+', body):
+        value = int(body)
+    else:
+        value = float(body)
+    return value, NUMBER_SUFFIXES.get(suffix[-1:]) if suffix else None
+
+
+class _Parser:
+    """Recursive-descent parser over a CDL token list."""
+
+    def __init__(self, tokens: list[tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> tuple[str, str]:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else ('eof', '')
+
+    def next(self) -> tuple[str, str]:
+        token = self.peek()
+        if token[0] == 'eof':
+            raise ValueError("Unexpected end of CDL")
+        self.pos += 1
+        return token
+
+    def expect(self, value: str) -> None:
+        kind, found = self.next()
+        if found != value:
+            raise ValueError(f"Expected {value!r} in CDL, found {found!r}")
+
+    def name(self) -> str:
+        kind, value = self.next()
+        if kind != 'name':
+            raise ValueError(f"Expected a name in CDL, found {value!r}")
+        return value
+
+    def at_section_end(self) -> bool:
+        kind, value = self.peek()
+        return value == '}' or (kind == 'name' and value in SECTIONS and self.peek(1)[1] == ':')
+
+    def values(self) -> list:
+        """Comma-separated literal values up to the terminating ';'."""
+        values = []
+        while True:
+            kind, value = self.next()
+            if kind == 'string':
+                values.append(_unquote(value))
+            elif kind == 'number':
+                values.append(_parse_number(value))
+            elif kind == 'name' and value == '_':
+                values.append(None)
+            else:
+                raise ValueError(f"Unexpected {value!r} in CDL values")
+            kind, value = self.next()
+            if value == ';':
+                return values
+            if value != ',':
+                raise ValueError(f"Expected ',' or ';' in CDL values, found {value!r}")
+
+    def parse(self) -> dict:
+        self.expect('netcdf')
+        dataset = {'name': self.name(), 'dimensions': {}, 'variables': {}, 'attributes': {}}
+        self.expect('{')
+        while self.peek()[1] != '}':
+            section = self.name()
+            self.expect(':')
+            if section == 'dimensions':
+                self.dimensions(dataset)
+            elif section == 'variables':
+                self.variables(dataset)
+            elif section == 'data':
+                self.data(dataset)
+            else:
+                raise ValueError(f"Unsupported CDL section: {section}")
+        self.expect('}')
+        return dataset
+
+    def dimensions(self, dataset: dict) -> None:
+        while not self.at_section_end():
+            while True:
+                name = self.name()
+                self.expect('=')
+                kind, value = self.next()
+                if value.upper() == 'UNLIMITED':
+                    dataset['dimensions'][name] = None
+                elif kind == 'number':
+                    dataset['dimensions'][name] = int(_parse_number(value)[0])
+                else:
+                    raise ValueError(f"Invalid size for dimension {name}: {value!r}")
+                if self.next()[1] == ';':
+                    break
+
+    def variables(self, dataset: dict) -> None:
+        while not self.at_section_end():
+            kind, value = self.peek()
+            if value == ':' or self.peek(1)[1] == ':':
+                # Attribute of a variable (var:att) or global attribute (:att)
+                var_name = None if value == ':' else self.name()
+                self.expect(':')
+                att_name = self.name()
+                self.expect('=')
+                target = dataset['attributes'] if var_name is None else dataset['variables'][var_name]['attributes']
+                target[att_name] = self.values()
+                continue
+
+            type_name = self.name().lower()
+            if type_name in UNSUPPORTED_TYPES:
+                raise ValueError(f"CDL type {type_name!r} needs the CDF-5 or NetCDF4 format")
+            if type_name not in CDL_TYPES:
+                raise ValueError(f"Unknown CDL type: {type_name}")
+            while True:
+                name = self.name()
+                dims = []
+                if self.peek()[1] == '(':
+                    self.next()
+                    while True:
+                        dims.append(self.name())
+                        if self.next()[1] == ')':
+                            break
+                for dim in dims:
+                    if dim not in dataset['dimensions']:
+                        raise ValueError(f"Variable {name} uses undefined dimension {dim}")
+                dataset['variables'][name] = {
+                    'type': type_name, 'dimensions': tuple(dims), 'attributes': {}, 'data': None,
+                }
+                if self.next()[1] == ';':
+                    break
+
+    def data(self, dataset: dict) -> None:
+        while not self.at_section_end():
+            name = self.name()
+            if name not in dataset['variables']:
+                raise ValueError(f"Data for undefined variable: {name}")
+            self.expect('=')
+            dataset['variables'][name]['data'] = self.values()
+
+
+def parse_cdl(text: str) -> dict:
+    """
+    Parse CDL text into a dataset description.
+
+    Args:
+        text: CDL text
+
+    Returns:
+        Dictionary with 'name', 'dimensions' (name -> size, None for
+        UNLIMITED), 'attributes' and 'variables' (name -> dict with 'type',
+        'dimensions', 'attributes' and 'data'). Attribute and data values are
+        lists of str, (number, suffix type) tuples and None for '_' fills.
+
+    Raises:
+        ValueError: On syntax errors or unsupported (non-classic) features
+
+    Examples:
+        >>> ds = parse_cdl('netcdf x { dimensions: n = 2 ; variables: float v(n) ; v:units = "m" ; data: v = 1, _ ; }')
+        >>> ds['dimensions'], ds['variables']['v']['data']
+        ({'n': 2}, [(1, None), None])
+    """
+    return _Parser(tokenize(text)).parse()
+
+
+def _attribute_value(values: list, var_type: str | None = None):
+    """NetCDF attribute value of parsed CDL values, typed like ncgen does."""
+    if all(isinstance(v, str) for v in values):
+        return ''.join(values).encode('utf-8')
+    if any(isinstance(v, str) or v is None for v in values):
+        raise ValueError("CDL attributes cannot mix text and numbers")
+    if var_type is not None:
+        type_name = var_type
+    else:
+        # The first suffixed value sets the type; unsuffixed values are int
+        # unless any of them is a floating point literal
+        suffixed = [suffix for _, suffix in values if suffix]
+        if suffixed:
+            type_name = suffixed[0]
+        elif any(isinstance(value, float) for value, _ in values):
+            type_name = 'double'
+        else:
+            type_name = 'int'
+    dtype = CDL_TYPES[type_name][0]
+    return np.array([value for value, _ in values], dtype=dtype)
+
+
+def _fill_value(var: dict):
+    """Value written for '_' and missing data: the _FillValue attribute or the library default."""
+    typecode = CDL_TYPES[var['type']][1]
+    fill = var['attributes'].get('_FillValue')
+    if fill is not None and typecode != 'c':
+        return fill[0][0]
+    return DEFAULT_FILL_VALUES[typecode]
+
+
+def _record_count(var: dict, dims: dict) -> int:
+    """Number of records the data of a record variable fills."""
+    data = var['data'] or []
+    inner = [dims[d] for d in var['dimensions'][1:]]
+    per_record = int(np.prod(inner)) if inner else 1
+    if var['type'] == 'char':
+        width = inner[-1] if inner else 1
+        length = sum(max(1, -(-len(v.encode('utf-8')) // width)) * width if isinstance(v, str) else 1
+                     for v in data)
+    else:
+        length = len(data)
+    return -(-length // per_record) if per_record else 0
+
+
+def _char_data(values: list, shape: tuple) -> np.ndarray:
+    """
+    Character array from CDL strings.
+
+    With more than one dimension, each string is padded with NULs to a
+    multiple of the last dimension, as ncgen does.
+    """
+    width = shape[-1] if len(shape) > 1 else None
+    chunks = []
+    for value in values:
+        raw = value.encode('utf-8') if isinstance(value, str) else b'\x00'
+        if width:
+            raw = raw.ljust(max(1, -(-len(raw) // width)) * width, b'\x00')
+        chunks.append(raw)
+    raw = b''.join(chunks)
+    size = int(np.prod(shape))
+    if len(raw) > size:
+        raise ValueError(f"Too much character data ({len(raw)} > {size})")
+    return np.frombuffer(raw.ljust(size, b'\x00'), dtype='S1').reshape(shape)
+
+
+def _numeric_data(values: list, shape: tuple, dtype: np.dtype, fill) -> np.ndarray:
+    """Numeric array from CDL values, padded with the fill value."""
+    size = int(np.prod(shape))
+    if len(values) > size:
+        raise ValueError(f"Too many data values ({len(values)} > {size})")
+    flat = [fill if v is None else v[0] for v in values]
+    flat.extend([fill] * (size - len(flat)))
+    return np.array(flat, dtype=np.float64 if dtype.kind == 'f' else object).astype(dtype).reshape(shape)
+
+
+class _CdlNetcdfFile(netcdf_file):
+    """
+    scipy netcdf_file writing variables in declaration order.
+
+    scipy sorts variables by shape before writing, which puts scalar
+    variables after the record variables, where their data overlaps the
+    records. Like ncgen, this keeps the header in declaration order and
+    only moves the data of non-record variables ahead of the records (the
+    begin offsets in the header are filled in as the data is written).
+    """
+
+    def _write_var_array(self):
+        if not self.variables:
+            self.fp.write(ABSENT)
+            return
+        self.fp.write(NC_VARIABLE)
+        self._pack_int(len(self.variables))
+        for name in self.variables:
+            self._write_var_metadata(name)
+        self.__dict__['_recsize'] = sum(var._vsize for var in self.variables.values() if var.isrec)
+        for name in sorted(self.variables, key=lambda name: self.variables[name].isrec):
+            self._write_var_data(name)
+
+
+def write_netcdf(dataset: dict, nc_file: Path, version: int = 1) -> Path:
+    """
+    Write a parsed CDL dataset as a NetCDF3 file.
+
+    Variables without data are written with their fill value. The length of
+    the UNLIMITED dimension is set by the longest record variable.
+
+    Args:
+        dataset: Dataset description from parse_cdl
+        nc_file: Output path
+        version: 1 for classic, 2 for 64-bit offset format
+
+    Returns:
+        Path to the written file
+    """
+    dims = dict(dataset['dimensions'])
+    record_dim = next((name for name, size in dims.items() if size is None), None)
+    if record_dim is not None:
+        dims[record_dim] = max(
+            [_record_count(var, dims) for var in dataset['variables'].values()
+             if var['dimensions'][:1] == (record_dim,)],
+            default=0,
+        )
+
+    f = _CdlNetcdfFile(nc_file, 'w', version=version)
+    try:
+        # createDimension only accepts an unlimited dimension as the first one
+        # created, while the format allows it anywhere; keep the CDL order
+        for name, size in dataset['dimensions'].items():
+            f.dimensions[name] = size
+            f._dims.append(name)
+        for name, values in dataset['attributes'].items():
+            f._attributes[name] = _attribute_value(values)
+
+        for name, var in dataset['variables'].items():
+            dtype, typecode = CDL_TYPES[var['type']]
+            nc_var = f.createVariable(name, typecode, var['dimensions'])
+            for att_name, values in var['attributes'].items():
+                att_type = var['type'] if att_name == '_FillValue' and var['type'] != 'char' else None
+                nc_var._attributes[att_name] = _attribute_value(values, att_type)
+
+            shape = tuple(dims[d] for d in var['dimensions'])
+            values = var['data'] or []
+            if typecode == 'c':
+                data = _char_data(values, shape)
+            else:
+                data = _numeric_data(values, shape, dtype, _fill_value(var))
+            if nc_var.isrec:
+                if shape[0]:
+                    nc_var[:shape[0]] = data
+            else:
+                nc_var.data[...] = data
+    finally:
+        f.close()
+    return Path(nc_file)
+
+
+def compile_cdl(
+    cdl_file: Path,
+    nc_file: Path | None = None,
+    cache_dir: Path | None = DEFAULT_CACHE_DIR,
+    version: int = 1,
+) -> Path:
+    """
+    Compile a CDL file to NetCDF, reusing a cached result for identical CDL.
+
+    The cache holds one compiled file per SHA-256 of the CDL text (and the
+    output format), so regenerating an unchanged CDL copies the cached file
+    instead of parsing it again.
+
+    Args:
+        cdl_file: Input CDL path
+        nc_file: Output path (default: cdl_file without the .cdl suffix)
+        cache_dir: Cache directory (default: ~/.cache/ecosim-co-scientist/cdl,
+            honouring XDG_CACHE_HOME); None disables caching
+        version: 1 for classic, 2 for 64-bit offset format
+
+    Returns:
+        Path to the NetCDF file
+
+    Raises:
+        ValueError: If the CDL cannot be parsed or uses non-classic features
+
+    Examples:
+        >>> compile_cdl(Path("Blodget_grid_20240622.nc.cdl"))  # doctest: +SKIP
+        PosixPath('Blodget_grid_20240622.nc')
+    """
+    cdl_file = Path(cdl_file)
+    nc_file = Path(nc_file) if nc_file is not None else cdl_file.with_suffix('')
+    raw = cdl_file.read_bytes()
+
+    if cache_dir is None:
+        return write_netcdf(parse_cdl(raw.decode('utf-8')), nc_file, version=version)
+
+    digest = hashlib.sha256(raw)
+    digest.update(f"cdl-v{CACHE_VERSION}-nc{version}".encode())
+    cache_dir = Path(cache_dir)
+    cached = cache_dir / f"{digest.hexdigest()}.nc"
+    if not cached.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary name so a concurrent reader never sees a partial file
+        fd, temp_name = tempfile.mkstemp(dir=cache_dir, suffix='.part')
+        os.close(fd)
+        try:
+            write_netcdf(parse_cdl(raw.decode('utf-8')), Path(temp_name), version=version)
+            os.replace(temp_name, cached)
+        finally:
+            Path(temp_name).unlink(missing_ok=True)
+    shutil.copyfile(cached, nc_file)
+    return nc_file
+
+
+def main():
+    """Main entry point for command-line usage."""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    cdl_file = Path(sys.argv[1])
+    nc_file = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    try:
+        output = compile_cdl(cdl_file, nc_file)
+    except (OSError, ValueError) as e:
+        print(f"✗ Conversion failed: {e}")
+        sys.exit(1)
+    print(f"✓ Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,428 @@
 #!/usr/bin/env python
-"""Extract variable metadata from NetCDF files to CSV."""
+"""Extract variable metadata from NetCDF files to CSV.
 
+By default only the file header is read: the NetCDF3 classic/64-bit
+offset/CDF-5 header is parsed directly and NetCDF4 (HDF5) metadata is read
+through h5netcdf, so variable data is never touched. The reported dtypes and
+attributes follow xarray's CF decoding, as with engine='xarray'.
+"""
+
+import argparse
 import csv
+import json
+import math
+import multiprocessing
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+
+import h5netcdf
+import numpy as np
+import pandas as pd
 import xarray as xr
 
+try:
+    import h5py
+except ImportError:  # Only needed for NetCDF4 (HDF5) files
+    h5py = None
+
+NETCDF3_MAGIC = b'CDF'
+HDF5_MAGIC = b'\x89HDF\r\n\x1a\n'
+
+# NetCDF3 header list tags
+NC_DIMENSION = 0x0A
+NC_VARIABLE = 0x0B
+NC_ATTRIBUTE = 0x0C
+
+# NetCDF3 external types (types 7-11 only occur in CDF-5 files)
+NC_TYPES = {
+    1: np.dtype('i1'), 2: np.dtype('S1'), 3: np.dtype('>i2'), 4: np.dtype('>i4'),
+    5: np.dtype('>f4'), 6: np.dtype('>f8'), 7: np.dtype('u1'), 8: np.dtype('>u2'),
+    9: np.dtype('>u4'), 10: np.dtype('>i8'), 11: np.dtype('>u8'),
+}
+
+# Units xarray decodes to timedelta64 (when the variable has a dtype attribute)
+TIME_UNITS = {'days', 'hours', 'minutes', 'seconds', 'milliseconds', 'microseconds', 'nanoseconds'}
+
+# Calendars xarray decodes to datetime64 (others become cftime objects)
+STANDARD_CALENDARS = {'standard', 'gregorian', 'proleptic_gregorian'}
+
+# Columns of the consolidated catalog written by build_catalog
+CATALOG_COLUMNS = ['file', 'variable', 'dimensions', 'shape', 'dtype', 'ndim', 'size',
+                   'long_name', 'units', 'coordinate', 'attrs']
+
+# numrecs value of a file written in streaming mode
+STREAMING_NUMRECS = {4: 0xFFFFFFFF, 8: 0xFFFFFFFFFFFFFFFF}
+
+
+class _Netcdf3HeaderReader:
+    """Sequential reader for the big-endian fields of a NetCDF3 header."""
+
+    # The header is read from the file in blocks of this size
+    BLOCK_SIZE = 65536
+
+    def __init__(self, f, version: int):
+        self.f = f
+        self.buffer = b''
+        self.pos = 0
+        self.count_size = 8 if version == 5 else 4
+        self.offset_size = 4 if version == 1 else 8
+
+    def read(self, n: int) -> bytes:
+        end = self.pos + n
+        while end > len(self.buffer):
+            block = self.f.read(max(self.BLOCK_SIZE, end - len(self.buffer)))
+            if not block:
+                raise ValueError("Truncated NetCDF header")
+            self.buffer += block
+        data = self.buffer[self.pos:end]
+        self.pos = end
+        return data
+
+    def integer(self, size: int) -> int:
+        return int.from_bytes(self.read(size), 'big')
+
+    def count(self) -> int:
+        return self.integer(self.count_size)
+
+    def padded(self, n: int) -> bytes:
+        return self.read(n + (-n % 4))[:n]
+
+    def name(self) -> str:
+        return self.padded(self.count()).decode('utf-8')
+
+    def list_length(self, tag: int) -> int:
+        found, n = self.integer(4), self.count()
+        if found == 0 and n == 0:
+            return 0  # ABSENT
+        if found != tag:
+            raise ValueError(f"Malformed NetCDF header: expected tag {tag:#x}, found {found:#x}")
+        return n
+
+    def attributes(self) -> dict:
+        attrs = {}
+        for _ in range(self.list_length(NC_ATTRIBUTE)):
+            name = self.name()
+            dtype = NC_TYPES[self.integer(4)]
+            n = self.count()
+            raw = self.padded(n * dtype.itemsize)
+            # Same values as scipy.io.netcdf_file: stripped bytes for text,
+            # a scalar for single values and an array otherwise
+            if dtype.kind == 'S':
+                attrs[name] = raw.rstrip(b'\x00')
+            else:
+                values = np.frombuffer(raw, dtype=dtype).copy()
+                attrs[name] = values[0] if values.shape == (1,) else values
+        return attrs
+
+
+def read_netcdf3_header(nc_file: Path) -> dict:
+    """
+    Parse the header of a NetCDF3 classic, 64-bit offset or CDF-5 file.
+
+    Only the header at the start of the file is read. Text attributes are
+    returned as bytes, as scipy.io.netcdf_file does.
+
+    Args:
+        nc_file: Path to NetCDF3 file
+
+    Returns:
+        Dictionary with 'dimensions' (name -> length, the record dimension
+        taking the number of records), 'attributes' and 'variables' (name ->
+        dict with 'dimensions', 'shape', 'dtype' and 'attributes')
+
+    Raises:
+        ValueError: If the file is not a NetCDF3 file or the header is malformed
+    """
+    with open(nc_file, 'rb') as f:
+        magic = f.read(4)
+        if magic[:3] != NETCDF3_MAGIC or magic[3] not in (1, 2, 5):
+            raise ValueError(f"Not a NetCDF3 file: {nc_file}")
+        reader = _Netcdf3HeaderReader(f, magic[3])
+        numrecs = reader.count()
+
+        dim_names, dim_lengths, record_dim = [], [], None
+        for i in range(reader.list_length(NC_DIMENSION)):
+            dim_names.append(reader.name())
+            dim_lengths.append(reader.count())
+            if dim_lengths[-1] == 0:
+                record_dim = i
+        attributes = reader.attributes()
+
+        variables, record_size, first_record = {}, 0, None
+        for _ in range(reader.list_length(NC_VARIABLE)):
+            name = reader.name()
+            dim_ids = [reader.count() for _ in range(reader.count())]
+            var_attrs = reader.attributes()
+            dtype = NC_TYPES[reader.integer(4)]
+            vsize = reader.count()
+            begin = reader.integer(reader.offset_size)
+            if dim_ids and dim_ids[0] == record_dim:
+                record_size += vsize
+                first_record = begin if first_record is None else min(first_record, begin)
+            variables[name] = {'dim_ids': dim_ids, 'dtype': dtype, 'attributes': var_attrs}
+
+        if numrecs == STREAMING_NUMRECS[reader.count_size]:
+            file_size = Path(nc_file).stat().st_size
+            numrecs = (file_size - first_record) // record_size if record_size else 0
+
+    if record_dim is not None:
+        dim_lengths[record_dim] = numrecs
+    for var in variables.values():
+        dim_ids = var.pop('dim_ids')
+        var['dimensions'] = tuple(dim_names[i] for i in dim_ids)
+        var['shape'] = tuple(dim_lengths[i] for i in dim_ids)
+        var['dtype'] = var['dtype'].newbyteorder('=')
+
+    return {
+        'dimensions': dict(zip(dim_names, dim_lengths)),
+        'attributes': attributes,
+        'variables': variables,
+    }
+
+
+def read_netcdf4_header(nc_file: Path) -> dict:
+    """
+    Read the dimensions, variables and attributes of a NetCDF4 (HDF5) file.
+
+    Uses h5netcdf, which reads the HDF5 object headers but no dataset
+    chunks. The exception is variable-length string variables: xarray
+    reports them as fixed-width unicode, whose width depends on the longest
+    string, so those (label-sized) variables are read. Only the root group
+    is read, as xarray does by default.
+
+    Args:
+        nc_file: Path to NetCDF4 file
+
+    Returns:
+        Header dictionary in the format of read_netcdf3_header
+
+    Raises:
+        RuntimeError: If h5py is not installed
+    """
+    if h5py is None:
+        raise RuntimeError("h5py required to read NetCDF4 files. Install with: pip install h5py")
+    with h5netcdf.File(nc_file, 'r', decode_vlen_strings=True) as f:
+        variables = {}
+        for name, var in f.variables.items():
+            if h5py.check_dtype(vlen=var.dtype) is str:
+                dtype = np.asarray(var[...], dtype=object).astype(str).dtype
+            else:
+                dtype = np.dtype(var.dtype)
+            variables[name] = {
+                'dimensions': tuple(var.dimensions),
+                'shape': tuple(var.shape),
+                'dtype': dtype,
+                'attributes': dict(var.attrs),
+            }
+        return {
+            'dimensions': {name: dim.size for name, dim in f.dimensions.items()},
+            'attributes': dict(f.attrs),
+            'variables': variables,
+        }
+
+
+def read_netcdf_header(nc_file: Path) -> dict:
+    """
+    Read the header of a NetCDF3 or NetCDF4 file without reading variable data.
+
+    Args:
+        nc_file: Path to NetCDF file
+
+    Returns:
+        Header dictionary (see read_netcdf3_header)
+
+    Raises:
+        ValueError: If the file is neither NetCDF3 nor HDF5
+    """
+    with open(nc_file, 'rb') as f:
+        magic = f.read(8)
+    if magic[:3] == NETCDF3_MAGIC:
+        return read_netcdf3_header(nc_file)
+    if magic == HDF5_MAGIC:
+        return read_netcdf4_header(nc_file)
+    raise ValueError(f"Unrecognized NetCDF format: {nc_file}")
+
+
+def _float_dtype(dtype: np.dtype, attrs: dict) -> np.dtype:
+    """Float dtype xarray decodes masked or packed values to."""
+    scale_factor = attrs.get('scale_factor')
+    add_offset = attrs.get('add_offset')
+    if scale_factor is not None or add_offset is not None:
+        scale_type = np.dtype(type(scale_factor)) if scale_factor is not None else None
+        offset_type = np.dtype(type(add_offset)) if add_offset is not None else None
+        if (scale_type is not None and offset_type == scale_type
+                and scale_type in (np.float32, np.float64)):
+            if dtype.itemsize == 4 and dtype.kind in 'iu':
+                return np.dtype(np.float64)
+            return scale_type
+        if add_offset is not None:
+            return np.dtype(np.float64)
+        return scale_type
+    if dtype.kind == 'f' and dtype.itemsize <= 4:
+        return np.dtype(np.float32)
+    if dtype.kind in 'iu' and dtype.itemsize <= 2:
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def _decode_text(value):
+    """Decode byte attribute values to str, as xarray does."""
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    return value
+
+
+def decode_variable(dims: tuple, shape: tuple, dtype: np.dtype, attrs: dict) -> tuple:
+    """
+    Apply xarray's default CF decoding to a variable's header metadata.
+
+    Mirrors what xr.open_dataset reports without decoding any data:
+    character arrays lose their string-length dimension, _FillValue,
+    missing_value, scale_factor, add_offset and _Unsigned are consumed
+    (promoting integers to float where values are masked or packed),
+    and time units move into the encoding.
+
+    Args:
+        dims: Dimension names
+        shape: Dimension lengths
+        dtype: On-disk dtype
+        attrs: Attributes with text already decoded to str
+
+    Returns:
+        Tuple of (dims, shape, dtype, attrs) as xarray reports them
+    """
+    attrs = dict(attrs)
+
+    # Character arrays: the last dimension holds the characters of each string
+    if dtype == np.dtype('S1') and dims:
+        dtype = np.dtype(f'S{shape[-1]}')
+        dims, shape = dims[:-1], shape[:-1]
+    if dtype.kind == 'S' and '_Encoding' in attrs:
+        attrs.pop('_Encoding')
+        dtype = np.dtype(object)
+
+    # Masking and packing
+    fill_values = [attrs.pop(key) for key in ('_FillValue', 'missing_value') if key in attrs]
+    unsigned = attrs.pop('_Unsigned', None)
+    if unsigned == 'true' and dtype.kind == 'i':
+        dtype = np.dtype(f'u{dtype.itemsize}')
+    elif unsigned == 'false' and dtype.kind == 'u':
+        dtype = np.dtype(f'i{dtype.itemsize}')
+    masked = any(not _is_nan(value) for value in fill_values) and dtype.kind in 'iuf'
+    packed = 'scale_factor' in attrs or 'add_offset' in attrs
+    units = attrs.get('units')
+    is_time = isinstance(units, str) and 'since' in units
+    if packed or (masked and not is_time):
+        dtype = _float_dtype(dtype, attrs)
+    attrs.pop('scale_factor', None)
+    attrs.pop('add_offset', None)
+
+    # Times and time deltas
+    if is_time:
+        attrs.pop('units')
+        calendar = attrs.pop('calendar', 'standard')
+        # Non-standard calendars decode to cftime objects
+        dtype = np.dtype('datetime64[ns]' if str(calendar).lower() in STANDARD_CALENDARS else object)
+    elif str(attrs.get('dtype', '')).startswith('timedelta64') and units in TIME_UNITS:
+        attrs.pop('units')
+        dtype = np.dtype(attrs.pop('dtype'))
+    elif attrs.get('dtype') == 'bool':
+        attrs.pop('dtype')
+        dtype = np.dtype(bool)
+
+    return dims, shape, dtype, attrs
+
+
+def _is_nan(value) -> bool:
+    """Whether a fill value is NaN (NaN fill values do not change the dtype)."""
+    values = np.atleast_1d(np.asarray(value))
+    return values.dtype.kind == 'f' and bool(np.isnan(values).all())
+
+
+def metadata_from_header(header: dict, include_coordinates: bool = False) -> list[dict]:
+    """
+    Build per-variable metadata records from a parsed header.
+
+    Coordinates (variables named after their only dimension, or listed in a
+    'coordinates' attribute) are left out, like xarray's data_vars, unless
+    include_coordinates is set.
 
-def extract_metadata(nc_file: Path) -> list[dict]:
+    Args:
+        header: Header dictionary from read_netcdf_header
+        include_coordinates: Also return coordinate variables, with a
+            'coordinate' flag on every record
+
+    Returns:
+        List of dictionaries containing variable metadata
+    """
+    variables = header['variables']
+    coord_names = set()
+    global_coords = _decode_text(header['attributes'].get('coordinates'))
+    if isinstance(global_coords, str):
+        coord_names.update(global_coords.split())
+
+    decoded = {}
+    for name, var in variables.items():
+        attrs = {key: _decode_text(value) for key, value in var['attributes'].items()}
+        coordinates = attrs.get('coordinates')
+        if isinstance(coordinates, str) and all(c in variables for c in coordinates.split()):
+            coord_names.update(coordinates.split())
+            attrs.pop('coordinates')
+        if var['dimensions'] == (name,):
+            coord_names.add(name)
+        decoded[name] = decode_variable(var['dimensions'], var['shape'], var['dtype'], attrs)
+
+    metadata = []
+    for name, (dims, shape, dtype, attrs) in decoded.items():
+        if name in coord_names and not include_coordinates:
+            continue
+        var_meta = {
+            'variable_name': name,
+            'dimensions': ', '.join(dims),
+            'shape': str(shape),
+            'dtype': str(dtype),
+            'ndim': len(shape),
+            'size': math.prod(shape),
+        }
+        if include_coordinates:
+            var_meta['coordinate'] = name in coord_names
+        for attr_name, attr_value in attrs.items():
+            var_meta[attr_name] = str(attr_value)
+        metadata.append(var_meta)
+    return metadata
+
+
+def extract_metadata(nc_file: Path, engine: str = 'header') -> list[dict]:
     """
     Extract metadata for all variables in a NetCDF file.
 
     Args:
         nc_file: Path to NetCDF file
+        engine: 'header' (default) reads only the file header; 'xarray'
+            opens the file with xr.open_dataset (scipy for NetCDF3,
+            h5netcdf for NetCDF4). Both give the same records.
 
     Returns:
         List of dictionaries containing variable metadata
+
+    Raises:
+        ValueError: If the engine is unknown
+
+    Examples:
+        >>> metadata = extract_metadata(Path("Blodget_grid_20240622.nc"))  # doctest: +SKIP
+        >>> metadata[0]['variable_name'], metadata[0]['dtype']  # doctest: +SKIP
+        ('ALATG', 'float32')
     """
-    ds = xr.open_dataset(nc_file, engine='scipy')
+    if engine == 'header':
+        return metadata_from_header(read_netcdf_header(nc_file))
+    if engine != 'xarray':
+        raise ValueError(f"Unknown engine: {engine}")
+
+    with open(nc_file, 'rb') as f:
+        backend = 'h5netcdf' if f.read(8) == HDF5_MAGIC else 'scipy'
+    ds = xr.open_dataset(nc_file, engine=backend)
 
     metadata = []
 
@@ -100,14 +505,189 @@ def process_netcdf_file(nc_file: Path):
     write_metadata_csv(metadata, csv_file)
 
 
+def catalog_records(nc_file: Path) -> list[dict]:
+    """
+    Build the catalog rows of one NetCDF file, coordinates included.
+
+    Args:
+        nc_file: Path to NetCDF file
+
+    Returns:
+        List of dictionaries with the CATALOG_COLUMNS keys; attrs holds all
+        attributes as a JSON object of strings
+    """
+    records = []
+    for meta in metadata_from_header(read_netcdf_header(nc_file), include_coordinates=True):
+        attrs = {key: value for key, value in meta.items() if key not in
+                 ('variable_name', 'dimensions', 'shape', 'dtype', 'ndim', 'size', 'coordinate')}
+        records.append({
+            'file': Path(nc_file).as_posix(),
+            'variable': meta['variable_name'],
+            'dimensions': meta['dimensions'],
+            'shape': meta['shape'],
+            'dtype': meta['dtype'],
+            'ndim': meta['ndim'],
+            'size': meta['size'],
+            'long_name': attrs.get('long_name'),
+            'units': attrs.get('units'),
+            'coordinate': meta['coordinate'],
+            'attrs': json.dumps(attrs, ensure_ascii=False),
+        })
+    return records
+
+
+def _catalog_worker(nc_file: str) -> tuple[str, list[dict] | None, str | None]:
+    """Process pool worker: catalog rows of one file, or the error message."""
+    try:
+        return nc_file, catalog_records(Path(nc_file)), None
+    except Exception as e:
+        return nc_file, None, str(e)
+
+
+def _file_signature(path: Path) -> list[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def find_netcdf_files(paths: list[Path]) -> list[Path]:
+    """Expand directories to the *.nc files below them, keeping files as given."""
+    nc_files = []
+    for path in paths:
+        if path.is_dir():
+            nc_files.extend(sorted(path.rglob("*.nc")))
+        else:
+            nc_files.append(path)
+    return nc_files
+
+
+def read_catalog(catalog_path: Path) -> pd.DataFrame:
+    """
+    Read a catalog written by build_catalog.
+
+    Args:
+        catalog_path: Catalog path (.parquet, otherwise TSV)
+
+    Returns:
+        DataFrame with the CATALOG_COLUMNS
+    """
+    catalog_path = Path(catalog_path)
+    if catalog_path.suffix == '.parquet':
+        return pd.read_parquet(catalog_path)
+    # Only the optional attribute columns can be missing; scalar variables
+    # have empty dimensions
+    return pd.read_csv(catalog_path, sep='\t', keep_default_na=False,
+                       na_values={'long_name': [''], 'units': ['']},
+                       dtype={'dimensions': str, 'shape': str, 'attrs': str})
+
+
+def build_catalog(
+    paths: list[Path],
+    catalog_path: Path,
+    max_workers: int | None = None,
+    force: bool = False,
+) -> pd.DataFrame:
+    """
+    Extract the metadata of many NetCDF files into one catalog.
+
+    Files are read by a process pool. A manifest next to the catalog
+    (<catalog>.manifest.json) records the size and mtime of every file, and
+    files that have not changed since the last run keep their rows from the
+    existing catalog instead of being read again. Files that cannot be read
+    are reported and left out.
+
+    Args:
+        paths: NetCDF files and/or directories to search for *.nc files
+        catalog_path: Output catalog; .parquet is written as Parquet
+            (requires pyarrow), anything else as TSV
+        max_workers: Number of worker processes (default: CPU count)
+        force: Read every file even if unchanged
+
+    Returns:
+        The catalog DataFrame, one row per variable (see CATALOG_COLUMNS)
+
+    Examples:
+        >>> catalog = build_catalog([Path("ecosim-inputs-netcdf")], Path("netcdf_catalog.tsv"))  # doctest: +SKIP
+        >>> catalog[['file', 'variable', 'units']].head(1)  # doctest: +SKIP
+    """
+    catalog_path = Path(catalog_path)
+    manifest_path = catalog_path.with_name(catalog_path.name + '.manifest.json')
+    nc_files = [f.as_posix() for f in find_netcdf_files([Path(p) for p in paths])]
+
+    manifest, previous = {}, None
+    if not force and manifest_path.exists() and catalog_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        previous = read_catalog(catalog_path)
+
+    signatures, todo, frames = {}, [], {}
+    for nc_file in nc_files:
+        if not Path(nc_file).exists():
+            print(f"⨯ File not found: {nc_file}")
+            continue
+        signatures[nc_file] = _file_signature(Path(nc_file))
+        if previous is not None and manifest.get(nc_file) == signatures[nc_file]:
+            frames[nc_file] = previous[previous['file'] == nc_file]
+        else:
+            todo.append(nc_file)
+    print(f"Cataloging {len(signatures)} NetCDF file(s): {len(todo)} to read, "
+          f"{len(signatures) - len(todo)} unchanged")
+
+    if todo:
+        workers = min(max_workers or os.cpu_count() or 1, len(todo))
+        if workers > 1:
+            # spawn: forking a process that may hold threads is unsafe
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                chunksize = max(1, len(todo) // (workers * 4))
+                results = list(executor.map(_catalog_worker, todo, chunksize=chunksize))
+        else:
+            results = [_catalog_worker(nc_file) for nc_file in todo]
+
+        for nc_file, records, error in results:
+            if error is not None:
+                print(f"⨯ Failed to read {nc_file}: {error}")
+                signatures.pop(nc_file)
+                continue
+            frames[nc_file] = pd.DataFrame(records, columns=CATALOG_COLUMNS)
+
+    ordered = [frames[f] for f in signatures if f in frames]
+    catalog = pd.concat(ordered, ignore_index=True) if ordered else pd.DataFrame(columns=CATALOG_COLUMNS)
+    catalog['coordinate'] = catalog['coordinate'].astype(bool)
+
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    if catalog_path.suffix == '.parquet':
+        catalog.to_parquet(catalog_path, index=False)
+    else:
+        catalog.to_csv(catalog_path, sep='\t', index=False)
+    manifest_path.write_text(json.dumps(signatures, indent=1))
+    print(f"✓ Wrote {len(catalog)} variables from {len(ordered)} file(s) to: {catalog_path}")
+    return catalog
+
+
 def main():
     """Main entry point."""
-    if len(sys.argv) > 1:
+    parser = argparse.ArgumentParser(description="Extract variable metadata from NetCDF files")
+    parser.add_argument("paths", nargs="*", type=Path,
+                        help="NetCDF files (directories too with --catalog; "
+                             "default: the ecosim-inputs-netcdf directory)")
+    parser.add_argument("--catalog", type=Path, metavar="PATH",
+                        help="Write one consolidated catalog (.tsv or .parquet) instead of "
+                             "a .metadata.csv per file")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="With --catalog, number of worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true",
+                        help="With --catalog, read every file even if unchanged")
+    args = parser.parse_args()
+
+    nc_dir = Path("hackathon-case_study-experimental_warming_nitrogen/ecosim-inputs-netcdf")
+    if args.catalog:
+        build_catalog(args.paths or [nc_dir], args.catalog, max_workers=args.workers, force=args.force)
+        return
+
+    if args.paths:
         # Process files specified on command line
-        nc_files = [Path(arg) for arg in sys.argv[1:]]
+        nc_files = args.paths
     else:
         # Process all .nc files in the ecosim-inputs-netcdf directory
-        nc_dir = Path("hackathon-case_study-experimental_warming_nitrogen/ecosim-inputs-netcdf")
         nc_files = list(nc_dir.glob("*.nc"))
 
     if not nc_files:
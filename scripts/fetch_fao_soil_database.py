@@ -13,20 +13,38 @@ The HWSD includes:
 Downloads from: https://www.fao.org/soils-portal/data-hub/soil-maps-and-databases/harmonized-world-soil-database-v20/en/
 """
 
+import fnmatch
 import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import queue
+import shutil
 import sqlite3
 import subprocess
 import tempfile
+import threading
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
-from urllib.request import urlopen, urlretrieve
+from typing import IO, Callable, Iterator, Optional
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
 from urllib.parse import urlparse
 
 import pandas as pd
 import rasterio
 import numpy as np
+from rasterio.windows import Window
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -37,6 +55,19 @@ HWSD_DATABASE_URL = "https://s3.eu-west-1.amazonaws.com/data.gaezdev.aws.fao.org
 HWSD_RASTER_URL = "https://s3.eu-west-1.amazonaws.com/data.gaezdev.aws.fao.org/HWSD/HWSD2_RASTER.zip"
 HWSD_TECHNICAL_DOC_URL = "https://www.fao.org/3/cc3823en/cc3823en.pdf"
 
+# Download component names, URLs and the file names they are saved as
+HWSD_COMPONENTS = {
+    "database": (HWSD_DATABASE_URL, "HWSD2_DB.zip"),
+    "raster": (HWSD_RASTER_URL, "HWSD2_RASTER.zip"),
+    "documentation": (HWSD_TECHNICAL_DOC_URL, "hwsd_technical_report.pdf"),
+}
+
+# Bytes read from the connection and written per chunk while downloading
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Sidecar manifest in data_dir recording each downloaded file's SHA256, size and mtime
+DOWNLOAD_MANIFEST = "download_manifest.json"
+
 # Expected file checksums (SHA256) - these should be verified from FAO sources
 # Note: These would need to be updated with actual checksums from FAO
 EXPECTED_CHECKSUMS = {
@@ -45,6 +76,306 @@ EXPECTED_CHECKSUMS = {
     "cc3823en.pdf": None  # Placeholder - would need actual checksum
 }
 
+# Columns that identify the mapping unit in HWSD tables, in order of preference
+MAPPING_UNIT_COLUMNS = ['MU_GLOBAL', 'MAPPING_UNIT', 'MU_CODE', 'SMU_ID', 'CODE', 'ID']
+
+# Table written by convert_mdb_to_sqlite with the row count of every imported table
+ROW_COUNT_TABLE = "_row_counts"
+
+# Bulk-load settings for new SQLite databases: large pages, WAL journal and no
+# fsync while loading (synchronous is raised to NORMAL once the load is done)
+SQLITE_LOAD_PRAGMAS = [
+    "PRAGMA page_size = 65536",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -262144",
+    "PRAGMA temp_store = MEMORY",
+]
+
+# Join plans are cached next to the database as <db name>.join_plan.json
+JOIN_PLAN_SUFFIX = ".join_plan.json"
+JOIN_PLAN_VERSION = 3
+
+# SQLite column types from narrowest to widest; a column only ever widens
+SQLITE_TYPE_ORDER = ['INTEGER', 'REAL', 'TEXT']
+
+# Columns of every raster pixel table, before any joined soil properties
+PIXEL_COLUMNS = {'longitude': 'float64', 'latitude': 'float64', 'soil_mapping_unit': 'int64'}
+
+
+def pixels_to_frame(data: np.ndarray, rows: np.ndarray, cols: np.ndarray,
+                    transform, nodata: Optional[float]) -> pd.DataFrame:
+    """
+    Convert a block of raster pixels to a table of coordinates and mapping units.
+    
+    The pixel grid is built with NumPy, NODATA is dropped with a boolean mask
+    and all remaining pixel centers are converted to coordinates with a
+    single affine transform call.
+    
+    Args:
+        data: 2-D array of mapping unit codes, shape (len(rows), len(cols))
+        rows: Raster row index of each row of data
+        cols: Raster column index of each column of data
+        transform: Affine transform of the full raster
+        nodata: NoData value to drop (None keeps every pixel)
+        
+    Returns:
+        DataFrame with longitude, latitude and soil_mapping_unit columns,
+        in row-major pixel order
+        
+    Examples:
+        >>> from rasterio.transform import from_origin
+        >>> data = np.array([[1, 65535], [3, 4]])
+        >>> df = pixels_to_frame(data, np.arange(2), np.arange(2), from_origin(0, 2, 1, 1), 65535)
+        >>> df['soil_mapping_unit'].tolist()
+        [1, 3, 4]
+        >>> df['longitude'].tolist()
+        [0.5, 0.5, 1.5]
+    """
+    data = np.asarray(data)
+    row_grid, col_grid = np.meshgrid(rows, cols, indexing='ij')
+    
+    if nodata is not None:
+        valid = data != nodata
+        values, row_grid, col_grid = data[valid], row_grid[valid], col_grid[valid]
+    else:
+        values, row_grid, col_grid = data.ravel(), row_grid.ravel(), col_grid.ravel()
+    
+    x_coords, y_coords = rasterio.transform.xy(transform, row_grid, col_grid)
+    
+    return pd.DataFrame({
+        'longitude': np.asarray(x_coords, dtype=np.float64),
+        'latitude': np.asarray(y_coords, dtype=np.float64),
+        'soil_mapping_unit': values.astype(np.int64)
+    })
+
+
+def _column_alias(table_name: str, column: str) -> str:
+    """
+    Build the output name of a joined column: table prefix plus a unit hint.
+    
+    Examples:
+        >>> _column_alias("D_TEXTURE", "SAND")
+        'd_texture_sand_percent'
+        >>> _column_alias("HWSD2_LAYERS", "PH_WATER")
+        'hwsd2_layers_ph_water_ph_units'
+    """
+    col_name = f"{table_name.lower()}_{column.lower()}"
+    col = column.lower()
+    
+    # Add unit hints based on common HWSD variable patterns
+    if 'ph' in col:
+        return col_name + "_ph_units"
+    elif 'awc' in col or 'water' in col:
+        return col_name + "_percent"
+    elif 'bulk' in col or 'density' in col:
+        return col_name + "_g_cm3"
+    elif any(texture in col for texture in ['sand', 'silt', 'clay']):
+        return col_name + "_percent"
+    elif 'soc' in col or 'carbon' in col:
+        return col_name + "_percent"
+    elif 'cec' in col:
+        return col_name + "_cmol_kg"
+    elif 'drainage' in col:
+        return col_name + "_class"
+    elif 'coverage' in col:
+        return col_name + "_percent"
+    elif 'depth' in col:
+        return col_name + "_cm"
+    elif 'value' in col:
+        return col_name + "_value"
+    return col_name + "_units_unknown"
+
+
+def read_row_block(src, row_start: int, row_stop: int, step: int = 1) -> pd.DataFrame:
+    """
+    Read rows [row_start, row_stop) of an open raster as a pixel table.
+    
+    Only that window of the band is read. row_start should be a multiple of
+    step so blocks line up with the strided grid of the whole raster.
+    
+    Args:
+        src: Open rasterio dataset
+        row_start: First raster row of the block
+        row_stop: Raster row after the last row of the block
+        step: Sampling step in rows and columns
+        
+    Returns:
+        DataFrame as returned by pixels_to_frame
+    """
+    data = src.read(1, window=Window(0, row_start, src.width, row_stop - row_start))
+    rows = np.arange(row_start, row_stop, step)
+    cols = np.arange(0, src.width, step)
+    return pixels_to_frame(data[::step, ::step], rows, cols, src.transform, src.nodata)
+
+
+def _process_strip(data_dir: str, bil_path: Path, row_start: int, row_stop: int, step: int,
+                   sqlite_db_path: Optional[Path], part_path: Path,
+                   columns: dict[str, str]) -> tuple[Path, int]:
+    """
+    Process pool worker: convert one row strip and write it as a part file.
+    
+    Each worker opens its own rasterio handle and database connection. Parts
+    are written with the output columns (see HWSDFetcher.output_columns), so
+    every part has the same schema.
+    
+    Returns:
+        Tuple of (part file path, number of rows written)
+    """
+    with rasterio.open(bil_path) as src:
+        df = read_row_block(src, row_start, row_stop, step)
+    
+    if sqlite_db_path is not None and sqlite_db_path.exists():
+        df = HWSDFetcher(data_dir)._join_soil_properties(df, sqlite_db_path)
+    
+    _check_columns(df, columns)
+    if part_path.suffix == '.parquet':
+        table = pa.Table.from_pandas(df, schema=_arrow_schema(columns), preserve_index=False)
+        pq.write_table(table, part_path, compression='zstd')
+    else:
+        df.to_csv(part_path, index=False)
+    return part_path, len(df)
+
+
+def _sqlite_column_types(chunk: pd.DataFrame, known: Optional[dict] = None) -> dict[str, Optional[str]]:
+    """
+    Infer SQLite column types from a DataFrame.
+    
+    Integer and boolean columns become INTEGER, floats REAL and everything
+    else TEXT. Float columns whose values are all whole numbers (integer
+    codes with missing values, which pandas reads as float) become INTEGER,
+    so mapping unit keys are stored and compared as integers. Columns with
+    no values have no type (None).
+    
+    Types only widen (see SQLITE_TYPE_ORDER): with the types inferred from
+    earlier chunks of the same table as known, each column gets the wider
+    of its known type and this chunk's type.
+    
+    Examples:
+        >>> _sqlite_column_types(pd.DataFrame({'MU': [1.0, None], 'AWC': [0.5, 1.0], 'N': ['a', 'b']}))
+        {'MU': 'INTEGER', 'AWC': 'REAL', 'N': 'TEXT'}
+        >>> _sqlite_column_types(pd.DataFrame({'MU': [None], 'AWC': [1.0]}), {'MU': 'INTEGER', 'AWC': 'REAL'})
+        {'MU': 'INTEGER', 'AWC': 'REAL'}
+    """
+    types = {}
+    for col in chunk.columns:
+        values = chunk[col]
+        present = values.dropna()
+        if present.empty:
+            sql_type = None
+        elif pd.api.types.is_bool_dtype(values) or pd.api.types.is_integer_dtype(values):
+            sql_type = 'INTEGER'
+        elif pd.api.types.is_float_dtype(values):
+            sql_type = 'INTEGER' if bool((present == np.floor(present)).all()) else 'REAL'
+        else:
+            sql_type = 'TEXT'
+        types[col] = _wider_sqlite_type((known or {}).get(col), sql_type)
+    return types
+
+
+def _wider_sqlite_type(first: Optional[str], second: Optional[str]) -> Optional[str]:
+    """The wider of two SQLite column types in SQLITE_TYPE_ORDER (None for no type)."""
+    if first is None or second is None:
+        return first or second
+    return max(first, second, key=SQLITE_TYPE_ORDER.index)
+
+
+def _sqlite_type_dtype(sqlite_type: str) -> str:
+    """
+    pandas dtype of a joined column from its declared SQLite type.
+    
+    Follows SQLite's type affinity rules: INT types become nullable
+    integers, REAL, FLOA and DOUB types floats, and everything else (TEXT,
+    NUMERIC or no type) text, so a column has the same type whichever
+    mapping units a block contains.
+    
+    Examples:
+        >>> [_sqlite_type_dtype(t) for t in ['INTEGER', 'REAL', 'TEXT', '']]
+        ['Int64', 'float64', 'object', 'object']
+    """
+    sqlite_type = sqlite_type.upper()
+    if 'INT' in sqlite_type:
+        return 'Int64'
+    if any(name in sqlite_type for name in ('REAL', 'FLOA', 'DOUB')):
+        return 'float64'
+    return 'object'
+
+
+def _plan_dtypes(plan: dict) -> dict[str, str]:
+    """Output name and pandas dtype of every column a join plan adds, in join order."""
+    return {
+        alias: _sqlite_type_dtype(entry['dtypes'].get(col, ''))
+        for entry in plan['tables']
+        for col, alias in entry['columns'].items()
+    }
+
+
+def _arrow_schema(columns: dict[str, str]) -> 'pa.Schema':
+    """Parquet schema for output columns given as {name: pandas dtype}."""
+    types = {'Int64': pa.int64(), 'int64': pa.int64(), 'float64': pa.float64(), 'object': pa.string()}
+    return pa.schema([(name, types[dtype]) for name, dtype in columns.items()])
+
+
+def _check_columns(df: pd.DataFrame, columns: dict[str, str]) -> None:
+    """Raise ValueError if a block's columns are not the planned output columns."""
+    if list(df.columns) != list(columns):
+        missing = [col for col in columns if col not in df.columns]
+        extra = [col for col in df.columns if col not in columns]
+        raise ValueError(f"Block columns do not match the output schema "
+                         f"(missing: {missing}, unexpected: {extra})")
+
+
+def _cast_column(values: pd.Series, dtype: str) -> pd.Series:
+    """
+    Convert a joined column to its planned pandas dtype (see _sqlite_type_dtype).
+    
+    Values that are not numbers become null in numeric columns, and an
+    integer column holding fractions is kept as float64; both are logged.
+    """
+    if dtype == 'object':
+        return values.map(str, na_action='ignore').astype(object)
+    numeric = pd.to_numeric(values, errors='coerce')
+    n_invalid = int((numeric.isna() & values.notna()).sum())
+    if n_invalid:
+        logger.warning(f"  {n_invalid} non-numeric values in {values.name} set to null")
+    if dtype == 'Int64':
+        try:
+            return numeric.astype('Int64')
+        except TypeError:
+            logger.warning(f"  {values.name} holds fractions, keeping it as float64")
+            return numeric.astype('float64')
+    return numeric.astype(dtype)
+
+
+def _matches_zip_info(path: Path, info: zipfile.ZipInfo) -> bool:
+    """Check whether a file on disk has the size and CRC-32 of an archive member."""
+    try:
+        if path.stat().st_size != info.file_size:
+            return False
+    except FileNotFoundError:
+        return False
+    crc = 0
+    with open(path, 'rb') as f:
+        while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc == info.CRC
+
+
+class _ProgressLogger:
+    """Default download progress callback: log every 10% (or 100 MB if the size is unknown)."""
+    
+    def __init__(self):
+        self._next = 0.1
+    
+    def __call__(self, filename: str, done: int, total: Optional[int]) -> None:
+        if total:
+            if done / total >= self._next:
+                logger.info(f"  {filename}: {done / total:.0%} of {total / (1024 * 1024):.1f} MB")
+                self._next = int(done / total * 10) / 10 + 0.1
+        elif done >= self._next * 1e9:
+            logger.info(f"  {filename}: {done / (1024 * 1024):.0f} MB")
+            self._next = (done // 100_000_000 + 1) / 10
+
 
 class HWSDFetcher:
     """
@@ -69,57 +400,233 @@ class HWSDFetcher:
         >>> soil_data = fetcher.get_soil_properties(['organic_carbon', 'bulk_density'])
     """
     
-    def __init__(self, data_dir: str = "./hwsd_data"):
+    def __init__(self, data_dir: str = "./hwsd_data", urls: Optional[dict[str, str]] = None,
+                 chunk_size: int = DOWNLOAD_CHUNK_SIZE, timeout: float = 60.0):
         """
         Initialize the HWSD fetcher.
         
         Args:
             data_dir: Directory to store downloaded HWSD data
+            urls: Optional overrides of the download URLs by component name
+                ("database", "raster", "documentation"), e.g. a mirror or a
+                local test server
+            chunk_size: Bytes streamed per read while downloading
+            timeout: Socket timeout in seconds for download connections
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True, parents=True)
+        self.urls = {name: url for name, (url, _) in HWSD_COMPONENTS.items()}
+        self.urls.update(urls or {})
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self._manifest_lock = threading.Lock()
+        self._join_plans: dict[str, dict] = {}
         logger.info(f"HWSD data directory: {self.data_dir.absolute()}")
     
-    def download_file(self, url: str, filename: Optional[str] = None) -> Path:
+    def download_file(self, url: str, filename: Optional[str] = None,
+                      progress: Optional[Callable[[str, int, Optional[int]], None]] = None,
+                      expected_checksum: Optional[str] = None) -> Path:
         """
-        Download a file with progress tracking and verification.
+        Download a file with progress tracking, resume support and verification.
+        
+        The response is streamed in chunks to <filename>.part, which is renamed
+        to the final name once complete. If a .part file is left by an
+        interrupted download, only the remaining bytes are requested with an
+        HTTP Range header; servers that ignore the range restart the file.
+        
+        The SHA256 is computed from the bytes as they stream in and recorded,
+        with the file's size and mtime, in the data directory's manifest
+        (download_manifest.json), so verification needs no second read.
         
         Args:
             url: URL to download from
             filename: Optional filename to save as (default: extract from URL)
+            progress: Optional callback called after every chunk with
+                (filename, bytes downloaded, total bytes or None if unknown);
+                by default progress is logged every 10%
+            expected_checksum: Optional SHA256 the file must match (default:
+                the EXPECTED_CHECKSUMS entry for filename); an existing file
+                that does not match is downloaded again
             
         Returns:
             Path to downloaded file
+            
+        Raises:
+            RuntimeError: If the download fails or the checksum does not match;
+                after a failed transfer the .part file is kept so the next
+                call resumes
         """
         if filename is None:
             filename = Path(urlparse(url).path).name
+        if expected_checksum is None:
+            expected_checksum = EXPECTED_CHECKSUMS.get(filename)
         
         file_path = self.data_dir / filename
         
-        # Skip if file already exists
+        # Skip if file already exists (and still matches its checksum)
         if file_path.exists():
-            logger.info(f"File already exists: {file_path}")
-            return file_path
-        
-        logger.info(f"Downloading {url} to {file_path}")
+            if expected_checksum is None or self.verify_checksum(file_path, expected_checksum):
+                logger.info(f"File already exists: {file_path}")
+                return file_path
+            logger.warning(f"Existing {filename} does not match its checksum, downloading again")
+            file_path.unlink()
+        
+        part_path = file_path.with_name(file_path.name + ".part")
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        if progress is None:
+            progress = _ProgressLogger()
+        
+        if offset:
+            logger.info(f"Resuming {url} at {offset / (1024 * 1024):.1f} MB")
+        else:
+            logger.info(f"Downloading {url} to {file_path}")
         
         try:
-            # Download with progress indication
-            urlretrieve(url, file_path)
+            digest = self._stream_to_part(url, filename, part_path, offset, progress)
+            part_path.replace(file_path)
+            self._record_checksum(file_path, digest)
             file_size = file_path.stat().st_size / (1024 * 1024)  # MB
             logger.info(f"✓ Download complete: {filename} ({file_size:.1f} MB)")
             
         except Exception as e:
-            if file_path.exists():
-                file_path.unlink()  # Clean up partial download
             raise RuntimeError(f"Failed to download {url}: {e}")
         
+        if expected_checksum is not None and digest.lower() != expected_checksum.lower():
+            file_path.unlink()
+            raise RuntimeError(f"Checksum mismatch for {filename}: got {digest}, expected {expected_checksum}")
+        
         return file_path
     
+    def _stream_to_part(self, url: str, filename: str, part_path: Path, offset: int,
+                        progress: Callable[[str, int, Optional[int]], None]) -> str:
+        """
+        Stream url into part_path, appending from offset when the server supports ranges.
+        
+        Returns:
+            SHA256 hex digest of the complete file, hashed as it was written
+        """
+        request = Request(url, headers={'Range': f'bytes={offset}-'} if offset else {})
+        try:
+            response = urlopen(request, timeout=self.timeout)
+        except HTTPError as e:
+            if e.code != 416 or not offset:
+                raise
+            # Range not satisfiable: the part is either complete (the rename
+            # after the last write was interrupted) or stale
+            if self._resource_length(url, e.headers) == offset:
+                logger.info(f"{filename} was already fully downloaded")
+                with open(part_path, 'rb') as f:
+                    digest = hashlib.file_digest(f, 'sha256').hexdigest()
+                progress(filename, offset, offset)
+                return digest
+            logger.info(f"Discarding stale partial download of {filename}")
+            part_path.unlink()
+            offset = 0
+            response = urlopen(Request(url), timeout=self.timeout)
+        
+        with response:
+            if offset and getattr(response, 'status', 200) != 206:
+                logger.info(f"Server ignored the range request, restarting {filename}")
+                offset = 0
+            
+            length = response.headers.get('Content-Length')
+            total = offset + int(length) if length is not None else None
+            done = offset
+            
+            # Resumed downloads hash the bytes already on disk first
+            sha256_hash = hashlib.sha256()
+            if offset:
+                with open(part_path, 'rb') as f:
+                    sha256_hash = hashlib.file_digest(f, 'sha256')
+            
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                while True:
+                    chunk = response.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    sha256_hash.update(chunk)
+                    done += len(chunk)
+                    progress(filename, done, total)
+        
+        if total is not None and done != total:
+            raise IOError(f"Connection closed after {done} of {total} bytes")
+        return sha256_hash.hexdigest()
+    
+    def _resource_length(self, url: str, headers) -> Optional[int]:
+        """
+        Size of the resource at url, or None if it cannot be determined.
+        
+        Taken from the 'Content-Range: bytes */N' header of a 416 response
+        when present, otherwise from the Content-Length of a HEAD request.
+        """
+        content_range = headers.get('Content-Range', '') if headers is not None else ''
+        length = content_range.rpartition('/')[2]
+        if length.isdigit():
+            return int(length)
+        try:
+            with urlopen(Request(url, method='HEAD'), timeout=self.timeout) as response:
+                length = response.headers.get('Content-Length')
+        except (HTTPError, OSError):
+            return None
+        return int(length) if length is not None and length.isdigit() else None
+    
+    def _load_manifest(self) -> dict:
+        """Read the download manifest, or an empty one if missing or unreadable."""
+        try:
+            with open(self.data_dir / DOWNLOAD_MANIFEST) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _record_checksum(self, file_path: Path, digest: str) -> None:
+        """Store a file's SHA256 with its current size and mtime in the manifest."""
+        stat = file_path.stat()
+        with self._manifest_lock:
+            manifest = self._load_manifest()
+            manifest[file_path.name] = {
+                'sha256': digest,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+            }
+            tmp_path = self.data_dir / f"{DOWNLOAD_MANIFEST}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+            tmp_path.replace(self.data_dir / DOWNLOAD_MANIFEST)
+    
+    def file_checksum(self, file_path: Path) -> str:
+        """
+        Get a file's SHA256, reusing the manifest entry if the file is unchanged.
+        
+        The manifest hash is trusted while the file's size and mtime match the
+        recorded ones; otherwise the file is hashed with large buffered reads
+        (hashlib.file_digest) and the manifest is updated.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            SHA256 hex digest
+        """
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        entry = self._load_manifest().get(file_path.name) if file_path.parent == self.data_dir else None
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+        
+        with open(file_path, 'rb') as f:
+            digest = hashlib.file_digest(f, 'sha256').hexdigest()
+        if file_path.parent == self.data_dir:
+            self._record_checksum(file_path, digest)
+        return digest
+    
     def verify_checksum(self, file_path: Path, expected_checksum: Optional[str] = None) -> bool:
         """
         Verify file integrity using SHA256 checksum.
         
+        Uses the hash recorded while downloading when the file is unchanged
+        (see file_checksum), so verification does not re-read the file.
+        
         Args:
             file_path: Path to file to verify
             expected_checksum: Expected SHA256 hash (if None, just compute hash)
@@ -127,12 +634,7 @@ class HWSDFetcher:
         Returns:
             True if checksum matches (or if no expected checksum provided)
         """
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        
-        computed_hash = sha256_hash.hexdigest()
+        computed_hash = self.file_checksum(file_path)
         logger.info(f"File {file_path.name} SHA256: {computed_hash}")
         
         if expected_checksum is None:
@@ -153,7 +655,7 @@ class HWSDFetcher:
             Path to downloaded database zip file
         """
         logger.info("Downloading HWSD database...")
-        return self.download_file(HWSD_DATABASE_URL, "HWSD2_DB.zip")
+        return self.download_file(self.urls["database"], HWSD_COMPONENTS["database"][1])
     
     def download_raster(self) -> Path:
         """
@@ -163,7 +665,7 @@ class HWSDFetcher:
             Path to downloaded raster zip file
         """
         logger.info("Downloading HWSD raster data...")
-        return self.download_file(HWSD_RASTER_URL, "HWSD2_RASTER.zip")
+        return self.download_file(self.urls["raster"], HWSD_COMPONENTS["raster"][1])
     
     def download_documentation(self) -> Path:
         """
@@ -173,36 +675,55 @@ class HWSDFetcher:
             Path to downloaded documentation file
         """
         logger.info("Downloading HWSD technical documentation...")
-        return self.download_file(HWSD_TECHNICAL_DOC_URL, "hwsd_technical_report.pdf")
+        return self.download_file(self.urls["documentation"], HWSD_COMPONENTS["documentation"][1])
     
-    def download_all(self) -> dict[str, Path]:
+    def download_all(self, max_workers: int = 3) -> dict[str, Path]:
         """
-        Download all HWSD components.
+        Download all HWSD components concurrently.
         
+        Args:
+            max_workers: Number of simultaneous downloads
+            
         Returns:
             Dictionary mapping component names to file paths
         """
         logger.info("Starting HWSD v2.0 download...")
         
-        components = {
-            "database": self.download_database(),
-            "raster": self.download_raster(),
-            "documentation": self.download_documentation()
+        downloads = {
+            "database": self.download_database,
+            "raster": self.download_raster,
+            "documentation": self.download_documentation,
         }
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {name: executor.submit(download) for name, download in downloads.items()}
+            components = {name: future.result() for name, future in futures.items()}
         
         logger.info("✓ All HWSD components downloaded successfully!")
         return components
     
-    def extract_zip(self, zip_path: Path, extract_to: Optional[Path] = None) -> Path:
+    def extract_zip(self, zip_path: Path, extract_to: Optional[Path] = None,
+                    members: Optional[list[str]] = None) -> Path:
         """
         Extract a ZIP file to the specified directory.
         
+        Only members matching the given patterns are extracted, and members
+        already on disk with the archive's size and CRC-32 are skipped, so
+        re-running after a partial or earlier extraction only writes what is
+        missing or changed.
+        
         Args:
             zip_path: Path to ZIP file to extract
             extract_to: Directory to extract to (default: same name as zip without extension)
+            members: Optional glob patterns (fnmatch) selecting members by their
+                path in the archive or their file name, e.g. ["*.bil", "*.hdr"];
+                None extracts everything
             
         Returns:
             Path to extraction directory
+            
+        Examples:
+            >>> fetcher = HWSDFetcher()
+            >>> # fetcher.extract_zip(Path("HWSD2_RASTER.zip"), members=["HWSD2.bil", "HWSD2.hdr"])
         """
         if extract_to is None:
             extract_to = self.data_dir / zip_path.stem
@@ -211,15 +732,78 @@ class HWSDFetcher:
         
         logger.info(f"Extracting {zip_path.name} to {extract_to}")
         
+        extracted = 0
+        skipped = 0
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
+            for info in self._select_members(zip_ref, members):
+                target = extract_to / info.filename
+                if _matches_zip_info(target, info):
+                    skipped += 1
+                    continue
+                zip_ref.extract(info, extract_to)
+                extracted += 1
         
-        # List extracted files
-        extracted_files = list(extract_to.rglob("*"))
-        logger.info(f"✓ Extracted {len(extracted_files)} files to {extract_to}")
+        logger.info(f"✓ Extracted {extracted} files to {extract_to} ({skipped} already up to date)")
         
         return extract_to
     
+    @staticmethod
+    def _select_members(zip_ref: zipfile.ZipFile, patterns: Optional[list[str]]) -> list[zipfile.ZipInfo]:
+        """List the file members of an archive matching any of the patterns."""
+        infos = [info for info in zip_ref.infolist() if not info.is_dir()]
+        if patterns is None:
+            return infos
+        return [
+            info for info in infos
+            if any(fnmatch.fnmatch(info.filename, pattern) or
+                   fnmatch.fnmatch(Path(info.filename).name, pattern) for pattern in patterns)
+        ]
+    
+    def open_zip_member(self, zip_path: Path, member: str) -> IO[bytes]:
+        """
+        Open a member of a ZIP archive as a stream, without extracting it.
+        
+        The data is decompressed as it is read. Close the returned file (or use
+        it in a with statement) when done.
+        
+        Args:
+            zip_path: Path to ZIP file
+            member: Path of the member in the archive, or a glob pattern
+                (fnmatch, matched against paths and file names) selecting one
+            
+        Returns:
+            Binary file object for the member
+            
+        Raises:
+            FileNotFoundError: If no member matches
+            
+        Examples:
+            >>> fetcher = HWSDFetcher()
+            >>> # with fetcher.open_zip_member(Path("HWSD2_DB.zip"), "*.csv") as f:
+            >>> #     header = f.readline()
+        """
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            matches = self._select_members(zip_ref, [member])
+            if not matches:
+                raise FileNotFoundError(f"No member matching {member} in {zip_path}")
+            # The member keeps the archive file open until it is closed itself
+            return zip_ref.open(matches[0])
+    
+    def read_zip_csv(self, zip_path: Path, member: str, **kwargs) -> pd.DataFrame:
+        """
+        Read a CSV member of a ZIP archive directly into a DataFrame.
+        
+        Args:
+            zip_path: Path to ZIP file
+            member: Member path or glob pattern (see open_zip_member)
+            **kwargs: Passed to pandas.read_csv
+            
+        Returns:
+            DataFrame with the member's contents
+        """
+        with self.open_zip_member(zip_path, member) as f:
+            return pd.read_csv(f, **kwargs)
+    
     def find_mdb_files(self) -> list[Path]:
         """
         Find all Microsoft Access database files in the data directory.
@@ -247,13 +831,64 @@ class HWSDFetcher:
             logger.warning("✗ mdb-tools not found. Install with: sudo apt-get install mdbtools")
             return False
     
-    def convert_mdb_to_sqlite(self, mdb_path: Path, sqlite_path: Optional[Path] = None) -> Path:
+    def _mdb_table_names(self, mdb_path: Path) -> list[str]:
+        """List the tables of an Access database with mdb-tables."""
+        result = subprocess.run(['mdb-tables', '-1', str(mdb_path)], 
+                              capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to list tables: {result.stderr}")
+        
+        table_names = [name.strip() for name in result.stdout.split('\n') if name.strip()]
+        logger.info(f"Found {len(table_names)} tables: {table_names}")
+        return table_names
+    
+    def _read_mdb_table(self, mdb_path: Path, table_name: str, chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Stream one table out of mdb-export as DataFrame chunks.
+        
+        The subprocess output is parsed as it is produced rather than buffered
+        into a single string first.
+        
+        Raises:
+            RuntimeError: If mdb-export fails
+        """
+        with tempfile.TemporaryFile() as stderr:
+            with subprocess.Popen(['mdb-export', str(mdb_path), table_name],
+                                  stdout=subprocess.PIPE, stderr=stderr) as proc:
+                try:
+                    yield from pd.read_csv(proc.stdout, chunksize=chunksize)
+                except pd.errors.EmptyDataError:
+                    pass
+                finally:
+                    proc.stdout.close()
+            if proc.returncode != 0:
+                stderr.seek(0)
+                raise RuntimeError(stderr.read().decode(errors='replace').strip())
+    
+    def convert_mdb_to_sqlite(self, mdb_path: Path, sqlite_path: Optional[Path] = None,
+                              max_workers: int = 4, chunksize: int = 50_000) -> Path:
         """
         Convert Microsoft Access database to SQLite.
         
+        Tables are exported concurrently by a bounded pool of mdb-export
+        processes whose output is parsed in chunks as it streams in. All
+        SQLite writes go through a single writer (the calling thread), which
+        inserts the chunks in batched transactions, so conversion time is set
+        by the largest table rather than the sum of all tables.
+        
+        Column types are inferred from the data (INTEGER, REAL or TEXT, with
+        whole-number float columns stored as INTEGER) and widened as later
+        chunks need (a table is rebuilt when they do), every mapping unit
+        column (see MAPPING_UNIT_COLUMNS) is indexed, and the row count of
+        each table is recorded in the _row_counts table. The database is
+        written from scratch with bulk-load pragmas (64 KiB pages, WAL, no
+        fsync during the load).
+        
         Args:
             mdb_path: Path to .mdb file
             sqlite_path: Path to output SQLite file (default: same name with .db extension)
+            max_workers: Number of tables exported at the same time
+            chunksize: Rows parsed and inserted per chunk
             
         Returns:
             Path to created SQLite database
@@ -267,43 +902,122 @@ class HWSDFetcher:
         logger.info(f"Converting {mdb_path.name} to SQLite: {sqlite_path.name}")
         
         # Get list of tables in the Access database
-        result = subprocess.run(['mdb-tables', '-1', str(mdb_path)], 
-                              capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError(f"Failed to list tables: {result.stderr}")
+        table_names = self._mdb_table_names(mdb_path)
         
-        table_names = [name.strip() for name in result.stdout.split('\n') if name.strip()]
-        logger.info(f"Found {len(table_names)} tables: {table_names}")
+        # Exporters hand (table, chunk) pairs to the writer; None ends a table
+        chunks: queue.Queue = queue.Queue(maxsize=max_workers * 4)
         
-        # Create SQLite database and import tables
-        conn = sqlite3.connect(sqlite_path)
+        def export(table_name: str) -> None:
+            try:
+                for chunk in self._read_mdb_table(mdb_path, table_name, chunksize):
+                    chunks.put((table_name, chunk))
+                chunks.put((table_name, None))
+            except Exception as e:
+                chunks.put((table_name, e))
         
-        for table_name in table_names:
-            logger.info(f"Converting table: {table_name}")
-            
-            # Export table to CSV using mdb-export
-            csv_result = subprocess.run(['mdb-export', str(mdb_path), table_name],
-                                      capture_output=True, text=True)
-            if csv_result.returncode != 0:
-                logger.warning(f"Failed to export table {table_name}: {csv_result.stderr}")
-                continue
+        # Create SQLite database and import tables
+        for path in [sqlite_path, Path(f"{sqlite_path}-wal"), Path(f"{sqlite_path}-shm")]:
+            path.unlink(missing_ok=True)
+        conn = sqlite3.connect(sqlite_path, isolation_level=None)
+        for pragma in SQLITE_LOAD_PRAGMAS:
+            conn.execute(pragma)
+        rows = {}
+        types = {}
+        failed = set()
+        pending = len(table_names)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for table_name in table_names:
+                executor.submit(export, table_name)
             
-            # Read CSV data into pandas and save to SQLite
-            try:
-                # Use StringIO to read CSV from memory
-                from io import StringIO
-                csv_data = StringIO(csv_result.stdout)
-                df = pd.read_csv(csv_data)
-                df.to_sql(table_name, conn, if_exists='replace', index=False)
-                logger.info(f"✓ Imported {len(df)} rows to table {table_name}")
+            while pending:
+                table_name, chunk = chunks.get()
+                if chunk is None:
+                    pending -= 1
+                    if table_name in rows and table_name not in failed:
+                        logger.info(f"✓ Imported {rows[table_name]} rows to table {table_name}")
+                    continue
                 
-            except Exception as e:
-                logger.warning(f"Failed to import table {table_name}: {e}")
+                if isinstance(chunk, Exception):
+                    pending -= 1
+                    logger.warning(f"Failed to export table {table_name}: {chunk}")
+                elif table_name in failed:
+                    continue
+                else:
+                    try:
+                        types[table_name] = self._write_sqlite_chunk(conn, table_name, chunk,
+                                                                     types.get(table_name))
+                        rows[table_name] = rows.get(table_name, 0) + len(chunk)
+                        continue
+                    except Exception as e:
+                        logger.warning(f"Failed to import table {table_name}: {e}")
+                
+                # Do not leave a partially imported table behind
+                failed.add(table_name)
+                conn.execute(f'DROP TABLE IF EXISTS "{table_name}"')
         
+        imported = {name: count for name, count in rows.items() if name not in failed}
+        self._finish_sqlite_load(conn, imported)
         conn.close()
         logger.info(f"✓ SQLite conversion complete: {sqlite_path}")
         return sqlite_path
     
+    @staticmethod
+    def _finish_sqlite_load(conn: sqlite3.Connection, row_counts: dict[str, int]) -> None:
+        """Index mapping unit columns, record row counts and restore durable settings."""
+        conn.execute("BEGIN")
+        conn.execute(f'CREATE TABLE "{ROW_COUNT_TABLE}" (table_name TEXT PRIMARY KEY, row_count INTEGER)')
+        conn.executemany(f'INSERT INTO "{ROW_COUNT_TABLE}" VALUES (?, ?)', sorted(row_counts.items()))
+        for table_name in row_counts:
+            columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table_name}")')]
+            for col in MAPPING_UNIT_COLUMNS:
+                if col in columns:
+                    conn.execute(f'CREATE INDEX "idx_{table_name}_{col}" ON "{table_name}" ("{col}")')
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        logger.info(f"✓ Indexed mapping unit columns and recorded row counts for {len(row_counts)} tables")
+    
+    @staticmethod
+    def _write_sqlite_chunk(conn: sqlite3.Connection, table_name: str, chunk: pd.DataFrame,
+                            known_types: Optional[dict] = None) -> dict[str, Optional[str]]:
+        """
+        Insert a chunk in one transaction.
+        
+        The table is (re)created for the first chunk (known_types None). When
+        a later chunk widens a column's type, the rows written so far are
+        copied into a table with the wider types, so no value is stored under
+        a narrower declared type. Columns without values yet are declared REAL.
+        
+        Returns:
+            Column types inferred so far, to pass as known_types with the next chunk
+        """
+        columns = ', '.join(f'"{col}"' for col in chunk.columns)
+        placeholders = ', '.join('?' for _ in chunk.columns)
+        values = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+        types = _sqlite_column_types(chunk, known_types)
+        declared = {col: sql_type or 'REAL' for col, sql_type in types.items()}
+        definitions = ', '.join(f'"{col}" {sql_type}' for col, sql_type in declared.items())
+        
+        conn.execute("BEGIN")
+        try:
+            if known_types is None:
+                conn.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+                conn.execute(f'CREATE TABLE "{table_name}" ({definitions})')
+            elif declared != {col: sql_type or 'REAL' for col, sql_type in known_types.items()}:
+                logger.info(f"  Widening column types of {table_name}: {declared}")
+                conn.execute(f'ALTER TABLE "{table_name}" RENAME TO "{table_name}_narrow"')
+                conn.execute(f'CREATE TABLE "{table_name}" ({definitions})')
+                conn.execute(f'INSERT INTO "{table_name}" SELECT * FROM "{table_name}_narrow"')
+                conn.execute(f'DROP TABLE "{table_name}_narrow"')
+            conn.executemany(f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders})', values)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return types
+    
     def find_bil_files(self) -> list[Path]:
         """
         Find all BIL (Band Interleaved by Line) raster files in the data directory.
@@ -316,7 +1030,7 @@ class HWSDFetcher:
         return bil_files
     
     def process_bil_to_csv(self, bil_path: Path, output_path: Optional[Path] = None, sample_rate: float = 1.0, 
-                          sqlite_db_path: Optional[Path] = None) -> Path:
+                          sqlite_db_path: Optional[Path] = None, unit_table_path: Optional[Path] = None) -> Path:
         """
         Convert BIL raster file to CSV format with soil mapping unit codes.
         
@@ -330,6 +1044,9 @@ class HWSDFetcher:
             output_path: Path to output CSV file (default: bil filename + .csv)
             sample_rate: Fraction of pixels to sample (1.0 = all pixels, 0.1 = 10% sample)
             sqlite_db_path: Optional path to SQLite database for joining soil variables
+            unit_table_path: With sqlite_db_path, write the soil variables to this
+                CSV with one row per mapping unit instead of repeating them on
+                every pixel; the pixel CSV then only holds the mapping unit codes
             
         Returns:
             Path to created CSV file
@@ -353,40 +1070,21 @@ class HWSDFetcher:
                 logger.info(f"NoData value: {nodata}")
                 
                 # Read the first band (soil mapping unit codes)
-                data = src.read(1)
-                
-                # Create coordinate grids
-                x_coords = []
-                y_coords = []
-                mapping_units = []
+                data = np.asarray(src.read(1))
                 
                 # Calculate sampling step
                 step = int(1.0 / sample_rate) if sample_rate < 1.0 else 1
                 
-                for row in range(0, height, step):
-                    for col in range(0, width, step):
-                        # Convert pixel coordinates to geographic coordinates
-                        x, y = rasterio.transform.xy(transform, row, col)
-                        mapping_unit_code = int(data[row, col])
-                        
-                        # Skip nodata values
-                        if nodata is not None and mapping_unit_code == nodata:
-                            continue
-                        
-                        x_coords.append(x)
-                        y_coords.append(y)
-                        mapping_units.append(mapping_unit_code)
-                
-                # Create DataFrame with mapping unit codes
-                df = pd.DataFrame({
-                    'longitude': x_coords,
-                    'latitude': y_coords,
-                    'soil_mapping_unit': mapping_units
-                })
+                rows = np.arange(0, height, step)
+                cols = np.arange(0, width, step)
+                df = pixels_to_frame(data[::step, ::step], rows, cols, transform, nodata)
                 
                 # Join with soil properties if database provided
                 if sqlite_db_path and sqlite_db_path.exists():
-                    df = self._join_soil_properties(df, sqlite_db_path)
+                    if unit_table_path is not None:
+                        self.write_unit_table(df['soil_mapping_unit'].unique(), sqlite_db_path, unit_table_path)
+                    else:
+                        df = self._join_soil_properties(df, sqlite_db_path)
                 
                 # Save to CSV
                 df.to_csv(output_path, index=False)
@@ -403,106 +1101,480 @@ class HWSDFetcher:
         
         return output_path
     
+    def stream_bil_to_table(self, bil_path: Path, output_path: Optional[Path] = None, sample_rate: float = 1.0,
+                            sqlite_db_path: Optional[Path] = None, block_rows: int = 1024,
+                            unit_table_path: Optional[Path] = None) -> Path:
+        """
+        Convert a BIL raster to CSV or Parquet in row blocks with bounded memory.
+        
+        Streaming counterpart of process_bil_to_csv: the raster is read through
+        rasterio windows of block_rows rows, and each block's valid pixels are
+        converted, optionally joined, and appended to the output before the
+        next block is read. Peak memory is set by block_rows rather than by
+        the raster size. The rows written are the same as process_bil_to_csv.
+        
+        Args:
+            bil_path: Path to .bil raster file
+            output_path: Output path; a .parquet suffix writes one Parquet row
+                group per block, anything else writes CSV (default: bil
+                filename + .csv)
+            sample_rate: Fraction of pixels to sample (1.0 = all pixels, 0.1 = 10% sample)
+            sqlite_db_path: Optional path to SQLite database for joining soil variables
+            block_rows: Raster rows read per block (rounded up to a multiple of
+                the sampling step)
+            unit_table_path: With sqlite_db_path, write the soil variables once per
+                mapping unit to this CSV after the last block instead of joining
+                them onto every pixel
+            
+        Returns:
+            Path to created output file
+            
+        Raises:
+            RuntimeError: If Parquet output is requested without pyarrow installed
+            ValueError: If a block's columns differ from output_columns
+            
+        Examples:
+            >>> fetcher = HWSDFetcher()
+            >>> # fetcher.stream_bil_to_table(Path("HWSD2.bil"), Path("HWSD2.parquet"), block_rows=512)
+        """
+        if output_path is None:
+            output_path = bil_path.with_suffix('.csv')
+        output_path = Path(output_path)
+        
+        parquet = output_path.suffix == '.parquet'
+        if parquet and pq is None:
+            raise RuntimeError("pyarrow required for Parquet output. Install with: pip install pyarrow")
+        
+        join = sqlite_db_path is not None and sqlite_db_path.exists()
+        columns = self.output_columns(sqlite_db_path if join and unit_table_path is None else None)
+        units = set()
+        writer = None
+        total_rows = 0
+        
+        logger.info(f"Streaming {bil_path.name} to {output_path.name} in blocks of {block_rows} rows")
+        
+        try:
+            for block_index, block_count, df in self._iter_bil_blocks(bil_path, sample_rate, block_rows):
+                if join and unit_table_path is not None:
+                    units.update(df['soil_mapping_unit'].unique().tolist())
+                elif join:
+                    df = self._join_soil_properties(df, sqlite_db_path)
+                
+                # Every block must have the planned columns, or rows would
+                # not line up under the CSV header or Parquet schema
+                _check_columns(df, columns)
+                if parquet:
+                    if writer is None:
+                        schema = _arrow_schema(columns)
+                        writer = pq.ParquetWriter(output_path, schema, compression='zstd')
+                    writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+                else:
+                    df.to_csv(output_path, mode='w' if block_index == 0 else 'a',
+                              header=block_index == 0, index=False)
+                
+                total_rows += len(df)
+                logger.info(f"  Block {block_index + 1}/{block_count}: {len(df)} valid pixels "
+                            f"({total_rows} total)")
+        except Exception as e:
+            logger.error(f"Failed to process {bil_path.name}: {e}")
+            raise
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        if join and unit_table_path is not None:
+            self.write_unit_table(np.array(sorted(units), dtype=np.int64), sqlite_db_path, unit_table_path)
+        
+        logger.info(f"✓ Exported {total_rows} valid pixels to {output_path.name}")
+        return output_path
+    
+    def process_bil_parallel(self, bil_path: Path, output_path: Optional[Path] = None, sample_rate: float = 1.0,
+                             sqlite_db_path: Optional[Path] = None, workers: Optional[int] = None,
+                             strip_rows: Optional[int] = None, merge: bool = True) -> Path:
+        """
+        Convert a BIL raster using a process pool over horizontal row strips.
+        
+        The raster is split into strips of strip_rows rows. Each worker opens
+        its own rasterio handle, converts and optionally joins its strip, and
+        writes a part file. The parts are then concatenated in strip order
+        into output_path, or kept as a partitioned dataset directory.
+        
+        Args:
+            bil_path: Path to .bil raster file
+            output_path: Output file; a .parquet suffix writes Parquet (requires
+                pyarrow), anything else CSV (default: bil filename + .csv)
+            sample_rate: Fraction of pixels to sample (1.0 = all pixels, 0.1 = 10% sample)
+            sqlite_db_path: Optional path to SQLite database for joining soil variables
+            workers: Number of worker processes (default: CPU count)
+            strip_rows: Raster rows per strip (default: about four strips per
+                worker, rounded up to a multiple of the sampling step)
+            merge: If True, merge the parts into output_path and remove them;
+                if False, return the directory of part files
+            
+        Returns:
+            Path to the merged output file, or to the part directory
+            (<output stem>_parts/part-00000.csv, ...) if merge is False
+            
+        Raises:
+            RuntimeError: If Parquet output is requested without pyarrow installed
+            
+        Examples:
+            >>> fetcher = HWSDFetcher()
+            >>> # fetcher.process_bil_parallel(Path("HWSD2.bil"), Path("HWSD2.parquet"), workers=64)
+        """
+        if output_path is None:
+            output_path = bil_path.with_suffix('.csv')
+        output_path = Path(output_path)
+        
+        suffix = '.parquet' if output_path.suffix == '.parquet' else '.csv'
+        if suffix == '.parquet' and pq is None:
+            raise RuntimeError("pyarrow required for Parquet output. Install with: pip install pyarrow")
+        
+        workers = workers or os.cpu_count() or 1
+        step = int(1.0 / sample_rate) if sample_rate < 1.0 else 1
+        with rasterio.open(bil_path) as src:
+            height = src.height
+        if strip_rows is None:
+            strip_rows = -(-height // (workers * 4))
+        strip_rows = max(step, -(-strip_rows // step) * step)
+        
+        # Discover the join plan once so workers all load the saved copy; it
+        # also fixes the columns every part is written with
+        columns = self.output_columns(sqlite_db_path)
+        
+        parts_dir = output_path.with_name(f"{output_path.stem}_parts")
+        if parts_dir.exists():
+            shutil.rmtree(parts_dir)
+        parts_dir.mkdir(parents=True)
+        
+        strips = list(range(0, height, strip_rows))
+        logger.info(f"Processing {bil_path.name} in {len(strips)} strips of {strip_rows} rows "
+                    f"with {workers} workers")
+        
+        total_rows = 0
+        # Spawn rather than fork: GDAL and its thread pools are not fork-safe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(_process_strip, str(self.data_dir), bil_path, row_start,
+                                min(row_start + strip_rows, height), step, sqlite_db_path,
+                                parts_dir / f"part-{index:05d}{suffix}", columns)
+                for index, row_start in enumerate(strips)
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                part_path, rows = future.result()
+                total_rows += rows
+                logger.info(f"  Strip {done}/{len(strips)} done: {part_path.name} ({rows} rows)")
+            part_paths = [future.result()[0] for future in futures]
+        
+        if not merge:
+            logger.info(f"✓ Exported {total_rows} valid pixels to {len(part_paths)} parts in {parts_dir}")
+            return parts_dir
+        
+        self._merge_parts(part_paths, output_path, columns)
+        shutil.rmtree(parts_dir)
+        logger.info(f"✓ Exported {total_rows} valid pixels to {output_path.name}")
+        return output_path
+    
+    def _merge_parts(self, part_paths: list[Path], output_path: Path, columns: dict[str, str]) -> None:
+        """
+        Concatenate part files in order into a single CSV or Parquet file.
+        
+        Raises:
+            ValueError: If a part's columns differ from columns
+        """
+        if output_path.suffix == '.parquet':
+            schema = _arrow_schema(columns)
+            with pq.ParquetWriter(output_path, schema, compression='zstd') as writer:
+                for path in part_paths:
+                    table = pq.read_table(path)
+                    if not table.schema.equals(schema):
+                        raise ValueError(f"Schema of {path.name} does not match the output schema")
+                    writer.write_table(table)
+            return
+        
+        expected_header = pd.DataFrame(columns=list(columns)).to_csv(index=False).encode()
+        with open(output_path, 'wb') as out:
+            out.write(expected_header)
+            for path in part_paths:
+                with open(path, 'rb') as part:
+                    if part.readline() != expected_header:
+                        raise ValueError(f"Columns of {path.name} do not match the output schema")
+                    shutil.copyfileobj(part, out, 1024 * 1024)
+    
+    def _iter_bil_blocks(self, bil_path: Path, sample_rate: float,
+                         block_rows: int) -> Iterator[tuple[int, int, pd.DataFrame]]:
+        """
+        Yield (block index, block count, pixel table) for row blocks of a raster.
+        
+        Blocks start on multiples of the sampling step, so together they
+        produce the same strided grid as sampling the whole band.
+        """
+        step = int(1.0 / sample_rate) if sample_rate < 1.0 else 1
+        block_rows = max(step, -(-block_rows // step) * step)
+        
+        with rasterio.open(bil_path) as src:
+            width = src.width
+            height = src.height
+            logger.info(f"Raster dimensions: {width} x {height} pixels")
+            
+            block_count = -(-height // block_rows)
+            for block_index, row_start in enumerate(range(0, height, block_rows)):
+                row_stop = min(row_start + block_rows, height)
+                yield block_index, block_count, read_row_block(src, row_start, row_stop, step)
+    
     def _join_soil_properties(self, df: pd.DataFrame, sqlite_db_path: Path) -> pd.DataFrame:
         """
         Join raster mapping unit codes with soil properties from ALL database tables.
         
+        Properties are joined onto the unique mapping units only (see
+        build_unit_attributes) and then expanded to the pixels with a single
+        take over the factorized mapping unit codes, so the pixel table is
+        copied once rather than once per database table.
+        
         Args:
             df: DataFrame with longitude, latitude, and soil_mapping_unit columns
             sqlite_db_path: Path to SQLite database with soil property tables
             
         Returns:
             Enhanced DataFrame with soil property columns from all available tables
+            
+        Raises:
+            sqlite3.Error: If the database cannot be read; the join is never
+                silently skipped
+        """
+        result_df = df.reset_index(drop=True)
+        result_df['soil_mapping_unit'] = result_df['soil_mapping_unit'].astype('int64')
+        codes, unique_units = pd.factorize(result_df['soil_mapping_unit'])
+        
+        units_df = self.build_unit_attributes(np.asarray(unique_units), sqlite_db_path)
+        attributes = units_df.drop(columns=['soil_mapping_unit']).take(codes).reset_index(drop=True)
+        result_df = pd.concat([result_df, attributes], axis=1)
+        
+        logger.info(f"Final DataFrame shape: {result_df.shape}")
+        return result_df
+    
+    def output_columns(self, sqlite_db_path: Optional[Path] = None) -> dict[str, str]:
+        """
+        Columns of a raster export, with their pandas dtypes.
+        
+        The pixel columns, followed (with a database) by every column of the
+        join plan, typed from the declared SQLite column types. The streaming
+        and parallel exports write their output with this schema.
+        
+        Args:
+            sqlite_db_path: Optional path to SQLite database for joining soil variables
+            
+        Returns:
+            Dictionary of column name to pandas dtype, in output order
+        """
+        columns = dict(PIXEL_COLUMNS)
+        if sqlite_db_path is not None and Path(sqlite_db_path).exists():
+            columns.update(_plan_dtypes(self.get_join_plan(sqlite_db_path)))
+        return columns
+    
+    def get_join_plan(self, sqlite_db_path: Path) -> dict:
+        """
+        Get the join plan for a soil property database, discovering it if needed.
+        
+        The plan lists each table that has a mapping unit column and data
+        rows, with its key column, the alias of every data column and the
+        column types: the declared types, widened where a column holds wider
+        values (SQLite does not enforce declared types). The plan is
+        computed once per database file, kept in memory and persisted
+        next to the database as <db name>.join_plan.json, so later exports
+        skip the sqlite_master / PRAGMA table_info introspection. A plan is
+        discarded when the database file's size or modification time changes.
+        
+        Args:
+            sqlite_db_path: Path to SQLite database with soil property tables
+            
+        Returns:
+            Dictionary with the database signature and a 'tables' list of
+            {'table', 'key', 'columns': {column: alias}, 'dtypes': {column: type}}
         """
+        sqlite_db_path = Path(sqlite_db_path)
+        stat = sqlite_db_path.stat()
+        signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        key = str(sqlite_db_path.resolve())
+        
+        plan = self._join_plans.get(key)
+        if plan is not None and plan['signature'] == signature:
+            return plan
+        
+        plan_path = sqlite_db_path.with_name(sqlite_db_path.name + JOIN_PLAN_SUFFIX)
         try:
-            conn = sqlite3.connect(sqlite_db_path)
-            cursor = conn.cursor()
+            with open(plan_path) as f:
+                plan = json.load(f)
+            if plan.get('version') != JOIN_PLAN_VERSION or plan.get('signature') != signature:
+                logger.info(f"Join plan {plan_path.name} is stale, rediscovering tables")
+                plan = None
+        except (OSError, ValueError):
+            plan = None
+        
+        if plan is None:
+            plan = self._discover_join_plan(sqlite_db_path)
+            plan['signature'] = signature
+            try:
+                tmp_path = plan_path.with_name(f"{plan_path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, 'w') as f:
+                    json.dump(plan, f, indent=2)
+                tmp_path.replace(plan_path)
+                logger.info(f"✓ Saved join plan: {plan_path.name}")
+            except OSError as e:
+                logger.warning(f"Could not save join plan {plan_path}: {e}")
+        else:
+            logger.info(f"Using cached join plan: {plan_path.name}")
+        
+        self._join_plans[key] = plan
+        return plan
+    
+    def _discover_join_plan(self, sqlite_db_path: Path) -> dict:
+        """Introspect the database tables to build a join plan (see get_join_plan)."""
+        conn = sqlite3.connect(sqlite_db_path)
+        cursor = conn.cursor()
+        
+        # Get all available tables
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+        available_tables = [row[0] for row in cursor.fetchall()]
+        logger.info(f"Available database tables: {available_tables}")
+        
+        tables = []
+        for table_name in available_tables:
+            try:
+                # Get table schema
+                cursor.execute(f"PRAGMA table_info({table_name});")
+                table_info = cursor.fetchall()
+            except Exception as e:
+                logger.warning(f"  Failed to read schema of {table_name}: {e}")
+                continue
+            columns = [row[1] for row in table_info]
+            dtypes = {row[1]: row[2] for row in table_info}
             
-            # Get all available tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            available_tables = [row[0] for row in cursor.fetchall()]
-            logger.info(f"Available database tables: {available_tables}")
+            # Find the mapping unit column
+            mapping_col = next((col for col in MAPPING_UNIT_COLUMNS if col in columns), None)
+            if not mapping_col:
+                logger.info(f"  Skipping {table_name}: No mapping unit column found")
+                continue
             
-            # Start with the base dataframe
-            result_df = df.copy()
-            total_joined_columns = 0
+            # Build column list for extraction (excluding the mapping column)
+            data_columns = [col for col in columns if col != mapping_col]
+            if not data_columns:
+                logger.info(f"  Skipping {table_name}: No data columns found")
+                continue
             
-            # Process each table to extract variables
-            for table_name in available_tables:
-                try:
-                    # Get table schema
-                    cursor.execute(f"PRAGMA table_info({table_name});")
-                    table_info = cursor.fetchall()
-                    columns = [row[1] for row in table_info]
-                    
-                    logger.info(f"Processing table {table_name} with {len(columns)} columns")
-                    
-                    # Find potential mapping unit columns
-                    mapping_unit_cols = ['MU_GLOBAL', 'MAPPING_UNIT', 'MU_CODE', 'SMU_ID', 'CODE', 'ID']
-                    mapping_col = None
-                    for col in mapping_unit_cols:
-                        if col in columns:
-                            mapping_col = col
-                            break
-                    
-                    if not mapping_col:
-                        logger.info(f"  Skipping {table_name}: No mapping unit column found")
-                        continue
-                    
-                    # Build column list for extraction (excluding the mapping column)
-                    data_columns = [col for col in columns if col != mapping_col]
-                    
-                    if not data_columns:
-                        logger.info(f"  Skipping {table_name}: No data columns found")
-                        continue
-                    
-                    # Create table-prefixed column names to avoid conflicts
-                    prefixed_columns = []
-                    for col in data_columns:
-                        # Create descriptive column name with table context and units hint
-                        col_name = f"{table_name.lower()}_{col.lower()}"
-                        
-                        # Add unit hints based on common HWSD variable patterns
-                        if 'ph' in col.lower():
-                            col_name += "_ph_units"
-                        elif 'awc' in col.lower() or 'water' in col.lower():
-                            col_name += "_percent"
-                        elif 'bulk' in col.lower() or 'density' in col.lower():
-                            col_name += "_g_cm3"
-                        elif any(texture in col.lower() for texture in ['sand', 'silt', 'clay']):
-                            col_name += "_percent"
-                        elif 'soc' in col.lower() or 'carbon' in col.lower():
-                            col_name += "_percent"
-                        elif 'cec' in col.lower():
-                            col_name += "_cmol_kg"
-                        elif 'drainage' in col.lower():
-                            col_name += "_class"
-                        elif 'coverage' in col.lower():
-                            col_name += "_percent"
-                        elif 'depth' in col.lower():
-                            col_name += "_cm"
-                        elif 'value' in col.lower():
-                            col_name += "_value"
-                        else:
-                            col_name += "_units_unknown"
-                            
-                        prefixed_columns.append(f"{col} as {col_name}")
-                    
-                    # Query the table
-                    query = f"""
-                    SELECT {mapping_col}, {', '.join(prefixed_columns)}
-                    FROM {table_name}
-                    WHERE {mapping_col} IS NOT NULL
-                    """
-                    
-                    table_df = pd.read_sql_query(query, conn)
-                    
-                    if table_df.empty:
-                        logger.info(f"  Skipping {table_name}: No data rows")
-                        continue
-                    
-                    # Ensure compatible data types for merging
-                    # Convert both mapping unit columns to consistent type (int64)
+            # SQLite does not enforce declared types, so find the widest
+            # storage class each column holds (0 null, 1 integer, 2 real,
+            # 3 text or blob) and whether the table has any keyed rows
+            storage = ', '.join(
+                f"max(CASE typeof({col}) WHEN 'null' THEN 0 WHEN 'integer' THEN 1 "
+                f"WHEN 'real' THEN 2 ELSE 3 END)"
+                for col in columns
+            )
+            cursor.execute(f"SELECT count({mapping_col}), {storage} FROM {table_name};")
+            row_count, *classes = cursor.fetchone()
+            if not row_count:
+                logger.info(f"  Skipping {table_name}: No data rows")
+                continue
+            ranks = [_sqlite_type_dtype(sql_type) for sql_type in SQLITE_TYPE_ORDER]
+            for col, storage_class in zip(columns, classes):
+                if storage_class > ranks.index(_sqlite_type_dtype(dtypes[col])) + 1:
+                    stored = SQLITE_TYPE_ORDER[storage_class - 1]
+                    logger.warning(f"  {table_name}.{col} is declared {dtypes[col] or 'without a type'} "
+                                   f"but holds {stored} values, reading it as {stored}")
+                    dtypes[col] = stored
+            
+            tables.append({
+                'table': table_name,
+                'key': mapping_col,
+                'columns': {col: _column_alias(table_name, col) for col in data_columns},
+                'dtypes': dtypes,
+            })
+        
+        conn.close()
+        logger.info(f"Join plan: {len(tables)} of {len(available_tables)} tables have a mapping unit column")
+        return {'version': JOIN_PLAN_VERSION, 'tables': tables}
+    
+    def write_unit_table(self, mapping_units: np.ndarray, sqlite_db_path: Path, unit_table_path: Path) -> Path:
+        """
+        Write the soil properties of the given mapping units to a CSV file.
+        
+        Args:
+            mapping_units: Mapping unit codes present in the exported pixels
+            sqlite_db_path: Path to SQLite database with soil property tables
+            unit_table_path: Output CSV path, one row per mapping unit
+            
+        Returns:
+            Path to the unit table
+        """
+        units_df = self.build_unit_attributes(np.sort(np.asarray(mapping_units)), sqlite_db_path)
+        units_df.to_csv(unit_table_path, index=False)
+        logger.info(f"✓ Wrote {len(units_df)} mapping units to {Path(unit_table_path).name}")
+        return Path(unit_table_path)
+    
+    def build_unit_attributes(self, mapping_units: np.ndarray, sqlite_db_path: Path) -> pd.DataFrame:
+        """
+        Build a table of soil properties with one row per mapping unit.
+        
+        Every database table with a mapping unit column contributes its
+        columns, renamed with the table prefix and a unit hint. Tables with
+        several rows per mapping unit (one-to-many) contribute, for each unit,
+        the row with the lowest rowid (the first inserted), so the result
+        always has exactly one row per requested unit. Keys not stored as
+        integers are converted first, so rows keyed '1' and '01' belong to
+        the same unit. Every planned column is present with its planned dtype
+        (see output_columns), null for units a table does not list.
+        
+        Args:
+            mapping_units: Mapping unit codes to build attributes for
+            sqlite_db_path: Path to SQLite database with soil property tables
+            
+        Returns:
+            DataFrame with a soil_mapping_unit column (in the order given)
+            followed by the joined soil property columns
+        """
+        result_df = pd.DataFrame({'soil_mapping_unit': np.asarray(mapping_units, dtype=np.int64)})
+        plan = self.get_join_plan(sqlite_db_path)
+        
+        conn = sqlite3.connect(sqlite_db_path)
+        total_joined_columns = 0
+        
+        # Tables with INTEGER keys are read through the key index for just these units
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _units (mu INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM _units")
+        conn.executemany("INSERT OR IGNORE INTO _units VALUES (?)",
+                         ((int(mu),) for mu in result_df['soil_mapping_unit']))
+        
+        # Process each planned table to extract variables
+        for entry in plan['tables']:
+            table_name = entry['table']
+            mapping_col = entry['key']
+            try:
+                prefixed_columns = [f"{col} as {alias}" for col, alias in entry['columns'].items()]
+                
+                # Query the table
+                integer_key = entry['dtypes'].get(mapping_col, '').upper() == 'INTEGER'
+                if integer_key:
+                    condition = f"{mapping_col} IN (SELECT mu FROM temp._units)"
+                else:
+                    condition = f"{mapping_col} IS NOT NULL"
+                query = f"""
+                SELECT {mapping_col}, rowid AS _rowid, {', '.join(prefixed_columns)}
+                FROM {table_name}
+                WHERE {condition}
+                ORDER BY {mapping_col}, rowid
+                """
+                
+                table_df = pd.read_sql_query(query, conn)
+                
+                if table_df.empty:
+                    # The columns are still added (all null) below
+                    logger.info(f"  No rows in {table_name} for these mapping units")
+                
+                # Ensure compatible data types for merging
+                # Convert both mapping unit columns to consistent type (int64)
+                # (typed INTEGER keys from convert_mdb_to_sqlite need no conversion)
+                elif not pd.api.types.is_integer_dtype(table_df[mapping_col]):
                     try:
                         # Convert table mapping column to int64, handling any non-numeric values
                         table_df[mapping_col] = pd.to_numeric(table_df[mapping_col], errors='coerce')
@@ -510,62 +1582,74 @@ class HWSDFetcher:
                         table_df = table_df.dropna(subset=[mapping_col])
                         # Convert to int64
                         table_df[mapping_col] = table_df[mapping_col].astype('int64')
-                        
-                        # Ensure main dataframe mapping column is also int64
-                        result_df['soil_mapping_unit'] = result_df['soil_mapping_unit'].astype('int64')
-                        
-                        # Check if table still has data after conversion
-                        if table_df.empty:
-                            logger.warning(f"  Skipping {table_name}: No valid mapping units after type conversion")
-                            continue
-                            
                     except (ValueError, TypeError) as e:
                         logger.warning(f"  Failed to convert data types for {table_name}: {e}")
                         continue
                     
-                    # Join with result dataframe
-                    before_cols = len(result_df.columns)
-                    result_df = result_df.merge(
-                        table_df,
-                        left_on='soil_mapping_unit',
-                        right_on=mapping_col,
-                        how='left',
-                        suffixes=('', f'_{table_name}')
-                    )
-                    
-                    # Drop duplicate mapping column
-                    if mapping_col in result_df.columns:
-                        result_df = result_df.drop(columns=[mapping_col])
-                    
-                    after_cols = len(result_df.columns)
-                    joined_cols = after_cols - before_cols
-                    total_joined_columns += joined_cols
-                    
-                    logger.info(f"  ✓ Joined {joined_cols} variables from {table_name}")
+                    # Check if table still has data after conversion
+                    if table_df.empty:
+                        logger.warning(f"  Skipping {table_name}: No valid mapping units after type conversion")
+                        continue
                     
-                except Exception as e:
-                    logger.warning(f"  Failed to process table {table_name}: {e}")
-                    continue
-            
-            conn.close()
-            
-            # Log final statistics
-            logger.info(f"✓ Multi-table join complete: {total_joined_columns} total variables from {len(available_tables)} tables")
-            logger.info(f"Final DataFrame shape: {result_df.shape}")
-            
-            # Log a sample of joined columns (excluding coordinate columns)
-            data_cols = [col for col in result_df.columns if col not in ['longitude', 'latitude', 'soil_mapping_unit']]
-            if data_cols:
-                sample_cols = data_cols[:5]  # Show first 5 data columns
-                logger.info(f"Sample variables: {sample_cols}")
-                if len(data_cols) > 5:
-                    logger.info(f"... and {len(data_cols) - 5} more variables")
-            
-            return result_df
-            
-        except Exception as e:
-            logger.warning(f"Failed to join soil properties: {e}")
-            return df
+                    # Keys that differ only as text ('1', '01') are now equal
+                    table_df = table_df.sort_values([mapping_col, '_rowid'], kind='stable')
+                
+                # Keep the lowest rowid per mapping unit so one-to-many
+                # tables cannot multiply the rows
+                duplicated = table_df[mapping_col].duplicated()
+                if duplicated.any():
+                    n_units = table_df.loc[duplicated, mapping_col].nunique()
+                    logger.info(f"  {n_units} mapping units have several rows in {table_name}; "
+                                f"keeping the first by rowid")
+                    table_df = table_df[~duplicated]
+                table_df = table_df.drop(columns=['_rowid'])
+                
+                # Join with result dataframe
+                before_cols = len(result_df.columns)
+                result_df = result_df.merge(
+                    table_df,
+                    left_on='soil_mapping_unit',
+                    right_on=mapping_col,
+                    how='left',
+                    suffixes=('', f'_{table_name}')
+                )
+                
+                # Drop duplicate mapping column
+                if mapping_col in result_df.columns:
+                    result_df = result_df.drop(columns=[mapping_col])
+                
+                after_cols = len(result_df.columns)
+                joined_cols = after_cols - before_cols
+                total_joined_columns += joined_cols
+                
+                logger.info(f"  ✓ Joined {joined_cols} variables from {table_name}")
+                
+            except Exception as e:
+                logger.warning(f"  Failed to process table {table_name}: {e}")
+                continue
+        
+        conn.close()
+        
+        # Tables without rows for these units (or that failed) still get
+        # their columns, so every block of an export has the same columns
+        dtypes = _plan_dtypes(plan)
+        result_df = result_df.reindex(columns=['soil_mapping_unit', *dtypes])
+        for col, dtype in dtypes.items():
+            result_df[col] = _cast_column(result_df[col], dtype)
+        
+        # Log final statistics
+        logger.info(f"✓ Multi-table join complete: {total_joined_columns} total variables from {len(plan['tables'])} tables")
+        logger.info(f"Unit attribute table: {len(result_df)} mapping units")
+        
+        # Log a sample of joined columns
+        data_cols = [col for col in result_df.columns if col != 'soil_mapping_unit']
+        if data_cols:
+            sample_cols = data_cols[:5]  # Show first 5 data columns
+            logger.info(f"Sample variables: {sample_cols}")
+            if len(data_cols) > 5:
+                logger.info(f"... and {len(data_cols) - 5} more variables")
+        
+        return result_df
     
     def process_raster_directory_to_csv(self, raster_dir: Path, output_dir: Optional[Path] = None, 
                                        sample_rate: float = 0.1, sqlite_db_path: Optional[Path] = None) -> Path:
@@ -612,13 +1696,18 @@ class HWSDFetcher:
         logger.info(f"✓ Raster processing complete: {output_dir}")
         return output_dir
     
-    def export_tables_to_csv(self, mdb_path: Path, output_dir: Optional[Path] = None) -> Path:
+    def export_tables_to_csv(self, mdb_path: Path, output_dir: Optional[Path] = None,
+                             max_workers: int = 4) -> Path:
         """
         Export all tables from Access database to CSV files.
         
+        Tables are exported concurrently by a bounded pool of mdb-export
+        processes writing straight to their CSV files.
+        
         Args:
             mdb_path: Path to .mdb file
             output_dir: Directory to save CSV files (default: mdb filename + "_csv")
+            max_workers: Number of tables exported at the same time
             
         Returns:
             Path to directory containing CSV files
@@ -634,32 +1723,30 @@ class HWSDFetcher:
         logger.info(f"Exporting tables from {mdb_path.name} to CSV files in {output_dir}")
         
         # Get table names
-        result = subprocess.run(['mdb-tables', '-1', str(mdb_path)], 
-                              capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError(f"Failed to list tables: {result.stderr}")
+        table_names = self._mdb_table_names(mdb_path)
         
-        table_names = [name.strip() for name in result.stdout.split('\n') if name.strip()]
-        
-        # Export each table to CSV
-        for table_name in table_names:
+        def export(table_name: str) -> None:
             csv_path = output_dir / f"{table_name}.csv"
             logger.info(f"Exporting {table_name} to {csv_path.name}")
             
-            with open(csv_path, 'w') as f:
-                result = subprocess.run(['mdb-export', str(mdb_path), table_name], 
-                                      stdout=f, text=True)
-                if result.returncode != 0:
-                    logger.warning(f"Failed to export table {table_name}")
-                    continue
+            with open(csv_path, 'wb') as f:
+                result = subprocess.run(['mdb-export', str(mdb_path), table_name],
+                                        stdout=f, stderr=subprocess.PIPE)
+            if result.returncode != 0:
+                logger.warning(f"Failed to export table {table_name}")
+                return
             
             # Report row count
             try:
-                df = pd.read_csv(csv_path)
-                logger.info(f"✓ Exported {len(df)} rows to {csv_path.name}")
+                rows = sum(len(chunk) for chunk in pd.read_csv(csv_path, chunksize=100_000))
+                logger.info(f"✓ Exported {rows} rows to {csv_path.name}")
             except Exception:
                 logger.warning(f"Could not verify row count for {csv_path.name}")
         
+        # Export each table to CSV
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(export, table_names))
+        
         logger.info(f"✓ CSV export complete: {output_dir}")
         return output_dir
     
@@ -1,10 +1,11 @@
 #!/usr/bin/env python
 """Test script to read and explore the climate NetCDF file."""
 
-import subprocess
 from pathlib import Path
 import xarray as xr
 
+from cdl_to_netcdf import compile_cdl
+
 # Directory containing CDL files
 cdl_dir = Path("hackathon-case_study-experimental_warming_nitrogen/ecosim-inputs-netcdf")
 
@@ -17,11 +18,7 @@ print(f"Testing with climate data: {cdl_file.name}")
 # Convert if needed
 if not nc_file.exists():
     print(f"Converting to: {nc_file}")
-    subprocess.run(
-        ["ncgen", "-o", str(nc_file), str(cdl_file)],
-        check=True,
-        capture_output=True
-    )
+    compile_cdl(cdl_file, nc_file)
     print("✓ Conversion successful")
 else:
     print(f"Using existing file: {nc_file}")
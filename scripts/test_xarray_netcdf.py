@@ -1,10 +1,11 @@
 #!/usr/bin/env python
 """Test script to convert CDL to NetCDF and read with xarray."""
 
-import subprocess
 from pathlib import Path
 import xarray as xr
 
+from cdl_to_netcdf import compile_cdl
+
 # Directory containing CDL files
 cdl_dir = Path("hackathon-case_study-experimental_warming_nitrogen/ecosim-inputs-netcdf")
 
@@ -12,26 +13,15 @@ cdl_dir = Path("hackathon-case_study-experimental_warming_nitrogen/ecosim-inputs
 cdl_file = cdl_dir / "Blodget_grid_20240622.nc.cdl"
 print(f"Testing with: {cdl_file}")
 
-# Convert CDL to NetCDF using ncgen
+# Convert CDL to NetCDF (in-process, no ncgen needed)
 nc_file = cdl_file.with_suffix("").with_suffix(".nc")  # Remove .cdl, keep .nc
 print(f"Converting to: {nc_file}")
 
 try:
-    subprocess.run(
-        ["ncgen", "-o", str(nc_file), str(cdl_file)],
-        check=True,
-        capture_output=True,
-        text=True
-    )
+    compile_cdl(cdl_file, nc_file)
     print("✓ Conversion successful")
-except subprocess.CalledProcessError as e:
+except (OSError, ValueError) as e:
     print(f"✗ Conversion failed: {e}")
-    print(f"stderr: {e.stderr}")
-    exit(1)
-except FileNotFoundError:
-    print("✗ ncgen not found. You may need to install netcdf tools:")
-    print("  brew install netcdf  # on macOS")
-    print("  apt install netcdf-bin  # on Ubuntu/Debian")
     exit(1)
 
 # Now read with xarray
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Tests for aligning NetCDF variables with BERVO terms.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add scripts directory to path for importing
+scripts_dir = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+from align_netcdf_vars_with_bervo import align_variables, bervo_lookup_table
+
+
+class TestAlignVariables(unittest.TestCase):
+    """Test cases for align_variables."""
+
+    def setUp(self):
+        """Set up a small BERVO table with primary and alternative names."""
+        self.bervo = pd.DataFrame({
+            'ID': ['BERVO:1', 'BERVO:2', 'BERVO:3', 'BERVO:4', 'BERVO:5'],
+            'Label (description)': ['rain', 'temperature', 'rain again', 'wind', 'no name'],
+            'Category': ['climate'] * 5,
+            'EcoSIM Variable Name': ['RAINH', 'TMPH', 'RAINH', 'WINDH', np.nan],
+            'EcoSIM Other Names': [np.nan, 'TAIR | TMP', 'PRECIP|TMPH', 'TAIR|', 'U'],
+            'has_units': ['mm', 'oC', 'mm', 'm s-1', np.nan],
+            'Comment': ['not copied'] * 5,
+        })
+
+    def test_primary_and_alternative_names(self):
+        """Test primary matches, alternative names and their precedence."""
+        netcdf = pd.DataFrame(
+            {'variable-name': ['TMPH', 'RAINH', 'TAIR', 'TMP', 'PRECIP', 'U', 'NONE', np.nan],
+             'variable-unit': ['oC', 'mm', 'oC', 'oC', 'mm', 'm s-1', '-', '-']},
+            index=range(10, 18),
+        )
+        aligned = align_variables(netcdf, self.bervo)
+
+        self.assertEqual(aligned.index.tolist(), netcdf.index.tolist())
+        self.assertEqual(aligned.columns.tolist(), [
+            'variable-name', 'variable-unit', 'BERVO_ID', 'BERVO_Label (description)',
+            'BERVO_Category', 'BERVO_has_units',
+        ])
+        # Primary names win over alternative names (TMPH is also an alias of
+        # BERVO:3), the first row wins among duplicates (RAINH, TAIR), and
+        # aliases are stripped
+        self.assertEqual(aligned['BERVO_ID'].tolist()[:6],
+                         ['BERVO:2', 'BERVO:1', 'BERVO:2', 'BERVO:2', 'BERVO:3', 'BERVO:5'])
+        self.assertEqual(aligned.loc[11, 'BERVO_Label (description)'], 'rain')
+        self.assertTrue(aligned.loc[[16, 17], 'BERVO_ID'].isna().all())
+
+    def test_lookup_table(self):
+        """Test the lookup table has one row per distinct name."""
+        table, n_other = bervo_lookup_table(self.bervo, ['ID'])
+        self.assertEqual(table['name'].tolist(), ['RAINH', 'TMPH', 'WINDH', 'TAIR', 'TMP', 'PRECIP', 'U'])
+        self.assertEqual(n_other, 5)
+
+        # Without alternative names only primary names are matched
+        table, n_other = bervo_lookup_table(self.bervo.drop(columns='EcoSIM Other Names'), ['ID'])
+        self.assertEqual(table['name'].tolist(), ['RAINH', 'TMPH', 'WINDH'])
+        self.assertEqual(n_other, 0)
+
+    def test_large_input(self):
+        """Test that many repeated variables keep their rows and order."""
+        names = np.tile(['TMPH', 'TAIR', 'NONE'], 20_000)
+        netcdf = pd.DataFrame({'variable-name': names})
+        aligned = align_variables(netcdf, self.bervo)
+        self.assertEqual(len(aligned), len(names))
+        self.assertEqual(aligned['BERVO_ID'].iloc[-3:-1].tolist(), ['BERVO:2', 'BERVO:2'])
+        self.assertTrue(pd.isna(aligned['BERVO_ID'].iloc[-1]))
+        self.assertEqual(aligned['BERVO_ID'].notna().sum(), 40_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
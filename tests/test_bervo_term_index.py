@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Tests for the BERVO term suggestion index.
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add scripts directory to path for importing
+scripts_dir = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+from align_netcdf_vars_with_bervo import align_variables, generate_unmatched_report
+from bervo_term_index import BervoTermIndex, char_ngrams, normalize_unit
+
+BERVO_FILE = Path(__file__).parent.parent / "bervo" / "bervo-terms.tsv"
+
+
+class TestBervoTermIndex(unittest.TestCase):
+    """Test cases for BervoTermIndex."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the index over the BERVO terms once."""
+        cls.bervo = pd.read_csv(BERVO_FILE, sep='\t')
+        cls.index = BervoTermIndex(cls.bervo)
+
+    def setUp(self):
+        """Set up a small BERVO table."""
+        self.small = pd.DataFrame({
+            'ID': ['ID', 'BERVO:1', 'BERVO:2', 'BERVO:3', 'BERVO:4'],
+            'Label (description)': ['LABEL', 'Soil temperature', 'Soil temperature',
+                                    'Leaf nitrogen content', 'Canopy height'],
+            'Definition': ['A IAO:0000115', 'Temperature of the soil.', 'Temperature of the soil.',
+                           'Nitrogen in leaves.', 'Height of the canopy.'],
+            'Exact Synonyms': [np.nan, np.nan, np.nan, 'leaf N|foliar nitrogen', np.nan],
+            'has_units': ['A BERVO:has_unit SPLIT=|', 'oC', 'K', 'gN m-2', 'm'],
+        })
+
+    def test_char_ngrams(self):
+        """Test trigrams are taken per word with boundary padding."""
+        self.assertEqual(char_ngrams("N-fix N"), {' n ': 2, ' fi': 1, 'fix': 1, 'ix ': 1})
+        self.assertEqual(char_ngrams(np.nan), {})
+        self.assertEqual(normalize_unit(" g m^-2 "), 'gm-2')
+        self.assertEqual(normalize_unit("none"), '')
+
+    def test_search_bervo_terms(self):
+        """Test that EcoSIM long names find their BERVO terms."""
+        self.assertEqual(len(self.index), len(self.bervo) - 1)
+        queries = [
+            ("hourly air temperature", "oC", "BERVO:0001345"),
+            ("windspeed measurement height", "m", "BERVO:0000675"),
+            ("Total precipitation", "mm", "BERVO:0000309"),
+        ]
+        for text, unit, expected in queries:
+            with self.subTest(text=text):
+                results = self.index.search(text, unit, k=3)
+                self.assertEqual(len(results), 3)
+                self.assertEqual(results[0][0], expected)
+                self.assertEqual([score for _, _, score in results],
+                                 sorted((score for _, _, score in results), reverse=True))
+
+        # The more general 'Clumping' term may rank first
+        results = self.index.search("initial clumping factor", "none", k=3)
+        self.assertIn("BERVO:0000832", [term_id for term_id, _, _ in results])
+
+    def test_search_uses_posting_lists(self):
+        """Test that only terms sharing a trigram with the query are scored."""
+        index = BervoTermIndex(self.small)
+        self.assertEqual(len(index), 4)
+        results = index.search("foliar nitrogen", k=10)
+        self.assertEqual([term_id for term_id, _, _ in results], ['BERVO:3'])
+        self.assertEqual(results[0][1], 'Leaf nitrogen content')
+        self.assertEqual(index.search("xyz"), [])
+        self.assertEqual(index.search(""), [])
+
+        # Trigrams in more than max_df of the terms are not indexed
+        self.assertNotIn(' of', index.postings)
+        self.assertIn(' of', BervoTermIndex(self.small, max_df=1.0).postings)
+
+    def test_unit_breaks_ties(self):
+        """Test that a matching unit ranks an otherwise equal term first."""
+        index = BervoTermIndex(self.small)
+        self.assertEqual([r[0] for r in index.search("soil temperature", k=2)], ['BERVO:1', 'BERVO:2'])
+        self.assertEqual([r[0] for r in index.search("soil temperature", "K", k=2)], ['BERVO:2', 'BERVO:1'])
+
+    def test_suggest(self):
+        """Test suggestions for a variable table, searching repeated queries once."""
+        index = BervoTermIndex(self.small)
+        netcdf = pd.DataFrame({
+            'variable-name': ['TKS', 'TKS2', 'ZC', 'XYZ'],
+            'variable-long_name': ['soil temperature', 'soil temperature', 'canopy height', np.nan],
+            'variable-unit': ['K', 'K', 'm', np.nan],
+        }, index=[5, 6, 7, 8])
+        with patch.object(index, 'search', wraps=index.search) as search:
+            suggestions = index.suggest(netcdf, k=2)
+        self.assertEqual(search.call_count, 3)
+        self.assertEqual(suggestions.index.tolist(), [5, 6, 7, 8])
+        self.assertEqual(suggestions.loc[5, 'BERVO_suggested_IDs'], 'BERVO:2|BERVO:1')
+        self.assertEqual(suggestions.loc[7, 'BERVO_suggested_labels'], 'Canopy height')
+        self.assertEqual(suggestions.loc[8, 'BERVO_suggested_IDs'], '')
+        self.assertEqual(len(suggestions.loc[5, 'BERVO_suggested_scores'].split('|')), 2)
+
+    def test_unmatched_report_suggestions(self):
+        """Test that the unmatched report lists candidate terms."""
+        netcdf = pd.DataFrame({
+            'source_file': ['grid.nc', 'grid.nc'],
+            'variable-name': ['TMPH', 'ZC'],
+            'variable-long_name': ['hourly air temperature', 'canopy height'],
+            'variable-unit': ['oC', 'm'],
+        })
+        bervo = self.small.assign(**{'EcoSIM Variable Name': [np.nan, 'TMPH', np.nan, np.nan, np.nan]})
+        aligned = align_variables(netcdf, bervo)
+
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            report_file = temp_dir / "unmatched.tsv"
+            generate_unmatched_report(aligned, report_file, bervo, top_k=1)
+            report = pd.read_csv(report_file, sep='\t')
+            self.assertEqual(report['variable-name'].tolist(), ['ZC'])
+            self.assertEqual(report['BERVO_suggested_IDs'].tolist(), ['BERVO:4'])
+
+            generate_unmatched_report(aligned, report_file)
+            self.assertNotIn('BERVO_suggested_IDs', pd.read_csv(report_file, sep='\t').columns)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+"""
+Tests for the CDL to NetCDF compiler.
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import xarray as xr
+from scipy.io import netcdf_file
+
+# Add scripts directory to path for importing
+scripts_dir = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+import cdl_to_netcdf
+from cdl_to_netcdf import compile_cdl, parse_cdl
+
+NC_DIR = Path(__file__).parent.parent / "hackathon-case_study-experimental_warming_nitrogen" / "ecosim-inputs-netcdf"
+
+SAMPLE_CDL = r"""netcdf sample {
+dimensions:
+	x = 3 ;
+	nchar = 4 ;
+	year = UNLIMITED ; // (2 currently)
+variables:
+	float depth(x) ;
+		depth:long_name = "layer depth" ;
+		depth:_FillValue = -999.9 ;
+	short flags(x) ;
+		flags:valid_range = 0s, 10s ;
+	char names(x, nchar) ;
+	int year(year) ;
+	char mgmt(year, nchar) ;
+	double scalar ;
+		scalar:scale = 0.5, 2 ;
+	byte unset(x) ;
+
+// global attributes:
+		:description = "line one\n",
+			"line two" ;
+		:version = 3 ;
+data:
+
+ depth = 0.1, _, 0.3 ;
+
+ flags = 1, 2, 3 ;
+
+ names = "ab", "cdef", "g" ;
+
+ year = 2001, 2002 ;
+
+ mgmt = "NO", "abcd" ;
+
+ scalar = 1.5 ;
+}
+"""
+
+
+class TestCdlToNetcdf(unittest.TestCase):
+    """Test cases for parse_cdl and compile_cdl."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache_dir = self.temp_dir / "cache"
+        self.cdl_file = self.temp_dir / "sample.nc.cdl"
+        self.cdl_file.write_text(SAMPLE_CDL)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_parse_cdl(self):
+        """Test parsing dimensions, variables, attributes and data."""
+        dataset = parse_cdl(SAMPLE_CDL)
+        self.assertEqual(dataset['name'], 'sample')
+        self.assertEqual(dataset['dimensions'], {'x': 3, 'nchar': 4, 'year': None})
+        self.assertEqual(dataset['attributes']['description'], ['line one\n', 'line two'])
+
+        depth = dataset['variables']['depth']
+        self.assertEqual(depth['type'], 'float')
+        self.assertEqual(depth['dimensions'], ('x',))
+        self.assertEqual(depth['data'], [(0.1, None), None, (0.3, None)])
+        self.assertEqual(dataset['variables']['scalar']['dimensions'], ())
+        self.assertIsNone(dataset['variables']['unset']['data'])
+
+    def test_compile_cdl(self):
+        """Test the written types, attributes, fills and character padding."""
+        nc_file = compile_cdl(self.cdl_file, cache_dir=None)
+        self.assertEqual(nc_file, self.temp_dir / "sample.nc")
+
+        with netcdf_file(nc_file, 'r', mmap=False) as f:
+            self.assertEqual(f.version_byte, 1)
+            self.assertEqual(f.dimensions, {'x': 3, 'nchar': 4, 'year': None})
+            self.assertEqual(f.description, b'line one\nline two')
+            self.assertEqual(f.version.dtype.str[1:], 'i4')
+
+            depth = f.variables['depth']
+            self.assertEqual(depth.typecode(), 'f')
+            self.assertEqual(depth._FillValue.dtype.str[1:], 'f4')
+            np.testing.assert_allclose(depth[:], np.array([0.1, -999.9, 0.3], dtype='f4'))
+            self.assertEqual(f.variables['flags'].valid_range.dtype.str[1:], 'i2')
+            self.assertEqual(f.variables['scalar'].scale.dtype.str[1:], 'f8')
+            self.assertEqual(f.variables['scalar'].getValue(), 1.5)
+            self.assertEqual(f.variables['unset'][:].tolist(), [-127] * 3)
+
+            names = f.variables['names'][:]
+            self.assertEqual([row.tobytes() for row in names], [b'ab\0\0', b'cdef', b'g\0\0\0'])
+            self.assertEqual(f.variables['year'][:].tolist(), [2001, 2002])
+            self.assertEqual([row.tobytes() for row in f.variables['mgmt'][:]], [b'NO\0\0', b'abcd'])
+
+        ds = xr.open_dataset(nc_file, engine='scipy')
+        self.assertTrue(np.isnan(ds['depth'].values[1]))
+        self.assertEqual(ds['names'].values.tolist(), [b'ab', b'cdef', b'g'])
+        ds.close()
+
+    def test_ecosim_inputs_match_committed_netcdf(self):
+        """Test that the EcoSIM CDLs compile to the same bytes as ncgen."""
+        for name in ["Blodget_grid_20240622.nc", "ecosim_pftpar_20240723.nc"]:
+            nc_file = compile_cdl(NC_DIR / f"{name}.cdl", self.temp_dir / name, cache_dir=None)
+            self.assertEqual(nc_file.read_bytes(), (NC_DIR / name).read_bytes())
+
+        nc_file = compile_cdl(NC_DIR / "crop-ne3_soilmgmt_20250602.nc.cdl",
+                              self.temp_dir / "soilmgmt.nc", cache_dir=None)
+        with xr.open_dataset(nc_file, engine='scipy') as ds:
+            self.assertEqual(ds['year'].values.tolist(), list(range(2001, 2013)))
+            self.assertEqual(ds['fertf'].values[0, 0].strip(), b'me2001f')
+
+        # A scalar next to record variables
+        nc_file = compile_cdl(NC_DIR / "Blodget_pft_20240622.ENF.nc.cdl",
+                              self.temp_dir / "pft.nc", cache_dir=None)
+        with xr.open_dataset(nc_file, engine='scipy') as ds:
+            self.assertEqual(ds.sizes['year'], 2)
+            self.assertEqual(int(ds['pft_dflag']), 0)
+
+    def test_cache(self):
+        """Test that identical CDL content is compiled once."""
+        first = compile_cdl(self.cdl_file, self.temp_dir / "first.nc", cache_dir=self.cache_dir)
+        self.assertEqual(len(list(self.cache_dir.glob("*.nc"))), 1)
+
+        copy = self.temp_dir / "copy.nc.cdl"
+        shutil.copy(self.cdl_file, copy)
+        with patch.object(cdl_to_netcdf, 'parse_cdl') as parse:
+            second = compile_cdl(copy, cache_dir=self.cache_dir)
+        parse.assert_not_called()
+        self.assertEqual(second.read_bytes(), first.read_bytes())
+
+        # Changed content and output format get their own entries
+        self.cdl_file.write_text(SAMPLE_CDL.replace("2001", "2000"))
+        compile_cdl(self.cdl_file, cache_dir=self.cache_dir)
+        compile_cdl(self.cdl_file, cache_dir=self.cache_dir, version=2)
+        self.assertEqual(len(list(self.cache_dir.glob("*.nc"))), 3)
+        self.assertEqual(list(self.cache_dir.glob("*.part")), [])
+
+    def test_invalid_cdl(self):
+        """Test syntax errors and features that need NetCDF4."""
+        invalid = [
+            "netcdf x { dimensions: n = 2 ; variables: string s(n) ; }",
+            "netcdf x { dimensions: n = 2 ; variables: float v(m) ; }",
+            "netcdf x { dimensions: n = 2 ; variables: float v(n) ; data: v = 1, 2, 3 ; }",
+            "netcdf x { dimensions: n = 2 ; variables: float v(n) ; data: w = 1 ; }",
+            "netcdf x { dimensions: n = 2 ; variables: float v(n) ; v:a = 1 2 ; }",
+            "netcdf x { types: }",
+            "netcdf x { dimensions: n = 2 ; $ }",
+        ]
+        for text in invalid:
+            self.cdl_file.write_text(text)
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                compile_cdl(self.cdl_file, cache_dir=self.cache_dir)
+        self.assertEqual(list(self.cache_dir.glob("*")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+"""
+Tests for NetCDF metadata extraction.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from scipy.io import netcdf_file
+
+# Add scripts directory to path for importing
+scripts_dir = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+import extract_netcdf_metadata
+from align_netcdf_vars_with_bervo import load_netcdf_vars
+from extract_netcdf_metadata import (
+    build_catalog, extract_metadata, process_netcdf_file, read_catalog, read_netcdf3_header,
+    read_netcdf_header
+)
+
+NC_DIR = Path(__file__).parent.parent / "hackathon-case_study-experimental_warming_nitrogen" / "ecosim-inputs-netcdf"
+
+
+def write_cf_netcdf3(path: Path) -> Path:
+    """
+    Write a NetCDF3 file exercising xarray's CF decoding rules.
+
+    Has a record dimension, a character array, packed, masked and unsigned
+    integers, a NaN fill value, times, a boolean, a scalar and a
+    'coordinates' attribute.
+    """
+    f = netcdf_file(path, 'w', version=2)
+    f.createDimension('time', None)
+    f.createDimension('x', 3)
+    f.createDimension('nchar', 5)
+    f.history = 'test'
+    f.flags = np.array([1, 2, 3], dtype='i4')
+
+    time_var = f.createVariable('time', 'f8', ('time',))
+    time_var.units = 'days since 2000-01-01'
+    time_var.calendar = 'standard'
+    time_var[:] = [0, 1]
+    lat = f.createVariable('lat', 'f4', ('x',))
+    lat[:] = [1, 2, 3]
+
+    packed = f.createVariable('packed', 'i2', ('time', 'x'))
+    packed.scale_factor = np.float32(0.1)
+    packed.add_offset = np.float32(1)
+    packed._FillValue = np.int16(-999)
+    packed.units = 'K'
+    packed.coordinates = 'lat'
+    packed[:] = np.ones((2, 3))
+
+    masked = f.createVariable('masked', 'i1', ('x',))
+    masked._FillValue = np.int8(-1)
+    masked.valid_range = np.array([0, 10], dtype='i1')
+    masked[:] = 1
+    unsigned = f.createVariable('ubyte', 'i1', ('x',))
+    unsigned._Unsigned = 'true'
+    unsigned[:] = 1
+    nanfill = f.createVariable('nanfill', 'f4', ('x',))
+    nanfill._FillValue = np.float32(np.nan)
+    nanfill[:] = 1
+    names = f.createVariable('names', 'c', ('x', 'nchar'))
+    names[:] = np.array([list('abcde')] * 3)
+    hours = f.createVariable('since_int', 'i4', ('time',))
+    hours.units = 'hours since 2000-01-01'
+    hours._FillValue = np.int32(-1)
+    hours[:] = [0, 1]
+    flag = f.createVariable('flag', 'i1', ('x',))
+    flag.dtype = 'bool'
+    flag[:] = 1
+    scalar = f.createVariable('scalar', 'f8', ())
+    scalar.long_name = 'a scalar'
+    scalar.data[...] = 3.0
+    f.close()
+    return path
+
+
+class TestHeaderMetadata(unittest.TestCase):
+    """Test cases for the header-only metadata reader."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_ecosim_inputs_match_committed_csv(self):
+        """Test that the EcoSIM input files reproduce their metadata CSVs."""
+        nc_files = sorted(NC_DIR.glob("*.nc"))
+        self.assertEqual(len(nc_files), 3)
+        for nc_file in nc_files:
+            self.assertEqual(extract_metadata(nc_file), extract_metadata(nc_file, engine='xarray'))
+
+            copy = self.temp_dir / nc_file.name
+            shutil.copy(nc_file, copy)
+            process_netcdf_file(copy)
+            self.assertEqual(copy.with_suffix('.metadata.csv').read_text(),
+                             nc_file.with_suffix('.metadata.csv').read_text())
+
+    def test_cf_decoding_matches_xarray(self):
+        """Test that dtypes and attributes follow xarray's CF decoding."""
+        nc_file = write_cf_netcdf3(self.temp_dir / "cf.nc")
+        metadata = extract_metadata(nc_file)
+        self.assertEqual(metadata, extract_metadata(nc_file, engine='xarray'))
+
+        by_name = {m['variable_name']: m for m in metadata}
+        self.assertNotIn('lat', by_name)
+        self.assertEqual(by_name['packed']['dtype'], 'float32')
+        self.assertNotIn('coordinates', by_name['packed'])
+        self.assertEqual(by_name['masked']['dtype'], 'float32')
+        self.assertEqual(by_name['masked']['valid_range'], '[ 0 10]')
+        self.assertEqual(by_name['ubyte']['dtype'], 'uint8')
+        self.assertEqual(by_name['names']['dtype'], '|S5')
+        self.assertEqual(by_name['names']['dimensions'], 'x')
+        self.assertEqual(by_name['since_int']['dtype'], 'datetime64[ns]')
+        self.assertEqual(by_name['flag']['dtype'], 'bool')
+        self.assertEqual(by_name['scalar']['shape'], '()')
+
+    def test_header_only(self):
+        """Test that shapes come from the header without reading the data section."""
+        nc_file = write_cf_netcdf3(self.temp_dir / "cf.nc")
+        with open(nc_file, 'r+b') as f:
+            f.seek(4)
+            f.write((1_000_000).to_bytes(4, 'big'))
+
+        header = read_netcdf_header(nc_file)
+        self.assertEqual(header['dimensions'], {'time': 1_000_000, 'x': 3, 'nchar': 5})
+        self.assertEqual(header['attributes']['history'], b'test')
+        self.assertEqual(header['variables']['packed']['shape'], (1_000_000, 3))
+        self.assertEqual(header['variables']['packed']['dtype'], np.dtype('int16'))
+
+        # Streaming files take the record count from the file size
+        with open(nc_file, 'r+b') as f:
+            f.seek(4)
+            f.write(b'\xff\xff\xff\xff')
+        self.assertEqual(read_netcdf3_header(nc_file)['dimensions']['time'], 2)
+
+    def test_netcdf4(self):
+        """Test NetCDF4 (HDF5) files read through h5netcdf."""
+        if extract_netcdf_metadata.h5py is None:
+            self.skipTest("h5py not installed")
+        ds = xr.Dataset(
+            {
+                'v': (('t', 'x'), np.zeros((2, 3)), {'long_name': 'v'}),
+                's': (('x',), np.array(['a', 'bb', 'c'], dtype=object)),
+                'f': (('x',), np.array([1, np.nan, 3])),
+            },
+            coords={'t': pd.date_range('2000', periods=2), 'lat': (('x',), [1.0, 2, 3])},
+        )
+        ds.v.encoding = {'_FillValue': -1, 'scale_factor': 0.5, 'dtype': 'int16'}
+        nc_file = self.temp_dir / "cf4.nc"
+        ds.to_netcdf(nc_file, engine='h5netcdf')
+
+        metadata = extract_metadata(nc_file)
+        self.assertEqual(metadata, extract_metadata(nc_file, engine='xarray'))
+        self.assertEqual([m['variable_name'] for m in metadata], ['v', 's', 'f'])
+
+    def test_invalid_input(self):
+        """Test unrecognized files and engines."""
+        text_file = self.temp_dir / "not_netcdf.nc"
+        text_file.write_text("netcdf example {}")
+        with self.assertRaises(ValueError):
+            extract_metadata(text_file)
+        with self.assertRaises(ValueError):
+            extract_metadata(NC_DIR / "Blodget_grid_20240622.nc", engine='netcdf4')
+
+
+class TestBuildCatalog(unittest.TestCase):
+    """Test cases for batch extraction into a consolidated catalog."""
+
+    def setUp(self):
+        """Copy the EcoSIM input files into a nested directory."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.nc_dir = self.temp_dir / "inputs"
+        (self.nc_dir / "site").mkdir(parents=True)
+        for nc_file in NC_DIR.glob("*.nc"):
+            shutil.copy(nc_file, self.nc_dir / "site" / nc_file.name)
+        self.catalog_path = self.temp_dir / "catalog.tsv"
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_build_catalog(self):
+        """Test a parallel run over a directory tree."""
+        catalog = build_catalog([self.nc_dir], self.catalog_path, max_workers=2)
+        self.assertEqual(list(catalog.columns), extract_netcdf_metadata.CATALOG_COLUMNS)
+        self.assertEqual(catalog['file'].map(lambda f: Path(f).name).unique().tolist(),
+                         ['Blodget.clim.2012-2022.nc', 'Blodget_grid_20240622.nc',
+                          'ecosim_pftpar_20240723.nc'])
+
+        # Data variables match the per-file metadata; coordinates are flagged
+        grid_file = (self.nc_dir / "site" / "Blodget_grid_20240622.nc").as_posix()
+        grid = catalog[catalog['file'] == grid_file]
+        expected = extract_metadata(Path(grid_file))
+        self.assertEqual(grid['variable'].tolist(), [m['variable_name'] for m in expected])
+        self.assertEqual(catalog.loc[catalog['coordinate'], 'variable'].tolist(), ['year'])
+
+        pd.testing.assert_frame_equal(read_catalog(self.catalog_path), catalog)
+
+    def test_unchanged_files_are_skipped(self):
+        """Test that only new or modified files are read again."""
+        first = build_catalog([self.nc_dir], self.catalog_path, max_workers=1)
+
+        grid_file = self.nc_dir / "site" / "Blodget_grid_20240622.nc"
+        os.utime(grid_file, ns=(0, 0))
+        with patch.object(extract_netcdf_metadata, 'catalog_records',
+                          wraps=extract_netcdf_metadata.catalog_records) as records:
+            second = build_catalog([self.nc_dir], self.catalog_path, max_workers=1)
+        self.assertEqual(records.call_args_list, [unittest.mock.call(grid_file)])
+        pd.testing.assert_frame_equal(second, first)
+
+        with patch.object(extract_netcdf_metadata, 'catalog_records',
+                          wraps=extract_netcdf_metadata.catalog_records) as records:
+            build_catalog([self.nc_dir], self.catalog_path, max_workers=1, force=True)
+        self.assertEqual(records.call_count, 3)
+
+    def test_unreadable_file(self):
+        """Test that a file that cannot be read is reported and left out."""
+        (self.nc_dir / "broken.nc").write_text("not netcdf")
+        catalog = build_catalog([self.nc_dir], self.catalog_path, max_workers=1)
+        self.assertFalse(catalog['file'].str.endswith('broken.nc').any())
+        manifest = json.loads(self.catalog_path.with_name("catalog.tsv.manifest.json").read_text())
+        self.assertEqual(len(manifest), 3)
+
+    def test_parquet_catalog(self):
+        """Test writing the catalog as Parquet."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+        parquet_path = self.temp_dir / "catalog.parquet"
+        catalog = build_catalog([self.nc_dir], parquet_path, max_workers=1)
+        pd.testing.assert_frame_equal(read_catalog(parquet_path), catalog, check_dtype=False)
+
+    def test_align_reads_catalog(self):
+        """Test that the BERVO alignment loads a catalog directly."""
+        build_catalog([self.nc_dir], self.catalog_path, max_workers=1)
+        netcdf_vars = load_netcdf_vars(self.catalog_path)
+        row = netcdf_vars[netcdf_vars['variable-name'] == 'Z0G'].iloc[0]
+        self.assertEqual(row['source_file'], 'Blodget.clim.2012-2022.nc')
+        self.assertEqual(row['variable-shape'], 'year,ngrid')
+        self.assertEqual(row['variable-long_name'], 'windspeed measurement height')
+        self.assertEqual(row['variable-unit'], 'm')
+        self.assertIn('variable-flags', netcdf_vars.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
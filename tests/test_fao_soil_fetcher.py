@@ -6,8 +6,12 @@ This module provides comprehensive tests for the fetch_fao_soil_database module,
 including unit tests and integration tests.
 """
 
+import hashlib
 import tempfile
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import Mock, patch
 import sys
@@ -17,7 +21,165 @@ import os
 scripts_dir = Path(__file__).parent.parent / "scripts"
 sys.path.insert(0, str(scripts_dir))
 
-from fetch_fao_soil_database import HWSDFetcher, HWSD_DATABASE_URL, HWSD_RASTER_URL
+import numpy as np
+import pandas as pd
+import rasterio
+from rasterio.transform import from_origin
+
+from fetch_fao_soil_database import (
+    HWSDFetcher, HWSD_DATABASE_URL, HWSD_RASTER_URL, _cast_column, _column_alias, pixels_to_frame
+)
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def write_test_bil(path: Path, data: np.ndarray, nodata: int = 65535) -> Path:
+    """
+    Write a small georeferenced BIL raster (with .hdr) for processing tests.
+    
+    Args:
+        path: Output .bil path
+        data: 2-D uint16 array of mapping unit codes
+        nodata: NoData value recorded in the header
+        
+    Returns:
+        Path to the written raster
+    """
+    profile = {
+        'driver': 'EHdr', 'dtype': 'uint16', 'count': 1, 'nodata': nodata,
+        'height': data.shape[0], 'width': data.shape[1], 'crs': 'EPSG:4326',
+        'transform': from_origin(-10.0, 5.0, 0.5, 0.5),
+    }
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(data.astype(np.uint16), 1)
+    return path
+
+
+def loop_pixels_to_frame(bil_path: Path, step: int = 1) -> pd.DataFrame:
+    """Reference per-pixel conversion, as process_bil_to_csv originally did it."""
+    with rasterio.open(bil_path) as src:
+        data = src.read(1)
+        records = []
+        for row in range(0, src.height, step):
+            for col in range(0, src.width, step):
+                value = int(data[row, col])
+                if src.nodata is not None and value == src.nodata:
+                    continue
+                x, y = rasterio.transform.xy(src.transform, row, col)
+                records.append((x, y, value))
+    return pd.DataFrame(records, columns=['longitude', 'latitude', 'soil_mapping_unit'])
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serve in-memory files with HTTP Range support, like the FAO S3 bucket.
+    
+    The server attributes control its behaviour: files maps paths to bytes,
+    fail_after maps a path to a byte count after which the next response for
+    it is cut off, ranges=False ignores Range headers, content_range=False
+    leaves the resource size out of 416 responses, and delay slows each
+    response. Requests (HEAD requests with 'HEAD' as the range) and the peak
+    number of concurrent requests are recorded.
+    """
+    
+    def do_HEAD(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, 'HEAD'))
+        content = server.files.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+    
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get('Range')))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            content = server.files.get(self.path)
+            if content is None:
+                self.send_error(404)
+                return
+            
+            start = 0
+            range_header = self.headers.get('Range')
+            if range_header and server.ranges:
+                start = int(range_header.split('=')[1].rstrip('-'))
+                if start >= len(content):
+                    self.send_response(416)
+                    if server.content_range:
+                        self.send_header('Content-Range', f'bytes */{len(content)}')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{len(content) - 1}/{len(content)}')
+            else:
+                self.send_response(200)
+            body = content[start:]
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            
+            limit = server.fail_after.pop(self.path, None)
+            self.wfile.write(body if limit is None else body[:limit])
+        finally:
+            with server.lock:
+                server.active -= 1
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_test_server(files: dict[str, bytes]) -> ThreadingHTTPServer:
+    """Start a local RangeRequestHandler server in a background thread."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RangeRequestHandler)
+    server.files = files
+    server.fail_after = {}
+    server.ranges = True
+    server.content_range = True
+    server.delay = 0.0
+    server.requests = []
+    server.active = 0
+    server.max_active = 0
+    server.lock = threading.Lock()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+FAKE_MDB_TOOL = """#!{python}
+# Stand-in for mdb-tools: the ".mdb" is a JSON file mapping table names to CSV text
+import json, sys
+tool = sys.argv[0].rsplit('/', 1)[-1]
+if tool == 'mdb-ver':
+    sys.exit(0)
+tables = json.load(open(sys.argv[-1] if tool == 'mdb-tables' else sys.argv[1]))
+if tool == 'mdb-tables':
+    print('\\n'.join(tables))
+elif sys.argv[2] not in tables:
+    sys.exit('Unknown table ' + sys.argv[2])
+else:
+    sys.stdout.write(tables[sys.argv[2]])
+"""
+
+
+def install_fake_mdb_tools(bin_dir: Path) -> None:
+    """Write executable mdb-ver, mdb-tables and mdb-export stand-ins to bin_dir."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for tool in ['mdb-ver', 'mdb-tables', 'mdb-export']:
+        path = bin_dir / tool
+        path.write_text(FAKE_MDB_TOOL.format(python=sys.executable))
+        path.chmod(0o755)
 
 
 class TestHWSDFetcher(unittest.TestCase):
@@ -53,11 +215,11 @@ class TestHWSDFetcher(unittest.TestCase):
         self.assertTrue("HWSD" in HWSD_DATABASE_URL)
         self.assertTrue("HWSD" in HWSD_RASTER_URL)
     
-    @patch('fetch_fao_soil_database.urlretrieve')
-    def test_download_file(self, mock_urlretrieve):
+    @patch('fetch_fao_soil_database.urlopen')
+    def test_download_file(self, mock_urlopen):
         """Test file download functionality."""
         # Mock successful download
-        mock_urlretrieve.return_value = None
+        mock_urlopen.return_value = None
         
         # Create a mock file to simulate download
         test_file = Path(self.temp_dir) / "test_file.zip"
@@ -78,12 +240,12 @@ class TestHWSDFetcher(unittest.TestCase):
         test_file = Path(self.temp_dir) / "existing_file.zip"
         test_file.write_text("existing content")
         
-        with patch('fetch_fao_soil_database.urlretrieve') as mock_urlretrieve:
+        with patch('fetch_fao_soil_database.urlopen') as mock_urlopen:
             result = self.fetcher.download_file("https://example.com/test.zip", "existing_file.zip")
             
             # Should return existing file without downloading
             self.assertEqual(result, test_file)
-            mock_urlretrieve.assert_not_called()
+            mock_urlopen.assert_not_called()
     
     def test_verify_checksum(self):
         """Test checksum verification."""
@@ -165,6 +327,45 @@ class TestHWSDFetcher(unittest.TestCase):
         self.assertEqual((extract_dir / "file1.txt").read_text(), "content1")
         self.assertEqual((extract_dir / "subdir" / "file2.txt").read_text(), "content2")
     
+    def test_extract_zip_members_and_skip(self):
+        """Test member filters and skipping members already extracted."""
+        import zipfile
+        zip_path = Path(self.temp_dir) / "HWSD2_RASTER.zip"
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("HWSD2_RASTER/HWSD2.bil", b"\x01\x00" * 1000)
+            zf.writestr("HWSD2_RASTER/HWSD2.hdr", "NROWS 10\n")
+            zf.writestr("HWSD2_RASTER/readme.pdf", "docs")
+        
+        extract_dir = self.fetcher.extract_zip(zip_path, members=["*.bil", "HWSD2.hdr"])
+        self.assertEqual(sorted(p.name for p in extract_dir.rglob("*") if p.is_file()),
+                         ["HWSD2.bil", "HWSD2.hdr"])
+        
+        hdr = extract_dir / "HWSD2_RASTER" / "HWSD2.hdr"
+        hdr.write_text("NROWS 99\n")  # same size, different CRC
+        with patch.object(zipfile.ZipFile, 'extract', autospec=True,
+                          side_effect=zipfile.ZipFile.extract) as extract:
+            self.fetcher.extract_zip(zip_path, members=["*.bil", "HWSD2.hdr"])
+            self.assertEqual([call.args[1].filename for call in extract.call_args_list],
+                             ["HWSD2_RASTER/HWSD2.hdr"])
+        self.assertEqual(hdr.read_text(), "NROWS 10\n")
+    
+    def test_open_zip_member(self):
+        """Test streaming members straight from the archive."""
+        import zipfile
+        zip_path = Path(self.temp_dir) / "HWSD2_DB.zip"
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("HWSD2_DB/D_AWC.csv", "MU_GLOBAL,AWC\n1,0.5\n2,0.7\n")
+            zf.writestr("HWSD2_DB/notes.txt", "notes")
+        
+        with self.fetcher.open_zip_member(zip_path, "HWSD2_DB/notes.txt") as f:
+            self.assertEqual(f.read(), b"notes")
+        df = self.fetcher.read_zip_csv(zip_path, "D_AWC.csv")
+        self.assertEqual(df['AWC'].tolist(), [0.5, 0.7])
+        self.assertFalse((Path(self.temp_dir) / "HWSD2_DB").exists())
+        
+        with self.assertRaises(FileNotFoundError):
+            self.fetcher.open_zip_member(zip_path, "*.mdb")
+    
     def test_get_database_info(self):
         """Test getting database information."""
         # Create some test files to simulate a populated data directory
@@ -279,6 +480,7 @@ class TestHWSDFetcher(unittest.TestCase):
         mock_cursor.execute.side_effect = [
             None,  # SELECT name FROM sqlite_master 
             None,  # PRAGMA table_info
+            None,  # SELECT 1 (table has rows)
             None   # SELECT query
         ]
         mock_cursor.fetchall.side_effect = [
@@ -286,6 +488,7 @@ class TestHWSDFetcher(unittest.TestCase):
             [('cid', 'MU_GLOBAL', 'INTEGER'), ('cid', 'SOC', 'REAL')],  # Column info
             []  # Query result
         ]
+        mock_cursor.fetchone.return_value = (3, 1, 2)  # Row count and storage classes
         
         mock_sqlite3.connect.return_value = mock_conn
         
@@ -320,6 +523,610 @@ class TestHWSDFetcher(unittest.TestCase):
             mock_sqlite3.connect.assert_called_with(db_file)
 
 
+def create_test_sqlite(path: Path) -> Path:
+    """
+    Create a small soil property database in the layout of a converted HWSD .mdb.
+    
+    D_AWC has one row per mapping unit, D_TEXTURE two rows for some units
+    (one-to-many) and HWSD_META no mapping unit column.
+    """
+    import sqlite3
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE D_AWC (MU_GLOBAL INTEGER, AWC REAL)")
+    conn.executemany("INSERT INTO D_AWC VALUES (?, ?)", [(mu, mu / 10) for mu in range(1, 300)])
+    conn.execute("CREATE TABLE D_TEXTURE (MU_GLOBAL INTEGER, SAND REAL, CLAY REAL)")
+    conn.executemany("INSERT INTO D_TEXTURE VALUES (?, ?, ?)",
+                     [(mu, 40.0 + i, 20.0) for mu in range(100, 500) for i in range(2)])
+    conn.execute("CREATE TABLE HWSD_META (NAME TEXT, VERSION TEXT)")
+    conn.execute("INSERT INTO HWSD_META VALUES ('HWSD', '2.0')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestMdbConversion(unittest.TestCase):
+    """Test cases for MDB conversion using stand-in mdb-tools executables."""
+    
+    def setUp(self):
+        """Install fake mdb-tools on PATH and write a fake database."""
+        import json
+        self.temp_dir = tempfile.mkdtemp()
+        self.fetcher = HWSDFetcher(data_dir=self.temp_dir)
+        bin_dir = Path(self.temp_dir) / "bin"
+        install_fake_mdb_tools(bin_dir)
+        path_patch = patch.dict(os.environ, {'PATH': f"{bin_dir}{os.pathsep}{os.environ['PATH']}"})
+        path_patch.start()
+        self.addCleanup(path_patch.stop)
+        
+        big_rows = "".join(f"{i},{i / 10},{'ABC'[i % 3]}\n" for i in range(1, 2501))
+        self.tables = {
+            'D_AWC': "MU_GLOBAL,AWC,NAME\n" + big_rows,
+            'D_TEXTURE': 'MU_GLOBAL,SAND,CLAY\n1,40.5,\n2,,20.0\n',
+            'HWSD_META': 'NAME,VERSION\n"HWSD, v2",2.0\n',
+            'EMPTY': '',
+        }
+        self.mdb_path = Path(self.temp_dir) / "HWSD2.mdb"
+        self.mdb_path.write_text(json.dumps(self.tables))
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_convert_mdb_to_sqlite(self):
+        """Test concurrent export with chunked parsing into one SQLite writer."""
+        import sqlite3
+        db_path = self.fetcher.convert_mdb_to_sqlite(self.mdb_path, max_workers=2, chunksize=1000)
+        conn = sqlite3.connect(db_path)
+        self.assertEqual(conn.execute("SELECT COUNT(*), SUM(MU_GLOBAL) FROM D_AWC").fetchone(),
+                         (2500, 2500 * 2501 // 2))
+        self.assertEqual(conn.execute("SELECT AWC, NAME FROM D_AWC WHERE MU_GLOBAL = 25").fetchone(),
+                         (2.5, 'B'))
+        self.assertEqual(conn.execute("SELECT SAND, CLAY FROM D_TEXTURE ORDER BY MU_GLOBAL").fetchall(),
+                         [(40.5, None), (None, 20.0)])
+        self.assertEqual(conn.execute("SELECT NAME FROM HWSD_META").fetchone(), ('HWSD, v2',))
+        conn.close()
+    
+    def test_convert_mdb_to_sqlite_failed_table(self):
+        """Test that a failing table is reported and does not stop the others."""
+        with patch.object(HWSDFetcher, '_mdb_table_names', return_value=['D_AWC', 'MISSING']):
+            db_path = self.fetcher.convert_mdb_to_sqlite(self.mdb_path, chunksize=500)
+        import sqlite3
+        conn = sqlite3.connect(db_path)
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")]
+        counts = conn.execute("SELECT * FROM _row_counts").fetchall()
+        conn.close()
+        self.assertEqual(tables, ['D_AWC', '_row_counts'])
+        self.assertEqual(counts, [('D_AWC', 2500)])
+    
+    def test_convert_mdb_to_sqlite_types_and_indexes(self):
+        """Test inferred column types, mapping unit indexes and row counts."""
+        import sqlite3
+        db_path = self.fetcher.convert_mdb_to_sqlite(self.mdb_path, chunksize=1000)
+        conn = sqlite3.connect(db_path)
+        types = {table: {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+                 for table in ['D_AWC', 'D_TEXTURE', 'HWSD_META']}
+        self.assertEqual(types['D_AWC'], {'MU_GLOBAL': 'INTEGER', 'AWC': 'REAL', 'NAME': 'TEXT'})
+        # CLAY only holds whole numbers and is stored as INTEGER
+        self.assertEqual(types['D_TEXTURE'], {'MU_GLOBAL': 'INTEGER', 'SAND': 'REAL', 'CLAY': 'INTEGER'})
+        self.assertEqual(types['HWSD_META'], {'NAME': 'TEXT', 'VERSION': 'INTEGER'})
+        
+        indexes = conn.execute(
+            "SELECT tbl_name, name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%' ORDER BY 1"
+        ).fetchall()
+        self.assertEqual(indexes, [('D_AWC', 'idx_D_AWC_MU_GLOBAL'), ('D_TEXTURE', 'idx_D_TEXTURE_MU_GLOBAL')])
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT AWC FROM D_AWC WHERE MU_GLOBAL = 7").fetchall()
+        self.assertIn('idx_D_AWC_MU_GLOBAL', plan[0][-1])
+        
+        self.assertEqual(dict(conn.execute("SELECT * FROM _row_counts").fetchall()),
+                         {'D_AWC': 2500, 'D_TEXTURE': 2, 'HWSD_META': 1})
+        self.assertEqual(conn.execute("PRAGMA page_size").fetchone(), (65536,))
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone(), ('wal',))
+        conn.close()
+    
+    def test_convert_mdb_to_sqlite_join(self):
+        """Test that joins against a converted database use indexed lookups."""
+        db_path = self.fetcher.convert_mdb_to_sqlite(self.mdb_path)
+        plan = self.fetcher.get_join_plan(db_path)
+        self.assertCountEqual([entry['table'] for entry in plan['tables']], ['D_AWC', 'D_TEXTURE'])
+        
+        units = self.fetcher.build_unit_attributes(np.array([2, 1, 9999]), db_path)
+        self.assertEqual(units['soil_mapping_unit'].tolist(), [2, 1, 9999])
+        self.assertEqual(units['d_awc_awc_percent'].tolist()[:2], [0.2, 0.1])
+        self.assertEqual(units['d_texture_clay_percent'].iloc[0], 20)
+        self.assertTrue(units.iloc[2, 1:].isna().all())
+    
+    def test_convert_mdb_to_sqlite_widens_types_between_chunks(self):
+        """Test that a column type inferred from an early chunk widens for later chunks."""
+        import json
+        import sqlite3
+        self.tables = {'D_AWC': "MU_GLOBAL,AWC,NOTE,EXTRA\n1,1.0,2,\n2,2.0,3,\n3,0.5,none given,7\n4,,4,\n"}
+        self.mdb_path.write_text(json.dumps(self.tables))
+        db_path = self.fetcher.convert_mdb_to_sqlite(self.mdb_path, chunksize=2)
+        conn = sqlite3.connect(db_path)
+        types = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(D_AWC)")}
+        self.assertEqual(types, {'MU_GLOBAL': 'INTEGER', 'AWC': 'REAL', 'NOTE': 'TEXT', 'EXTRA': 'INTEGER'})
+        self.assertEqual(conn.execute("SELECT AWC, NOTE, EXTRA FROM D_AWC ORDER BY MU_GLOBAL").fetchall(),
+                         [(1.0, '2', None), (2.0, '3', None), (0.5, 'none given', 7), (None, '4', None)])
+        conn.close()
+        
+        units = self.fetcher.build_unit_attributes(np.array([3, 1]), db_path)
+        self.assertEqual(units['d_awc_awc_percent'].tolist(), [0.5, 1.0])
+        self.assertEqual(units['d_awc_note_units_unknown'].tolist(), ['none given', '2'])
+    
+    def test_export_tables_to_csv(self):
+        """Test concurrent export straight to CSV files."""
+        csv_dir = self.fetcher.export_tables_to_csv(self.mdb_path, max_workers=3)
+        self.assertEqual(sorted(p.name for p in csv_dir.iterdir()),
+                         ['D_AWC.csv', 'D_TEXTURE.csv', 'EMPTY.csv', 'HWSD_META.csv'])
+        self.assertEqual((csv_dir / 'D_TEXTURE.csv').read_text(), self.tables['D_TEXTURE'])
+        self.assertEqual(len(pd.read_csv(csv_dir / 'D_AWC.csv')), 2500)
+
+
+class TestDownloads(unittest.TestCase):
+    """Test cases for downloads against a local HTTP server."""
+    
+    def setUp(self):
+        """Serve three artifacts locally and point a fetcher at them."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = {
+            '/HWSD2_DB.zip': os.urandom(300_000),
+            '/HWSD2_RASTER.zip': os.urandom(1_000_000),
+            '/cc3823en.pdf': os.urandom(50_000),
+        }
+        self.server = start_test_server(self.files)
+        self.fetcher = HWSDFetcher(data_dir=self.temp_dir, chunk_size=64 * 1024, urls={
+            'database': self.server.url + '/HWSD2_DB.zip',
+            'raster': self.server.url + '/HWSD2_RASTER.zip',
+            'documentation': self.server.url + '/cc3823en.pdf',
+        })
+    
+    def tearDown(self):
+        """Stop the server and clean up."""
+        self.server.shutdown()
+        self.server.server_close()
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_download_with_progress(self):
+        """Test chunked streaming and the progress callback."""
+        calls = []
+        path = self.fetcher.download_file(self.server.url + '/HWSD2_RASTER.zip', 'raster.zip',
+                                          progress=lambda name, done, total: calls.append((done, total)))
+        self.assertEqual(path.read_bytes(), self.files['/HWSD2_RASTER.zip'])
+        self.assertFalse(path.with_name('raster.zip.part').exists())
+        self.assertEqual(len(calls), 16)
+        self.assertEqual(calls[-1], (1_000_000, 1_000_000))
+    
+    def test_resume_from_part_file(self):
+        """Test that an interrupted download resumes with a Range request."""
+        url = self.server.url + '/HWSD2_RASTER.zip'
+        self.server.fail_after['/HWSD2_RASTER.zip'] = 400_000
+        with self.assertRaises(RuntimeError):
+            self.fetcher.download_file(url)
+        part = Path(self.temp_dir) / 'HWSD2_RASTER.zip.part'
+        self.assertEqual(part.stat().st_size, 400_000)
+        
+        path = self.fetcher.download_file(url)
+        self.assertEqual(path.read_bytes(), self.files['/HWSD2_RASTER.zip'])
+        self.assertEqual(self.server.requests[-1], ('/HWSD2_RASTER.zip', 'bytes=400000-'))
+    
+    def test_resume_complete_part_file(self):
+        """Test that a complete .part file left before its rename is not downloaded again."""
+        url = self.server.url + '/HWSD2_DB.zip'
+        content = self.files['/HWSD2_DB.zip']
+        part = Path(self.temp_dir) / 'HWSD2_DB.zip.part'
+        for content_range in [True, False]:
+            with self.subTest(content_range=content_range):
+                self.server.content_range = content_range
+                self.server.requests.clear()
+                part.write_bytes(content)
+                path = self.fetcher.download_file(url)
+                self.assertEqual(path.read_bytes(), content)
+                self.assertFalse(part.exists())
+                self.assertEqual(self.fetcher.file_checksum(path), hashlib.sha256(content).hexdigest())
+                expected = [('/HWSD2_DB.zip', f'bytes={len(content)}-')]
+                if not content_range:
+                    expected.append(('/HWSD2_DB.zip', 'HEAD'))
+                self.assertEqual(self.server.requests, expected)
+                path.unlink()
+        
+        # A part longer than the file is stale and downloaded again
+        part.write_bytes(content + b'extra')
+        self.assertEqual(self.fetcher.download_file(url).read_bytes(), content)
+    
+    def test_resume_without_range_support(self):
+        """Test that a server ignoring Range restarts the file."""
+        url = self.server.url + '/HWSD2_DB.zip'
+        (Path(self.temp_dir) / 'HWSD2_DB.zip.part').write_bytes(b'stale')
+        self.server.ranges = False
+        path = self.fetcher.download_file(url)
+        self.assertEqual(path.read_bytes(), self.files['/HWSD2_DB.zip'])
+    
+    def test_download_all_concurrent(self):
+        """Test that download_all fetches the artifacts in parallel."""
+        self.server.delay = 0.3
+        components = self.fetcher.download_all()
+        self.assertEqual(set(components), {'database', 'raster', 'documentation'})
+        self.assertEqual(components['raster'].name, 'HWSD2_RASTER.zip')
+        self.assertEqual(components['documentation'].read_bytes(), self.files['/cc3823en.pdf'])
+        self.assertEqual(self.server.max_active, 3)
+    
+    def test_checksum_recorded_while_streaming(self):
+        """Test that the manifest holds the hash of the full (resumed) file."""
+        import hashlib
+        import json
+        self.server.fail_after['/HWSD2_RASTER.zip'] = 123_457
+        with self.assertRaises(RuntimeError):
+            self.fetcher.download_raster()
+        path = self.fetcher.download_raster()
+        
+        manifest = json.loads((Path(self.temp_dir) / 'download_manifest.json').read_text())
+        entry = manifest['HWSD2_RASTER.zip']
+        self.assertEqual(entry['sha256'], hashlib.sha256(self.files['/HWSD2_RASTER.zip']).hexdigest())
+        self.assertEqual(entry['size'], 1_000_000)
+        self.assertEqual(entry['mtime_ns'], path.stat().st_mtime_ns)
+    
+    def test_verify_uses_manifest_until_file_changes(self):
+        """Test that unchanged files are verified without re-reading them."""
+        import hashlib
+        path = self.fetcher.download_database()
+        expected = hashlib.sha256(self.files['/HWSD2_DB.zip']).hexdigest()
+        
+        with patch('fetch_fao_soil_database.hashlib.file_digest') as file_digest:
+            self.assertTrue(self.fetcher.verify_checksum(path, expected))
+            file_digest.assert_not_called()
+        
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        with patch('fetch_fao_soil_database.hashlib.file_digest', wraps=hashlib.file_digest) as file_digest:
+            self.assertTrue(self.fetcher.verify_checksum(path, expected))
+            file_digest.assert_called_once()
+    
+    def test_download_all_skips_verified_files(self):
+        """Test that a populated data_dir is verified from the manifest alone."""
+        import hashlib
+        checksums = {name: hashlib.sha256(self.files['/' + name]).hexdigest()
+                     for name in ['HWSD2_DB.zip', 'HWSD2_RASTER.zip']}
+        with patch.dict('fetch_fao_soil_database.EXPECTED_CHECKSUMS', checksums):
+            self.fetcher.download_all()
+            requests = len(self.server.requests)
+            with patch('fetch_fao_soil_database.hashlib.file_digest') as file_digest:
+                self.fetcher.download_all()
+                file_digest.assert_not_called()
+        self.assertEqual(len(self.server.requests), requests)
+    
+    def test_checksum_mismatch(self):
+        """Test that a download not matching its expected checksum is rejected."""
+        with self.assertRaises(RuntimeError):
+            self.fetcher.download_file(self.server.url + '/cc3823en.pdf', expected_checksum='0' * 64)
+        self.assertFalse((Path(self.temp_dir) / 'cc3823en.pdf').exists())
+
+
+class TestRasterProcessing(unittest.TestCase):
+    """Test cases for raster to table conversion on real (small) rasters."""
+    
+    def setUp(self):
+        """Write a small BIL raster with some NoData pixels."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.fetcher = HWSDFetcher(data_dir=self.temp_dir)
+        rng = np.random.default_rng(0)
+        self.data = rng.integers(1, 500, (37, 53)).astype(np.uint16)
+        self.data[rng.random(self.data.shape) < 0.3] = 65535
+        self.bil_path = write_test_bil(Path(self.temp_dir) / "test.bil", self.data)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_pixels_to_frame(self):
+        """Test the vectorized block conversion."""
+        transform = from_origin(0.0, 2.0, 1.0, 1.0)
+        df = pixels_to_frame(np.array([[1, 9], [3, 4]]), np.array([0, 1]), np.array([0, 1]), transform, 9)
+        self.assertEqual(df['soil_mapping_unit'].tolist(), [1, 3, 4])
+        self.assertEqual(df['longitude'].tolist(), [0.5, 0.5, 1.5])
+        self.assertEqual(df['latitude'].tolist(), [1.5, 0.5, 0.5])
+        
+        df = pixels_to_frame(np.array([[1, 9]]), np.array([4]), np.array([2, 6]), transform, None)
+        self.assertEqual(df['soil_mapping_unit'].tolist(), [1, 9])
+        self.assertEqual(df['longitude'].tolist(), [2.5, 6.5])
+        self.assertEqual(df['latitude'].tolist(), [-2.5, -2.5])
+    
+    def test_process_bil_to_csv_matches_loop(self):
+        """Test that the vectorized export matches a per-pixel loop."""
+        for sample_rate, step in [(1.0, 1), (0.25, 4), (0.1, 10)]:
+            csv_file = self.fetcher.process_bil_to_csv(self.bil_path, sample_rate=sample_rate)
+            df = pd.read_csv(csv_file)
+            pd.testing.assert_frame_equal(df, loop_pixels_to_frame(self.bil_path, step))
+    
+    def test_join_soil_properties_one_row_per_pixel(self):
+        """Test the unit-level join, including one-to-many tables."""
+        db_path = create_test_sqlite(Path(self.temp_dir) / "soil.db")
+        df = pd.read_csv(self.fetcher.process_bil_to_csv(self.bil_path, sqlite_db_path=db_path))
+        pixels = loop_pixels_to_frame(self.bil_path)
+        
+        self.assertEqual(len(df), len(pixels))
+        pd.testing.assert_frame_equal(df[pixels.columns], pixels)
+        self.assertEqual(list(df.columns[3:]), [
+            'd_awc_awc_percent', 'd_texture_sand_percent', 'd_texture_clay_percent'])
+        
+        # First D_TEXTURE row per mapping unit; units missing from a table are empty
+        row = df[df['soil_mapping_unit'].between(100, 299)].iloc[0]
+        self.assertEqual(row['d_texture_sand_percent'], 40.0)
+        self.assertAlmostEqual(row['d_awc_awc_percent'], row['soil_mapping_unit'] / 10)
+        self.assertTrue(df.loc[df['soil_mapping_unit'] >= 300, 'd_awc_awc_percent'].isna().all())
+        
+        # The kept row is the one with the lowest rowid, whatever its values
+        # or the key order rows were inserted in
+        import sqlite3
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM D_TEXTURE")
+        conn.executemany("INSERT INTO D_TEXTURE VALUES (?, ?, ?)",
+                         [(501, 55.0, 20.0), (500, 50.0, 20.0), (501, 15.0, 25.0), (500, 10.0, 30.0), (502, 5.0, 5.0)])
+        conn.commit()
+        conn.close()
+        with self.assertLogs('fetch_fao_soil_database', level='INFO') as logs:
+            units = self.fetcher.build_unit_attributes(np.array([502, 500, 501]), db_path)
+        self.assertEqual(units['d_texture_sand_percent'].tolist(), [5.0, 50.0, 55.0])
+        self.assertEqual(units['d_texture_clay_percent'].tolist(), [5.0, 20.0, 20.0])
+        self.assertIn("2 mapping units have several rows in D_TEXTURE", "\n".join(logs.output))
+        
+        # Text keys are compared as numbers, so '01' is a later row of unit 1
+        db_path = Path(self.temp_dir) / "text_keys.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE K (MU_GLOBAL TEXT, SAND REAL)")
+        conn.executemany("INSERT INTO K VALUES (?, ?)", [('1', 10.0), ('2', 30.0), ('01', 20.0), ('x', 0.0)])
+        conn.commit()
+        conn.close()
+        with self.assertLogs('fetch_fao_soil_database', level='INFO') as logs:
+            units = self.fetcher.build_unit_attributes(np.array([2, 1]), db_path)
+        self.assertEqual(units['k_sand_percent'].tolist(), [30.0, 10.0])
+        self.assertIn("1 mapping units have several rows in K", "\n".join(logs.output))
+    
+    def test_join_failure_is_raised(self):
+        """Test that a failing join is an error rather than output without soil columns."""
+        import sqlite3
+        bad_db = Path(self.temp_dir) / "bad.db"
+        bad_db.write_bytes(b"not a database" * 100)
+        with self.assertRaises(sqlite3.DatabaseError):
+            self.fetcher.process_bil_to_csv(self.bil_path, sqlite_db_path=bad_db)
+        
+        db_path = create_test_sqlite(Path(self.temp_dir) / "soil.db")
+        with patch.object(HWSDFetcher, 'build_unit_attributes', side_effect=TypeError("cannot cast")), \
+                self.assertRaisesRegex(TypeError, "cannot cast"):
+            self.fetcher.stream_bil_to_table(self.bil_path, Path(self.temp_dir) / "stream.csv",
+                                             sqlite_db_path=db_path)
+    
+    def test_separate_unit_table(self):
+        """Test writing soil variables once per mapping unit."""
+        db_path = create_test_sqlite(Path(self.temp_dir) / "soil.db")
+        unit_path = Path(self.temp_dir) / "units.csv"
+        pixels = pd.read_csv(self.fetcher.process_bil_to_csv(
+            self.bil_path, sqlite_db_path=db_path, unit_table_path=unit_path))
+        units = pd.read_csv(unit_path)
+        
+        self.assertEqual(list(pixels.columns), ['longitude', 'latitude', 'soil_mapping_unit'])
+        self.assertEqual(units['soil_mapping_unit'].tolist(), sorted(pixels['soil_mapping_unit'].unique()))
+        joined = pixels.merge(units, on='soil_mapping_unit', how='left')
+        expected = pd.read_csv(self.fetcher.process_bil_to_csv(
+            self.bil_path, Path(self.temp_dir) / "joined.csv", sqlite_db_path=db_path))
+        pd.testing.assert_frame_equal(joined, expected)
+        
+        stream_units = Path(self.temp_dir) / "stream_units.csv"
+        self.fetcher.stream_bil_to_table(self.bil_path, Path(self.temp_dir) / "stream.csv",
+                                         sqlite_db_path=db_path, block_rows=8, unit_table_path=stream_units)
+        pd.testing.assert_frame_equal(pd.read_csv(stream_units), units)
+    
+    def test_join_plan_contents(self):
+        """Test the discovered tables, keys, aliases and types."""
+        db_path = create_test_sqlite(Path(self.temp_dir) / "soil.db")
+        plan = self.fetcher.get_join_plan(db_path)
+        
+        self.assertEqual([t['table'] for t in plan['tables']], ['D_AWC', 'D_TEXTURE'])
+        texture = plan['tables'][1]
+        self.assertEqual(texture['key'], 'MU_GLOBAL')
+        self.assertEqual(texture['columns'], {'SAND': 'd_texture_sand_percent', 'CLAY': 'd_texture_clay_percent'})
+        self.assertEqual(texture['dtypes']['MU_GLOBAL'], 'INTEGER')
+        self.assertTrue((Path(self.temp_dir) / "soil.db.join_plan.json").exists())
+        
+        self.assertEqual(_column_alias("HWSD2_LAYERS", "PH_WATER"), "hwsd2_layers_ph_water_ph_units")
+        self.assertEqual(_column_alias("D_SWR", "SWR"), "d_swr_swr_units_unknown")
+    
+    def test_join_plan_widens_declared_types(self):
+        """Test that columns holding values wider than their declared type are read losslessly."""
+        import sqlite3
+        db_path = Path(self.temp_dir) / "soil.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE T (MU_GLOBAL INTEGER, AWC INTEGER, SAND REAL, CODE INTEGER)")
+        conn.executemany("INSERT INTO T VALUES (?, ?, ?, ?)",
+                         [(1, 1, 40.0, 3), (2, 2, 'n/a', 4), (3, 0.5, 45.0, None)])
+        conn.commit()
+        conn.close()
+        
+        self.assertEqual(list(self.fetcher.output_columns(db_path).values())[3:],
+                         ['float64', 'object', 'Int64'])
+        units = self.fetcher.build_unit_attributes(np.array([3, 2, 1]), db_path)
+        self.assertEqual(units['t_awc_percent'].tolist(), [0.5, 2.0, 1.0])
+        self.assertEqual(units['t_sand_percent'].tolist(), ['45.0', 'n/a', '40.0'])
+        self.assertEqual(units['t_code_units_unknown'].tolist()[1:], [4, 3])
+        
+        # A column whose values do not fit its planned type is still joined
+        with self.assertLogs('fetch_fao_soil_database', level='WARNING'):
+            cast = _cast_column(pd.Series([1.0, 0.5, 'x'], name='t_awc_percent'), 'Int64')
+        self.assertEqual(cast.dtype, 'float64')
+        self.assertEqual(cast.tolist()[:2], [1.0, 0.5])
+        self.assertTrue(np.isnan(cast.iloc[2]))
+    
+    def test_join_plan_reused_and_invalidated(self):
+        """Test that a saved plan is reused until the database changes."""
+        import os
+        import sqlite3
+        db_path = create_test_sqlite(Path(self.temp_dir) / "soil.db")
+        self.fetcher.get_join_plan(db_path)
+        
+        # A new fetcher (e.g. a later export) loads the saved plan
+        fetcher = HWSDFetcher(data_dir=self.temp_dir)
+        with patch.object(HWSDFetcher, '_discover_join_plan') as discover:
+            fetcher.get_join_plan(db_path)
+            fetcher.get_join_plan(db_path)
+            discover.assert_not_called()
+        
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE D_PH (MU_GLOBAL INTEGER, PH_WATER REAL)")
+        conn.execute("INSERT INTO D_PH VALUES (1, 6.5)")
+        conn.commit()
+        conn.close()
+        stat = db_path.stat()
+        os.utime(db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        plan = fetcher.get_join_plan(db_path)
+        self.assertEqual([t['table'] for t in plan['tables']], ['D_AWC', 'D_TEXTURE', 'D_PH'])
+        self.assertEqual(HWSDFetcher(data_dir=self.temp_dir).get_join_plan(db_path), plan)
+    
+    def test_stream_bil_to_csv_matches_full_read(self):
+        """Test that block-wise CSV output equals the whole-band export."""
+        for sample_rate, block_rows in [(1.0, 5), (0.25, 6), (0.5, 100)]:
+            expected = pd.read_csv(self.fetcher.process_bil_to_csv(
+                self.bil_path, Path(self.temp_dir) / "full.csv", sample_rate=sample_rate))
+            out = self.fetcher.stream_bil_to_table(
+                self.bil_path, Path(self.temp_dir) / "stream.csv",
+                sample_rate=sample_rate, block_rows=block_rows)
+            pd.testing.assert_frame_equal(pd.read_csv(out), expected)
+    
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_stream_bil_to_parquet_row_groups(self):
+        """Test that Parquet output has one row group per block."""
+        import pyarrow.parquet as pq
+        out = self.fetcher.stream_bil_to_table(
+            self.bil_path, Path(self.temp_dir) / "stream.parquet", block_rows=10)
+        self.assertEqual(pq.ParquetFile(out).num_row_groups, 4)
+        
+        expected = pd.read_csv(self.fetcher.process_bil_to_csv(self.bil_path))
+        pd.testing.assert_frame_equal(pd.read_parquet(out), expected)
+    
+    def test_stream_schema_from_join_plan(self):
+        """Test that streamed output uses the plan's columns and rejects other blocks."""
+        db_path = create_test_sqlite(Path(self.temp_dir) / "soil.db")
+        self.assertEqual(self.fetcher.output_columns(db_path), {
+            'longitude': 'float64', 'latitude': 'float64', 'soil_mapping_unit': 'int64',
+            'd_awc_awc_percent': 'float64', 'd_texture_sand_percent': 'float64',
+            'd_texture_clay_percent': 'float64',
+        })
+        self.assertEqual(list(self.fetcher.output_columns()), ['longitude', 'latitude', 'soil_mapping_unit'])
+        
+        def join_without_clay(df, sqlite_db_path):
+            """Join, dropping a column from every block after the first."""
+            joined = HWSDFetcher._join_soil_properties(self.fetcher, df, sqlite_db_path)
+            if df['latitude'].max() < 0:
+                joined = joined.drop(columns=['d_texture_clay_percent'])
+            return joined
+        
+        for name in ["stream.csv", "stream.parquet"] if HAS_PYARROW else ["stream.csv"]:
+            with self.subTest(output=name), \
+                    patch.object(self.fetcher, '_join_soil_properties', side_effect=join_without_clay), \
+                    self.assertRaisesRegex(ValueError, 'd_texture_clay_percent'):
+                self.fetcher.stream_bil_to_table(self.bil_path, Path(self.temp_dir) / name,
+                                                 sqlite_db_path=db_path, block_rows=20)
+    
+    def test_process_bil_parallel_csv(self):
+        """Test that strips processed in a pool merge to the serial result."""
+        expected = pd.read_csv(self.fetcher.process_bil_to_csv(
+            self.bil_path, Path(self.temp_dir) / "serial.csv", sample_rate=0.5))
+        out = self.fetcher.process_bil_parallel(
+            self.bil_path, Path(self.temp_dir) / "parallel.csv",
+            sample_rate=0.5, workers=2, strip_rows=7)
+        pd.testing.assert_frame_equal(pd.read_csv(out), expected)
+        self.assertFalse((Path(self.temp_dir) / "parallel_parts").exists())
+    
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_process_bil_parallel_partitioned_parquet(self):
+        """Test keeping the Parquet parts as a partitioned dataset."""
+        parts_dir = self.fetcher.process_bil_parallel(
+            self.bil_path, Path(self.temp_dir) / "parallel.parquet",
+            workers=2, strip_rows=10, merge=False)
+        parts = sorted(parts_dir.iterdir())
+        self.assertEqual([p.name for p in parts], [f"part-{i:05d}.parquet" for i in range(4)])
+        
+        expected = pd.read_csv(self.fetcher.process_bil_to_csv(self.bil_path))
+        result = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+        pd.testing.assert_frame_equal(result, expected)
+        
+        merged = self.fetcher.process_bil_parallel(
+            self.bil_path, Path(self.temp_dir) / "parallel.parquet", workers=2, strip_rows=10)
+        pd.testing.assert_frame_equal(pd.read_parquet(merged), expected)
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_process_bil_parallel_schema_from_join_plan(self):
+        """Test that parts share the plan's schema and mismatched parts are not merged."""
+        import pyarrow.parquet as pq
+        db_path = create_test_sqlite(Path(self.temp_dir) / "soil.db")
+        columns = self.fetcher.output_columns(db_path)
+        parts_dir = self.fetcher.process_bil_parallel(
+            self.bil_path, Path(self.temp_dir) / "parallel.parquet",
+            sqlite_db_path=db_path, workers=2, strip_rows=10, merge=False)
+        schemas = [pq.read_schema(path) for path in sorted(parts_dir.iterdir())]
+        self.assertEqual(len(schemas), 4)
+        for schema in schemas:
+            self.assertEqual(schema.names, list(columns))
+            self.assertTrue(schema.equals(schemas[0]))
+
+        for suffix in [".csv", ".parquet"]:
+            part_paths = []
+            for index, part_columns in enumerate([columns, dict(list(columns.items())[:-1])]):
+                part = pd.DataFrame({name: pd.Series([1], dtype=dtype) for name, dtype in part_columns.items()})
+                path = Path(self.temp_dir) / f"part-{index}{suffix}"
+                if suffix == ".csv":
+                    part.to_csv(path, index=False)
+                else:
+                    part.to_parquet(path, index=False)
+                part_paths.append(path)
+            with self.subTest(suffix=suffix), self.assertRaisesRegex(ValueError, 'part-1'):
+                self.fetcher._merge_parts(part_paths, Path(self.temp_dir) / f"merged{suffix}", columns)
+
+    def test_blocks_with_units_missing_from_a_table(self):
+        """Test that blocks without rows in a table still get its (null) columns."""
+        import sqlite3
+        data = np.full((8, 6), 1, dtype=np.uint16)
+        data[:4] = 7
+        bil_path = write_test_bil(Path(self.temp_dir) / "halves.bil", data)
+        db_path = Path(self.temp_dir) / "soil.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE T (MU_GLOBAL INTEGER, NAME TEXT, VAL REAL)")
+        conn.execute("INSERT INTO T VALUES (1, 'loam', 0.5)")
+        conn.execute("CREATE TABLE EMPTY (MU_GLOBAL INTEGER, X REAL)")
+        conn.commit()
+        conn.close()
+
+        units = self.fetcher.build_unit_attributes(np.array([7]), db_path)
+        self.assertEqual(units.dtypes.astype(str).tolist(), ['int64', 'object', 'float64'])
+        self.assertTrue(units[['t_name_units_unknown', 't_val_units_unknown']].isna().all().all())
+
+        expected = pd.read_csv(self.fetcher.process_bil_to_csv(
+            bil_path, Path(self.temp_dir) / "serial.csv", sqlite_db_path=db_path))
+        self.assertEqual(expected.shape, (48, 5))
+        self.assertEqual(expected['t_name_units_unknown'].notna().sum(), 24)
+
+        for suffix in [".csv", ".parquet"] if HAS_PYARROW else [".csv"]:
+            outputs = [
+                self.fetcher.stream_bil_to_table(bil_path, Path(self.temp_dir) / f"stream{suffix}",
+                                                 sqlite_db_path=db_path, block_rows=4),
+                self.fetcher.process_bil_parallel(bil_path, Path(self.temp_dir) / f"parallel{suffix}",
+                                                  sqlite_db_path=db_path, workers=2, strip_rows=4),
+            ]
+            for out in outputs:
+                with self.subTest(output=out.name):
+                    result = pd.read_parquet(out) if suffix == '.parquet' else pd.read_csv(out)
+                    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    @patch('fetch_fao_soil_database.pq', None)
+    def test_stream_bil_to_parquet_requires_pyarrow(self):
+        """Test that Parquet output without pyarrow is a clear error."""
+        with self.assertRaises(RuntimeError):
+            self.fetcher.stream_bil_to_table(self.bil_path, Path(self.temp_dir) / "out.parquet")
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for HWSD fetcher (requiring internet and mdb-tools)."""
     
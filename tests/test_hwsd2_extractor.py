@@ -0,0 +1,545 @@
+#!/usr/bin/env python
+"""
+Tests for the HWSD2 soil profile extractor.
+
+The raster fixture is a sparse file with the full HWSD2 dimensions, so only
+the handful of pixels written by each test occupy disk space.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+# Add hwsd_data directory to path for importing
+hwsd_dir = Path(__file__).parent.parent / "hwsd_data"
+sys.path.insert(0, str(hwsd_dir))
+
+from convert_hwsd2_raster import convert_bil_to_cog
+from hwsd2_extractor import HWSD2Extractor
+
+SCHEMA_FILE = hwsd_dir / "hwsd2_duckdb_schema.sql"
+
+NROWS = 21600
+NCOLS = 43200
+ULX = -179.995833333333
+ULY = 89.9958333333333
+DIM = 0.00833333333333333
+
+
+def write_sparse_raster(path: Path, pixels: dict[tuple[int, int], int]) -> None:
+    """
+    Create a full-size HWSD2.bil stand-in containing only the given pixels.
+
+    Args:
+        path: Output .bil path
+        pixels: Mapping of (row, col) to uint16 value
+    """
+    with open(path, 'wb') as f:
+        f.truncate(NROWS * NCOLS * 2)
+        for (row, col), value in pixels.items():
+            f.seek((row * NCOLS + col) * 2)
+            f.write(int(value).to_bytes(2, 'little'))
+
+
+def create_test_db(path: Path) -> None:
+    """
+    Create a small HWSD2 DuckDB using the real table definitions.
+
+    SMU 1666 has two soil sequences and SMU 4726 has one, each with the
+    seven standard depth layers.
+
+    Args:
+        path: Output database path
+    """
+    sql = '\n'.join(
+        line for line in SCHEMA_FILE.read_text().splitlines() if not line.startswith('--')
+    )
+    statements = [s.strip() for s in sql.split(';')]
+    conn = duckdb.connect(str(path))
+    for stmt in statements:
+        if stmt.startswith('CREATE TABLE'):
+            conn.execute(stmt)
+
+    conn.execute("INSERT INTO D_DRAINAGE VALUES ('W', 'W', 'Well'), ('P', 'P', 'Poorly')")
+    conn.execute("INSERT INTO D_WRB2 VALUES ('CM', 'Cambisols'), ('GL', 'Gleysols')")
+    conn.execute("INSERT INTO D_WRB4 VALUES (1, 'Haplic Cambisols', 'CMha')")
+    conn.execute("INSERT INTO D_KOPPEN VALUES ('Dfb', 'Warm-summer humid continental')")
+    conn.execute("INSERT INTO D_ROOT_DEPTH VALUES (1, 'Deep')")
+    conn.execute("INSERT INTO D_TEXTURE_USDA VALUES (9, 'Loam')")
+    conn.execute("INSERT INTO D_TEXTURE_SOTER VALUES ('M', 'Medium')")
+    conn.execute("""
+        INSERT INTO HWSD2_SMU (ID, HWSD2_SMU_ID, WRB4, WRB2, KOPPEN, DRAINAGE, ROOT_DEPTH, AWC)
+        VALUES (1, 1666, 'CMha', 'CM', 'Dfb', 'W', 1, 150.0),
+               (2, 4726, NULL, 'GL', 'Dfb', 'P', 1, 100.0)
+    """)
+
+    depths = [(0, 20), (20, 40), (40, 60), (60, 80), (80, 100), (100, 150), (150, 200)]
+    layer_id = 0
+    for smu_id, sequences in [(1666, [(1, 60.0), (2, 40.0)]), (4726, [(1, 100.0)])]:
+        for sequence, share in sequences:
+            for i, (top, bottom) in enumerate(depths):
+                layer_id += 1
+                conn.execute(
+                    """
+                    INSERT INTO HWSD2_LAYERS (ID, HWSD2_SMU_ID, SEQUENCE, SHARE, DRAINAGE, LAYER,
+                                              TOPDEP, BOTDEP, SAND, CLAY, TEXTURE_USDA, TEXTURE_SOTER)
+                    VALUES (?, ?, ?, ?, 'W', ?, ?, ?, ?, ?, 9, 'M')
+                    """,
+                    [layer_id, smu_id, sequence, share, f"D{i + 1}", top, bottom,
+                     40.0 + sequence, 20.0 + i],
+                )
+    conn.close()
+
+
+class RasterTestCase(unittest.TestCase):
+    """Base class providing a sparse raster and an extractor over it."""
+
+    def setUp(self):
+        """Create a sparse raster with a few known pixels."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.raster_path = self.temp_dir / "HWSD2.bil"
+        self.db_path = self.temp_dir / "hwsd2.db"
+
+        self.boulder = (40.0, -105.0)
+        self.boulder_rowcol = (
+            int((ULY - self.boulder[0]) / DIM),
+            int((self.boulder[1] - ULX) / DIM),
+        )
+        self.pixels = {
+            (0, 0): 11,
+            (NROWS - 1, NCOLS - 1): 22,
+            (5000, 15000): 4726,
+            (1200, 9000): 65535,
+            self.boulder_rowcol: 1666,
+        }
+        write_sparse_raster(self.raster_path, self.pixels)
+        self.extractor = HWSD2Extractor(raster_path=self.raster_path, db_path=self.db_path)
+
+    def tearDown(self):
+        """Clean up the temporary raster."""
+        self.extractor.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TestHWSD2Extractor(RasterTestCase):
+    """Test cases for raster lookups in HWSD2Extractor."""
+
+    def test_missing_raster(self):
+        """Test that a missing raster file is reported."""
+        with self.assertRaises(FileNotFoundError):
+            HWSD2Extractor(raster_path=self.temp_dir / "missing.bil")
+
+    def test_raster_is_shared_memmap(self):
+        """Test that the raster is mapped once and reused."""
+        raster = self.extractor.raster
+        self.assertEqual(raster.shape, (NROWS, NCOLS))
+        self.assertEqual(raster.dtype.itemsize, 2)
+        self.assertIs(self.extractor.raster, raster)
+        self.assertFalse(raster.flags.writeable)
+
+    def test_read_raster_value(self):
+        """Test reading individual pixels."""
+        for (row, col), value in self.pixels.items():
+            result = self.extractor.read_raster_value(row, col)
+            self.assertEqual(result, value)
+            self.assertIsInstance(result, int)
+        self.assertEqual(self.extractor.read_raster_value(1, 1), 0)
+
+    def test_read_raster_value_out_of_range(self):
+        """Test that invalid pixel indices are rejected."""
+        with self.assertRaises(ValueError):
+            self.extractor.read_raster_value(NROWS, 0)
+        with self.assertRaises(ValueError):
+            self.extractor.read_raster_value(0, -1)
+
+    def test_latlon_to_smu_id(self):
+        """Test coordinate lookup including NODATA handling."""
+        self.assertEqual(self.extractor.latlon_to_smu_id(*self.boulder), 1666)
+        self.assertEqual(self.extractor.latlon_to_smu_id(90.0, -180.0), 11)
+        self.assertEqual(self.extractor.latlon_to_smu_id(-90.0, 180.0), 22)
+
+        lat = ULY - 1200.5 * DIM
+        lon = ULX + 9000.5 * DIM
+        self.assertIsNone(self.extractor.latlon_to_smu_id(lat, lon))
+
+    def test_latlon_to_smu_ids_matches_scalar(self):
+        """Test that the vectorized lookup agrees with the scalar one."""
+        rng = np.random.default_rng(0)
+        lats = np.concatenate([rng.uniform(-90, 90, 500), [self.boulder[0], 90.0, -90.0]])
+        lons = np.concatenate([rng.uniform(-180, 180, 500), [self.boulder[1], -180.0, 180.0]])
+
+        rows, cols = self.extractor.latlon_to_rowcols(lats, lons)
+        expected = [self.extractor.latlon_to_rowcol(lat, lon) for lat, lon in zip(lats, lons)]
+        self.assertEqual(list(zip(rows.tolist(), cols.tolist())), expected)
+
+        smu_ids = self.extractor.latlon_to_smu_ids(lats, lons)
+        self.assertEqual(smu_ids.dtype, np.int64)
+        self.assertEqual(smu_ids[-3:].tolist(), [1666, 11, 22])
+
+    def test_latlon_to_smu_ids_nodata_and_shape(self):
+        """Test NODATA masking and that input shape is preserved."""
+        lats = np.array([[ULY - 1200.5 * DIM, self.boulder[0]]])
+        lons = np.array([[ULX + 9000.5 * DIM, self.boulder[1]]])
+        smu_ids = self.extractor.latlon_to_smu_ids(lats, lons)
+        self.assertEqual(smu_ids.shape, (1, 2))
+        self.assertEqual(smu_ids.tolist(), [[-1, 1666]])
+
+    def test_latlon_to_smu_ids_validation(self):
+        """Test that out-of-range, NaN and mismatched inputs are rejected."""
+        with self.assertRaises(ValueError):
+            self.extractor.latlon_to_smu_ids(np.array([91.0]), np.array([0.0]))
+        with self.assertRaises(ValueError):
+            self.extractor.latlon_to_smu_ids(np.array([0.0]), np.array([np.nan]))
+        with self.assertRaises(ValueError):
+            self.extractor.latlon_to_smu_ids(np.zeros(2), np.zeros(3))
+
+
+class TestHWSD2ExtractorDatabase(RasterTestCase):
+    """Test cases for soil property queries against a DuckDB database."""
+
+    def setUp(self):
+        """Create the sparse raster and a small database."""
+        super().setUp()
+        create_test_db(self.db_path)
+
+    def test_get_smu_properties(self):
+        """Test the single-SMU query."""
+        profile = self.extractor.get_smu_properties(1666)
+        self.assertEqual(profile['smu_id'], 1666)
+        self.assertEqual(profile['metadata']['WRB2_NAME'], 'Cambisols')
+        self.assertEqual(profile['metadata']['DRAINAGE_NAME'], 'Well')
+        self.assertEqual(len(profile['layers']), 14)
+        self.assertEqual(profile['layers']['TEXTURE_USDA_NAME'].iloc[0], 'Loam')
+        self.assertTrue(profile['layers']['TOPDEP'].is_monotonic_increasing)
+
+        with self.assertRaises(ValueError):
+            self.extractor.get_smu_properties(9999)
+
+    def test_get_smu_properties_bulk(self):
+        """Test that the bulk query matches per-SMU queries."""
+        profiles = self.extractor.get_smu_properties_bulk([4726, 1666, 1666, 9999, -1])
+        self.assertEqual(sorted(profiles), [1666, 4726])
+
+        for smu_id, bulk in profiles.items():
+            single = self.extractor.get_smu_properties(smu_id)
+            self.assertEqual(bulk['smu_id'], smu_id)
+            self.assertEqual(bulk['metadata']['WRB2_NAME'], single['metadata']['WRB2_NAME'])
+            pd.testing.assert_frame_equal(bulk['layers'], single['layers'])
+
+    def test_get_smu_properties_bulk_layers_only(self):
+        """Test that layer-only bulk results keep unknown IDs with no layers."""
+        profiles = self.extractor.get_smu_properties_bulk(
+            np.array([1666, 9999]), include_metadata=False
+        )
+        self.assertEqual(sorted(profiles), [1666, 9999])
+        self.assertNotIn('metadata', profiles[1666])
+        self.assertEqual(len(profiles[1666]['layers']), 14)
+        self.assertTrue(profiles[9999]['layers'].empty)
+
+    def test_get_soil_profiles(self):
+        """Test profile lookup for arrays of points."""
+        lats = [self.boulder[0], ULY - 1200.5 * DIM, self.boulder[0]]
+        lons = [self.boulder[1], ULX + 9000.5 * DIM, self.boulder[1]]
+        profiles = self.extractor.get_soil_profiles(lats, lons)
+
+        self.assertEqual(len(profiles), 3)
+        self.assertIsNone(profiles[1])
+        self.assertEqual(profiles[0]['smu_id'], 1666)
+        self.assertEqual(profiles[0]['latitude'], self.boulder[0])
+        self.assertEqual(profiles[2]['longitude'], self.boulder[1])
+        self.assertEqual(len(profiles[2]['layers']), 14)
+
+    def test_extract_window(self):
+        """Test bounding-box extraction of the SMU grid and its profiles."""
+        row, col = self.boulder_rowcol
+        with open(self.raster_path, 'r+b') as f:
+            f.seek(((row + 1) * NCOLS + col + 2) * 2)
+            f.write((4726).to_bytes(2, 'little'))
+
+        window = self.extractor.extract_window(
+            south=ULY - (row + 2.5) * DIM,
+            west=ULX + (col - 2.5) * DIM,
+            north=ULY - (row - 2.5) * DIM,
+            east=ULX + (col + 2.5) * DIM,
+        )
+        smu_ids = window['smu_ids']
+        self.assertEqual(smu_ids.shape, (6, 6))
+        self.assertEqual(smu_ids[3, 3], 1666)
+        self.assertEqual(smu_ids[4, 5], 4726)
+        self.assertEqual(window['unique_smu_ids'].tolist(), [0, 1666, 4726])
+        self.assertEqual(sorted(window['profiles']), [1666, 4726])
+        self.assertEqual(len(window['profiles'][1666]['layers']), 14)
+        self.assertEqual(len(window['latitudes']), 6)
+        self.assertAlmostEqual(window['latitudes'][3], ULY - row * DIM)
+        self.assertAlmostEqual(window['longitudes'][3], ULX + col * DIM)
+        self.assertTrue(np.all(np.diff(window['latitudes']) < 0))
+
+        strided = self.extractor.extract_window(
+            ULY - (row + 2.5) * DIM, ULX + (col - 2.5) * DIM,
+            ULY - (row - 2.5) * DIM, ULX + (col + 2.5) * DIM,
+            stride=3, include_layers=False,
+        )
+        np.testing.assert_array_equal(strided['smu_ids'], smu_ids[::3, ::3])
+        self.assertNotIn('layers', strided['profiles'][1666])
+
+    def test_extract_window_nodata_and_validation(self):
+        """Test NODATA masking and rejection of inverted boxes."""
+        lat, lon = ULY - 1200.5 * DIM, ULX + 9000.5 * DIM
+        window = self.extractor.extract_window(lat, lon, lat, lon)
+        self.assertEqual(window['smu_ids'].tolist(), [[-1]])
+        self.assertEqual(window['profiles'], {})
+
+        with self.assertRaises(ValueError):
+            self.extractor.extract_window(41.0, -105.0, 40.0, -104.0)
+        with self.assertRaises(ValueError):
+            self.extractor.extract_window(40.0, -104.0, 41.0, -105.0)
+        with self.assertRaises(ValueError):
+            self.extractor.extract_window(40.0, -105.0, 41.0, -104.0, stride=0)
+
+    def test_missing_database(self):
+        """Test that a missing database is reported when first queried."""
+        extractor = HWSD2Extractor(raster_path=self.raster_path, db_path=self.temp_dir / "none.db")
+        with self.assertRaises(FileNotFoundError):
+            extractor.get_smu_properties(1666)
+
+    def test_connection_is_reused(self):
+        """Test that queries share one lazily opened read-only connection."""
+        self.assertIsNone(self.extractor._conn)
+        self.extractor.get_smu_properties(1666)
+        conn = self.extractor.connection
+        cursor = self.extractor.cursor()
+        self.extractor.get_smu_properties_bulk([4726])
+        self.assertIs(self.extractor.connection, conn)
+        self.assertIs(self.extractor.cursor(), cursor)
+        with self.assertRaises(duckdb.Error):
+            cursor.execute("CREATE TABLE scratch (x INTEGER)")
+
+    def test_close_and_context_manager(self):
+        """Test that close releases resources and the extractor can reopen."""
+        with HWSD2Extractor(raster_path=self.raster_path, db_path=self.db_path) as extractor:
+            extractor.get_smu_properties(1666)
+            first = extractor.connection
+        self.assertIsNone(extractor._conn)
+        self.assertIsNone(extractor._raster)
+
+        profile = extractor.get_smu_properties(4726)
+        self.assertEqual(profile['metadata']['WRB2_NAME'], 'Gleysols')
+        self.assertIsNot(extractor.connection, first)
+        extractor.close()
+
+    def test_threaded_queries(self):
+        """Test concurrent queries use per-thread cursors on one connection."""
+        def lookup(smu_id):
+            profile = self.extractor.get_smu_properties(smu_id)
+            return profile['metadata']['WRB2_NAME'], id(self.extractor.cursor())
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lookup, [1666, 4726] * 20))
+
+        names = [name for name, _ in results]
+        self.assertEqual(names, ['Cambisols', 'Gleysols'] * 20)
+        self.assertLessEqual(len({cursor for _, cursor in results}), 4)
+
+    def test_profile_cache_hits_and_copies(self):
+        """Test that repeated lookups hit the cache and return copies."""
+        first = self.extractor.get_smu_properties(1666)
+        first['metadata']['WRB2_NAME'] = 'modified'
+        first['layers'].loc[0, 'SAND'] = -1.0
+
+        second = self.extractor.get_smu_properties(1666)
+        self.assertEqual(second['metadata']['WRB2_NAME'], 'Cambisols')
+        self.assertNotEqual(second['layers'].loc[0, 'SAND'], -1.0)
+
+        # Different flags are cached separately
+        self.extractor.get_smu_properties(1666, include_layers=False)
+
+        info = self.extractor.cache_info()
+        self.assertEqual((info['hits'], info['misses'], info['size']), (1, 2, 2))
+        self.assertAlmostEqual(info['hit_rate'], 1 / 3)
+
+    def test_profile_cache_shared_with_bulk(self):
+        """Test that bulk lookups read from and populate the cache."""
+        self.extractor.get_smu_properties(1666)
+        profiles = self.extractor.get_smu_properties_bulk([1666, 4726])
+        self.assertEqual(sorted(profiles), [1666, 4726])
+        self.assertEqual(self.extractor.cache_info()['hits'], 1)
+
+        self.extractor.get_smu_properties(4726)
+        self.assertEqual(self.extractor.cache_info()['hits'], 2)
+
+    def test_profile_cache_eviction(self):
+        """Test that the cache is bounded and evicts least recently used."""
+        extractor = HWSD2Extractor(raster_path=self.raster_path, db_path=self.db_path, cache_size=1)
+        extractor.get_smu_properties(1666)
+        extractor.get_smu_properties(4726)
+        extractor.get_smu_properties(1666)
+
+        info = extractor.cache_info()
+        self.assertEqual((info['hits'], info['misses'], info['evictions'], info['size']), (0, 3, 2, 1))
+        extractor.cache_clear()
+        self.assertEqual(extractor.cache_info()['size'], 0)
+        extractor.close()
+
+    def test_profile_cache_disabled(self):
+        """Test that a zero-size cache stores nothing."""
+        extractor = HWSD2Extractor(raster_path=self.raster_path, db_path=self.db_path, cache_size=0)
+        extractor.get_smu_properties(1666)
+        extractor.get_smu_properties(1666)
+        self.assertEqual(extractor.cache_info()['hits'], 0)
+        self.assertEqual(extractor.cache_info()['size'], 0)
+        extractor.close()
+
+    def test_profile_cache_invalidated_on_db_change(self):
+        """Test that modifying the database file drops cached profiles."""
+        self.extractor.get_smu_properties(1666)
+        self.extractor.close()
+
+        conn = duckdb.connect(str(self.db_path))
+        conn.execute("UPDATE D_WRB2 SET VALUE = 'Updated Cambisols' WHERE CODE = 'CM'")
+        conn.close()
+        stat = self.db_path.stat()
+        os.utime(self.db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        profile = self.extractor.get_smu_properties(1666)
+        self.assertEqual(profile['metadata']['WRB2_NAME'], 'Updated Cambisols')
+        self.assertEqual(self.extractor.cache_info()['hits'], 0)
+
+    def test_database_change_during_threaded_queries(self):
+        """Test that a database change mid-query does not break other threads."""
+        extractor = HWSD2Extractor(raster_path=self.raster_path, db_path=self.db_path, cache_size=0)
+        raster = extractor.raster
+        stop = threading.Event()
+
+        def touch():
+            while not stop.is_set():
+                stat = self.db_path.stat()
+                os.utime(self.db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+                time.sleep(0.02)
+
+        def lookup(smu_id):
+            return extractor.get_smu_properties(smu_id)['metadata']['WRB2_NAME']
+
+        toucher = threading.Thread(target=touch)
+        toucher.start()
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                names = list(pool.map(lookup, [1666, 4726] * 20))
+        finally:
+            stop.set()
+            toucher.join()
+
+        self.assertEqual(names, ['Cambisols', 'Gleysols'] * 20)
+        self.assertIs(extractor.raster, raster)
+        self.assertLessEqual(len(extractor._retired), 4)
+        extractor.close()
+
+    def test_replaced_database_with_open_cursor(self):
+        """Test that a replaced database is read by new queries while old cursors finish."""
+        self.extractor.get_smu_properties(1666)
+        old_cursor = self.extractor.cursor()
+
+        new_db = self.temp_dir / "new.db"
+        create_test_db(new_db)
+        conn = duckdb.connect(str(new_db))
+        conn.execute("UPDATE D_WRB2 SET VALUE = 'Updated Cambisols' WHERE CODE = 'CM'")
+        conn.close()
+        os.replace(new_db, self.db_path)
+        stat = self.db_path.stat()
+        os.utime(self.db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            name = pool.submit(self.extractor.get_smu_properties, 1666).result()['metadata']['WRB2_NAME']
+        self.assertEqual(name, 'Updated Cambisols')
+        self.assertEqual(old_cursor.execute("SELECT VALUE FROM D_WRB2 WHERE CODE = 'CM'").fetchone(),
+                         ('Cambisols',))
+        self.assertEqual(len(self.extractor._retired), 1)
+
+        # This thread moves to the new connection, closing the old one
+        self.assertEqual(self.extractor.get_smu_properties(4726)['metadata']['WRB2_NAME'], 'Gleysols')
+        self.assertEqual(self.extractor._retired, [])
+        with self.assertRaises(duckdb.Error):
+            old_cursor.execute("SELECT 1")
+
+
+class TestTiledRaster(unittest.TestCase):
+    """Test cases for the Cloud-Optimized GeoTIFF backend."""
+
+    def setUp(self):
+        """Write a small BIL tile of the HWSD2 grid and convert it."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        rng = np.random.default_rng(0)
+        # Patches of SMU IDs on a 600 x 900 window starting at row 6000, col 9000
+        self.row_off, self.col_off = 6000, 9000
+        self.data = np.repeat(np.repeat(rng.integers(1, 40, (20, 30)), 30, 0), 30, 1).astype('<u2')
+        self.data[:100, :100] = 65535
+
+        bil_path = self.temp_dir / "HWSD2.bil"
+        self.data.tofile(bil_path)
+        (self.temp_dir / "HWSD2.hdr").write_text(
+            "BYTEORDER I\nLAYOUT BIL\n"
+            f"NROWS {self.data.shape[0]}\nNCOLS {self.data.shape[1]}\n"
+            "NBANDS 1\nNBITS 16\nPIXELTYPE UNSIGNEDINT\n"
+            f"ULXMAP {ULX + self.col_off * DIM}\nULYMAP {ULY - self.row_off * DIM}\n"
+            f"XDIM {DIM}\nYDIM {DIM}\nNODATA 65535\n"
+        )
+        self.cog_path = convert_bil_to_cog(bil_path, self.temp_dir / "HWSD2.tif", blocksize=128)
+        self.extractor = HWSD2Extractor(raster_path=self.cog_path, db_path=self.temp_dir / "none.db",
+                                        tile_cache_size=4)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.extractor.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_conversion_is_tiled_and_compressed(self):
+        """Test the GeoTIFF layout and that it is smaller than the BIL."""
+        import rasterio
+        with rasterio.open(self.cog_path) as src:
+            self.assertEqual(src.block_shapes[0], (128, 128))
+            self.assertEqual(src.compression.name, 'deflate')
+            self.assertEqual(src.nodata, 65535)
+        self.assertLess(self.cog_path.stat().st_size, self.data.nbytes / 10)
+
+    def test_grid_from_geotiff(self):
+        """Test that the grid geometry is read from the GeoTIFF."""
+        self.assertEqual((self.extractor.nrows, self.extractor.ncols), self.data.shape)
+        self.assertAlmostEqual(self.extractor.ulx, ULX + self.col_off * DIM)
+        self.assertAlmostEqual(self.extractor.uly, ULY - self.row_off * DIM)
+        self.assertAlmostEqual(self.extractor.xdim, DIM)
+
+    def test_point_lookups_match_source(self):
+        """Test single and vectorized pixel reads against the source array."""
+        rng = np.random.default_rng(1)
+        rows = rng.integers(0, self.data.shape[0], 500)
+        cols = rng.integers(0, self.data.shape[1], 500)
+        np.testing.assert_array_equal(self.extractor.raster[rows, cols], self.data[rows, cols])
+        self.assertEqual(self.extractor.read_raster_value(599, 899), int(self.data[599, 899]))
+        self.assertLessEqual(len(self.extractor.raster._tiles), 4)
+
+    def test_window_reads_match_source(self):
+        """Test that slices spanning several tiles are assembled correctly."""
+        raster = self.extractor.raster
+        np.testing.assert_array_equal(raster[100:400, 50:700], self.data[100:400, 50:700])
+        np.testing.assert_array_equal(raster[::7, 5::3], self.data[::7, 5::3])
+
+    def test_latlon_to_smu_ids(self):
+        """Test coordinate lookups on the tiled grid, including NODATA."""
+        lats = ULY - (self.row_off + np.array([10, 300, 599])) * DIM
+        lons = ULX + (self.col_off + np.array([10, 450, 899])) * DIM
+        expected = [-1, int(self.data[300, 450]), int(self.data[599, 899])]
+        self.assertEqual(self.extractor.latlon_to_smu_ids(lats, lons).tolist(), expected)
+        self.assertIsNone(self.extractor.latlon_to_smu_id(lats[0], lons[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+"""
+Tests for the HWSD2 DuckDB loader.
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+# Add hwsd_data directory to path for importing
+hwsd_dir = Path(__file__).parent.parent / "hwsd_data"
+sys.path.insert(0, str(hwsd_dir))
+
+from hwsd2_extractor import HWSD2Extractor
+from load_hwsd2 import export_parquet, load_hwsd2_bulk, materialize_profiles, parse_schema
+from test_hwsd2_extractor import create_test_db, write_sparse_raster
+
+
+class TestMaterializeProfiles(unittest.TestCase):
+    """Test cases for the materialized SMU profile tables."""
+
+    def setUp(self):
+        """Create a small database with and without profile tables."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.raster_path = self.temp_dir / "HWSD2.bil"
+        write_sparse_raster(self.raster_path, {})
+
+        self.join_db = self.temp_dir / "join.db"
+        self.profile_db = self.temp_dir / "profile.db"
+        create_test_db(self.join_db)
+        create_test_db(self.profile_db)
+
+        conn = duckdb.connect(str(self.profile_db))
+        materialize_profiles(conn)
+        conn.close()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_profile_tables(self):
+        """Test the shape and keys of the materialized tables."""
+        conn = duckdb.connect(str(self.profile_db), read_only=True)
+        smu = conn.execute("SELECT HWSD2_SMU_ID, WRB2_NAME FROM SMU_PROFILE ORDER BY 1").fetchall()
+        self.assertEqual(smu, [(1666, 'Cambisols'), (4726, 'Gleysols')])
+
+        columns = [row[0] for row in conn.execute("DESCRIBE SMU_LAYER_PROFILE").fetchall()]
+        self.assertEqual(columns, ['HWSD2_SMU_ID', 'D1', 'D2', 'D3', 'D4', 'D5', 'D6', 'D7'])
+        sequences = conn.execute(
+            "SELECT len(D1), len(D7) FROM SMU_LAYER_PROFILE WHERE HWSD2_SMU_ID = 1666"
+        ).fetchone()
+        self.assertEqual(sequences, (2, 2))
+
+        constraints = conn.execute("""
+            SELECT table_name FROM duckdb_constraints()
+            WHERE constraint_type = 'PRIMARY KEY' AND table_name LIKE 'SMU_%'
+            ORDER BY table_name
+        """).fetchall()
+        self.assertEqual(constraints, [('SMU_LAYER_PROFILE',), ('SMU_PROFILE',)])
+        conn.close()
+
+    def test_rematerialize(self):
+        """Test that materializing again replaces the tables."""
+        conn = duckdb.connect(str(self.profile_db))
+        materialize_profiles(conn)
+        count = conn.execute("SELECT COUNT(*) FROM SMU_PROFILE").fetchone()[0]
+        conn.close()
+        self.assertEqual(count, 2)
+
+    def test_extractor_results_match_joins(self):
+        """Test that keyed reads return the same profiles as the joins."""
+        with HWSD2Extractor(raster_path=self.raster_path, db_path=self.join_db) as joined, \
+                HWSD2Extractor(raster_path=self.raster_path, db_path=self.profile_db) as keyed:
+            self.assertIn("SMU_PROFILE", keyed._queries()[0])
+            self.assertIn("HWSD2_SMU s", joined._queries()[0])
+
+            for smu_id in [1666, 4726]:
+                expected = joined.get_smu_properties(smu_id)
+                result = keyed.get_smu_properties(smu_id)
+                self.assertEqual(result['metadata'].keys(), expected['metadata'].keys())
+                self.assertEqual(result['metadata']['KOPPEN_NAME'], expected['metadata']['KOPPEN_NAME'])
+                pd.testing.assert_frame_equal(result['layers'], expected['layers'])
+
+            expected = joined.get_smu_properties_bulk([1666, 4726])
+            result = keyed.get_smu_properties_bulk([1666, 4726])
+            for smu_id in expected:
+                pd.testing.assert_frame_equal(result[smu_id]['layers'], expected[smu_id]['layers'])
+
+            with self.assertRaises(ValueError):
+                keyed.get_smu_properties(9999)
+
+
+class TestLoadHWSD2Bulk(unittest.TestCase):
+    """Test cases for the checksum-aware bulk loader."""
+
+    def setUp(self):
+        """Export a small database to one CSV per schema table."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.csv_dir = self.temp_dir / "HWSD2_csv"
+        self.csv_dir.mkdir()
+        self.db_path = self.temp_dir / "hwsd2.db"
+
+        source_db = self.temp_dir / "source.db"
+        create_test_db(source_db)
+        conn = duckdb.connect(str(source_db))
+        tables, _ = parse_schema()
+        for table in tables:
+            conn.execute(f"COPY {table} TO '{self.csv_dir / (table + '.csv')}' (HEADER TRUE)")
+        conn.close()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _query(self, sql):
+        conn = duckdb.connect(str(self.db_path), read_only=True)
+        try:
+            return conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+
+    def test_parse_schema(self):
+        """Test that tables and indexes are read from the schema file."""
+        tables, indexes = parse_schema()
+        self.assertEqual(list(tables)[:2], ['D_ADD_PROP', 'D_AWC'])
+        self.assertIn('HWSD2_SMU', tables)
+        self.assertTrue(all(i.startswith('CREATE INDEX IF NOT EXISTS') for i in indexes))
+
+    def test_initial_load(self):
+        """Test loading all tables, indexes and profile tables."""
+        status = load_hwsd2_bulk(str(self.db_path), str(self.csv_dir))
+        self.assertEqual(set(status.values()), {'loaded'})
+
+        self.assertEqual(self._query("SELECT COUNT(*) FROM HWSD2_LAYERS"), [(21,)])
+        self.assertEqual(self._query("SELECT SAND, SHARE FROM HWSD2_LAYERS WHERE ID = 8"), [(42.0, 40)])
+        self.assertEqual(self._query("SELECT WRB4 FROM HWSD2_SMU WHERE HWSD2_SMU_ID = 4726"), [(None,)])
+        self.assertEqual(self._query("SELECT COUNT(*) FROM SMU_PROFILE"), [(2,)])
+        indexes = self._query("SELECT index_name FROM duckdb_indexes() WHERE index_name = 'idx_layers_smu_id'")
+        self.assertEqual(len(indexes), 1)
+
+    def test_reload_skips_unchanged(self):
+        """Test that only tables with changed CSVs are reloaded."""
+        load_hwsd2_bulk(str(self.db_path), str(self.csv_dir))
+
+        status = load_hwsd2_bulk(str(self.db_path), str(self.csv_dir))
+        self.assertEqual(set(status.values()), {'skipped'})
+
+        with open(self.csv_dir / "D_WRB2.csv", "a") as f:
+            f.write("AC,Acrisols\n")
+        status = load_hwsd2_bulk(str(self.db_path), str(self.csv_dir))
+        self.assertEqual([t for t, s in status.items() if s == 'loaded'], ['D_WRB2'])
+        self.assertEqual(self._query("SELECT COUNT(*) FROM D_WRB2"), [(3,)])
+        self.assertEqual(self._query("SELECT COUNT(*) FROM HWSD2_LAYERS"), [(21,)])
+
+        status = load_hwsd2_bulk(str(self.db_path), str(self.csv_dir), force=True)
+        self.assertEqual(set(status.values()), {'loaded'})
+
+    def test_failed_load_rolls_back(self):
+        """Test that a bad CSV raises and leaves the database unchanged."""
+        load_hwsd2_bulk(str(self.db_path), str(self.csv_dir))
+
+        with open(self.csv_dir / "D_WRB2.csv", "a") as f:
+            f.write("AC,Acrisols\n")
+        with open(self.csv_dir / "D_IL.csv", "a") as f:
+            f.write("not-a-number,Bad code\n")
+
+        with self.assertRaises(duckdb.Error):
+            load_hwsd2_bulk(str(self.db_path), str(self.csv_dir))
+        self.assertEqual(self._query("SELECT COUNT(*) FROM D_WRB2"), [(2,)])
+
+    def test_missing_csv(self):
+        """Test that a missing table CSV is an error."""
+        (self.csv_dir / "D_SWR.csv").unlink()
+        with self.assertRaises(FileNotFoundError):
+            load_hwsd2_bulk(str(self.db_path), str(self.csv_dir))
+
+
+class TestExportParquet(unittest.TestCase):
+    """Test cases for the Parquet export and the Parquet-backed extractor."""
+
+    def setUp(self):
+        """Create a small database with profile tables and export it."""
+        # A quote in the path must not break the generated SQL
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="hwsd2's_"))
+        self.raster_path = self.temp_dir / "HWSD2.bil"
+        write_sparse_raster(self.raster_path, {})
+
+        self.db_path = self.temp_dir / "hwsd2.db"
+        create_test_db(self.db_path)
+        conn = duckdb.connect(str(self.db_path))
+        materialize_profiles(conn)
+        conn.close()
+
+        self.parquet_dir = export_parquet(str(self.db_path), str(self.temp_dir / "hwsd2_parquet"))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_export_layout(self):
+        """Test that layers are partitioned by depth and other tables are single files."""
+        self.assertTrue((self.parquet_dir / "HWSD2_SMU.parquet").exists())
+        self.assertTrue((self.parquet_dir / "SMU_PROFILE.parquet").exists())
+        partitions = sorted(p.name for p in (self.parquet_dir / "HWSD2_LAYERS").iterdir())
+        self.assertEqual(partitions, [f"LAYER=D{i}" for i in range(1, 8)])
+
+    def test_export_preserves_types(self):
+        """Test that column names and types survive the round trip."""
+        conn = duckdb.connect(str(self.db_path), read_only=True)
+        expected = conn.execute("DESCRIBE HWSD2_LAYERS").fetchall()
+        conn.close()
+
+        conn = HWSD2Extractor._connect_parquet(self.parquet_dir)
+        result = conn.execute("DESCRIBE HWSD2_LAYERS").fetchall()
+        count = conn.execute("SELECT COUNT(*) FROM HWSD2_LAYERS").fetchone()[0]
+        conn.close()
+        self.assertEqual([r[:2] for r in result], [r[:2] for r in expected])
+        self.assertEqual(count, 21)
+
+    def test_extractor_reads_parquet(self):
+        """Test that a Parquet directory returns the same profiles as the database."""
+        with HWSD2Extractor(raster_path=self.raster_path, db_path=self.db_path) as database, \
+                HWSD2Extractor(raster_path=self.raster_path, db_path=self.parquet_dir) as parquet:
+            for smu_id in [1666, 4726]:
+                expected = database.get_smu_properties(smu_id)
+                result = parquet.get_smu_properties(smu_id)
+                self.assertTrue(parquet._has_profile_tables)
+                # Missing values are NaN, so compare as series rather than dicts
+                pd.testing.assert_series_equal(pd.Series(result['metadata']), pd.Series(expected['metadata']))
+                pd.testing.assert_frame_equal(result['layers'], expected['layers'])
+
+            with self.assertRaises(ValueError):
+                parquet.get_smu_properties(9999)
+
+
+if __name__ == "__main__":
+    unittest.main()